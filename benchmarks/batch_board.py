@@ -0,0 +1,65 @@
+"""Game-steps per second of BatchBoard against the scalar engine
+
+$ python -m benchmarks.batch_board
+"""
+
+import time
+
+import numpy as np
+
+from tetris.engine.action import Action
+from tetris.engine.batch import BatchBoard
+from tetris.engine.tetris import TetrisEngine
+
+SIZES = (1, 10, 100, 1000, 10000, 100000)
+ACTIONS = np.array(
+    [Action.NONE, Action.LEFT, Action.RIGHT, Action.ROTATE_CW, Action.ROTATE_CCW],
+    dtype=np.uint8,
+)
+MIN_SECONDS = 1.0
+# the scalar rate does not depend on N, only that many engines are stepped
+SCALAR_LIMIT = 1000
+
+
+def bench_batch(n_games: int) -> float:
+    board = BatchBoard(n_games, seed=0)
+    rng = np.random.default_rng(0)
+
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        board.step(rng.choice(ACTIONS, size=n_games))
+        if board.game_over.any():
+            board.reset(np.flatnonzero(board.game_over))
+        steps += 1
+
+    return n_games * steps / (time.perf_counter() - start)
+
+
+def bench_scalar(n_games: int) -> float:
+    n_games = min(n_games, SCALAR_LIMIT)
+    engines = [TetrisEngine() for __ in range(n_games)]
+    rng = np.random.default_rng(0)
+
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        for engine, action in zip(engines, rng.choice(ACTIONS, size=n_games)):
+            # a full second per step so gravity moves every step like the batch
+            if engine.step(int(action), 1000):
+                engine.restart()
+        steps += 1
+
+    return n_games * steps / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'N':>8} {'batch steps/s':>16} {'scalar steps/s':>16} {'speedup':>8}")
+    for n_games in SIZES:
+        batch = bench_batch(n_games)
+        scalar = bench_scalar(n_games)
+        print(f"{n_games:>8} {batch:>16,.0f} {scalar:>16,.0f} {batch / scalar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Import times of the packages, the median of fresh interpreters
+
+$ python -m benchmarks.importtime
+"""
+
+import statistics
+import subprocess
+import sys
+
+MODULES = ("tetris.engine", "tetris.engine.tetris", "tetris.ai", "tetris.game")
+RUNS = 9
+
+
+def import_time(module: str) -> int:
+    """Cumulative us to import the module in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise ValueError(f"{module} is not imported")
+
+
+if __name__ == "__main__":
+    for module in MODULES:
+        median = statistics.median(import_time(module) for __ in range(RUNS))
+        print(f"{module}: {median / 1000:,.1f} ms")
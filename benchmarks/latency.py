@@ -0,0 +1,131 @@
+"""Event to display latency of the moves, per configuration
+
+Synthetic key presses are posted to the pygame queue at random times from
+a thread, the latency of a press is the time until the display is first
+updated with the piece moved by it.
+
+$ SDL_VIDEODRIVER=dummy python -m benchmarks.latency
+"""
+
+import argparse
+import itertools
+import os
+import random
+import threading
+import time
+from typing import List, Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg  # noqa: E402
+
+from tetris import Game  # noqa: E402
+from tetris.scene.tetris import Tetris  # noqa: E402
+
+# time a key is held down, a quick tap
+HOLD_SECONDS = 0.08
+# pause between the presses, at random in the range
+INTERVAL_SECONDS = (0.1, 0.2)
+
+
+class Probe:
+    """Presses to time & the latencies measured"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.piece = None
+        self.x: Optional[float] = None
+        self.pressed_at = 0.0
+        self.latencies: List[float] = []
+
+    def press(self, scene: Tetris) -> None:
+        with self.lock:
+            piece = scene.engine.board.piece
+            self.piece, self.x = piece, piece.x
+            self.pressed_at = time.perf_counter()
+
+    def displayed(self, scene: Tetris) -> None:
+        with self.lock:
+            piece = scene.engine.board.piece
+            if self.piece is None:
+                return
+            if piece is not self.piece:
+                # locked in between, the sample is dropped
+                self.piece = None
+            elif piece.x != self.x:
+                self.latencies.append((time.perf_counter() - self.pressed_at) * 1000)
+                self.piece = None
+
+
+def play(fps: int, dirty_rects: bool, press_event: int, samples: int) -> List[float]:
+    class Scene(Tetris):
+        REPLAY_DIR = None
+        PRESS_EVENT = press_event
+
+    class LatencyGame(Game):
+        INIT_SCENE_CLS = Scene
+        FPS = fps
+        DIRTY_RECTS = dirty_rects
+
+    probe = Probe()
+    game = LatencyGame()
+    display = pg.display
+    update, flip = display.update, display.flip
+
+    def displayed(*args):
+        result = (update if args else flip)(*args)
+        if isinstance(game.scene, Tetris):
+            probe.displayed(game.scene)
+        return result
+
+    def press():
+        rng = random.Random(0)
+        time.sleep(0.5)
+        while len(probe.latencies) < samples:
+            time.sleep(rng.uniform(*INTERVAL_SECONDS))
+            scene = game.scene
+            key = rng.choice((pg.K_LEFT, pg.K_RIGHT))
+            probe.press(scene)  # type: ignore
+            pg.event.post(pg.event.Event(pg.KEYDOWN, key=key))
+            time.sleep(HOLD_SECONDS)
+            pg.event.post(pg.event.Event(pg.KEYUP, key=key))
+        pg.event.post(pg.event.Event(pg.QUIT))
+
+    display.update = lambda *args: displayed(*args)
+    display.flip = lambda: displayed()
+    thread = threading.Thread(target=press, daemon=True)
+    try:
+        thread.start()
+        game.run()
+    finally:
+        display.update, display.flip = update, flip
+        thread.join()
+    return probe.latencies
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int((len(values) - 1) * p / 100 + 0.5), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=40)
+    parser.add_argument("--fps", type=int, nargs="+", default=[30, 60, 0])
+    args = parser.parse_args()
+
+    print(f"{'fps':>4} {'dirty':>5} {'input':>7} {'p50':>7} {'p99':>7} {'max':>7} ms")
+    configs = itertools.product(
+        args.fps, (True, False), ((pg.KEYDOWN, "keydown"), (pg.KEYUP, "keyup"))
+    )
+    for fps, dirty_rects, (press_event, name) in configs:
+        latencies = play(fps, dirty_rects, press_event, args.samples)
+        print(
+            f"{fps or '-':>4} {'on' if dirty_rects else 'off':>5} {name:>7}"
+            f" {percentile(latencies, 50):7.1f} {percentile(latencies, 99):7.1f}"
+            f" {max(latencies):7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Piece locks per second, packed indexes against writing Positions
+
+$ python -m benchmarks.lock_piece
+"""
+
+import time
+
+from tetris.engine.board import Board
+from tetris.engine.piece import Piece
+from tetris.engine.shape import TShape
+from tetris.helper import Position
+
+MIN_SECONDS = 1.0
+
+
+def bench(lock) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        for __ in range(1000):
+            lock()
+        runs += 1000
+
+    return runs / (time.perf_counter() - start)
+
+
+def main():
+    board = Board()
+    board.init(20, 10, {"content"})
+    piece = Piece(4, 10, TShape, "content")
+    board.set_piece(piece)
+    grid = board.grid
+
+    def write_positions():
+        for dx, dy in piece.shape.offsets:
+            grid.set((Position(piece.x + dx, piece.y + dy), piece.texture))
+
+    indexes = bench(board.lock_piece)
+    positions = bench(write_positions)
+    print(f"{'path':>10} {'locks/s':>12}")
+    print(f"{'indexes':>10} {indexes:>12,.0f}")
+    print(f"{'positions':>10} {positions:>12,.0f}")
+    print(f"{'speedup':>10} {indexes / positions:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
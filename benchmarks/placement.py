@@ -0,0 +1,66 @@
+"""Placement enumerations per second on a 10x20 board, with the SRS kicks
+
+$ python -m benchmarks.placement
+"""
+
+import time
+
+from tetris.engine.piece import Piece
+from tetris.engine.placement import enumerate_placements
+from tetris.engine.rotation import SRS
+
+N_ROWS, N_COLS = 20, 10
+MIN_SECONDS = 1.0
+
+BOARDS = {
+    "empty": [0] * N_ROWS,
+    "ragged": [0] * 14
+    + [
+        0b0000000001,
+        0b1000000011,
+        0b1100000111,
+        0b1110011111,
+        0b1111011111,
+        0b1111101111,
+    ],
+    "overhangs": [0] * 8
+    + [
+        0b1000000000,
+        0b1000000000,
+        0b1100000001,
+        0b1100000011,
+        0b1101000011,
+        0b1101100111,
+        0b1111100111,
+        0b1111110111,
+        0b1111110111,
+        0b1111111011,
+        0b1011111011,
+        0b1111111110,
+    ],
+}
+
+
+def bench(rows) -> float:
+    # the kicks Board.placements searches with
+    kicks = [(shape_cls, SRS.kick_table(shape_cls)) for shape_cls in Piece.SHAPES]
+    runs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        for shape_cls, kick_table in kicks:
+            enumerate_placements(
+                rows, N_ROWS, N_COLS, shape_cls, N_COLS // 2, -2, 0, kick_table
+            )
+        runs += len(Piece.SHAPES)
+
+    return runs / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'board':>10} {'enumerations/s':>16}")
+    for name, rows in BOARDS.items():
+        print(f"{name:>10} {bench(rows):>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Frames per second of full & incremental TetrisRender frames
+
+$ SDL_VIDEODRIVER=dummy python -m benchmarks.render
+"""
+
+import time
+
+import pygame as pg
+
+from tetris.engine.board import Board
+from tetris.engine.texture import ColorContent, ColorTexture
+from tetris.helper import Position, Vector
+from tetris.render.tetris import TetrisRender, TetrisRenderParameter
+
+MIN_SECONDS = 2.0
+
+
+def bench(name: str, frame):
+    pg.font.init()
+    surface = pg.Surface((1000, 800))
+    board = Board()
+    board.init(20, 10, {ColorContent.red, ColorContent.blue})
+    for y in range(12, 20):
+        for x in range(9):
+            board.grid.set((Position(x, y), ColorTexture(ColorContent.red)))
+    render = TetrisRender(surface, board, Position(350, 100))
+    render.render(TetrisRenderParameter(0, 1))
+
+    frames = 0
+    pixels = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        for __ in range(100):
+            rects = frame(render, board)
+            if rects is None:
+                pixels += surface.get_width() * surface.get_height()
+            else:
+                pixels += sum(rect.w * rect.h for rect in rects)
+        frames += 100
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name}: {frames / elapsed:,.0f} frames/s, "
+        f"{pixels / frames:,.0f} pixels updated/frame"
+    )
+
+
+def full(render: TetrisRender, board: Board):
+    render.invalidate()
+    return render.render(TetrisRenderParameter(0, 1))
+
+
+def idle(render: TetrisRender, board: Board):
+    return render.render(TetrisRenderParameter(0, 1))
+
+
+def move(render: TetrisRender, board: Board):
+    board.move_piece(Vector(1 if board.piece.x < 5 else -1, 0))
+    return render.render(TetrisRenderParameter(0, 1))
+
+
+if __name__ == "__main__":
+    bench("full", full)
+    bench("idle", idle)
+    bench("move", move)
@@ -0,0 +1,73 @@
+"""Headless replays per minute of recorded sessions
+
+The sessions are played with random inputs until game over, which usually
+comes before N_FRAMES; their average length is reported along.
+
+$ python -m benchmarks.replay
+"""
+
+import io
+import random
+import time
+from typing import Tuple
+
+from tetris.engine.action import Action
+from tetris.engine.replay import ReplayRecorder, play_replay
+from tetris.engine.tetris import TetrisEngine
+
+# frames of a session at most, 3 minutes at 60 frames per second
+N_FRAMES = 3 * 60 * 60
+FRAME_TIME = 16
+# share of the frames with an input, as a player presses a key now & then
+INPUT_RATE = 0.1
+ACTIONS = (
+    Action.LEFT,
+    Action.RIGHT,
+    Action.DOWN,
+    Action.ROTATE_CW,
+    Action.ROTATE_CCW,
+    Action.ACCELERATE,
+)
+MIN_SECONDS = 2.0
+
+
+def record_session(seed: int) -> Tuple[bytes, int]:
+    """Get the replay of a session & its count of frames"""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed=seed)
+    stream = io.BytesIO()
+    recorder = ReplayRecorder(stream, engine)
+
+    n_frames = 0
+    while n_frames < N_FRAMES:
+        actions = rng.choice(ACTIONS) if rng.random() < INPUT_RATE else Action.NONE
+        game_over = engine.step(actions, FRAME_TIME)
+        recorder.record(actions, FRAME_TIME)
+        n_frames += 1
+        if game_over:
+            break
+
+    return stream.getvalue(), n_frames
+
+
+def main():
+    sessions = [record_session(seed) for seed in range(8)]
+    replays = [replay for replay, __ in sessions]
+    frames = sum(n_frames for __, n_frames in sessions) // len(sessions)
+    size = sum(len(replay) for replay in replays) // len(replays)
+
+    runs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        for replay in replays:
+            play_replay(replay)
+        runs += len(replays)
+    elapsed = time.perf_counter() - start
+
+    seconds = frames * FRAME_TIME / 1000
+    print(f"sessions of ~{frames} frames ({seconds:.0f} s), ~{size} bytes")
+    print(f"{runs * 60 / elapsed:,.0f} replays/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Board snapshot & restore pairs per minute
+
+$ python -m benchmarks.snapshot
+"""
+
+import time
+
+from tetris.engine.board import Board
+from tetris.engine.piece import Piece
+from tetris.engine.shape import IShape, OShape
+from tetris.helper import Position, Vector
+
+MIN_SECONDS = 2.0
+
+
+def filled_board() -> Board:
+    board = Board()
+    board.init(20, 10, {"content"})
+    for y in range(12, 20):
+        for x in range(9):
+            board.grid.set((Position(x, y), "content"))
+    return board
+
+
+def bench(name: str, fork):
+    board = filled_board()
+    pairs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        for __ in range(1000):
+            with board.snapshotted() as snapshot:
+                fork(board)
+                board.restore(snapshot)
+        pairs += 1000
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {pairs * 60 / elapsed:,.0f} pairs/min")
+
+
+def move(board: Board):
+    board.move_piece(Vector(1, 1))
+
+
+def lock(board: Board):
+    board.set_piece(Piece(4, 10, OShape, "content"))
+    board.lock_piece()
+
+
+def clear(board: Board):
+    board.set_piece(Piece(9, 18, IShape, "content", rot=2))
+    board.clear_lines(board.lock_piece())
+
+
+def main():
+    bench("moved piece", move)
+    bench("locked piece", lock)
+    bench("4 cleared lines", clear)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from tetris.ai.bot import Bot, score_candidate
+from tetris.ai.evaluation import Weights, apply_placement, features
+from tetris.ai.play import self_play
+from tetris.engine.piece import Piece
+from tetris.engine.placement import Placement
+from tetris.engine.rotation import NO_KICKS
+from tetris.engine.shape import IShape, OShape
+from tetris.engine.tetris import TetrisEngine
+from tetris.helper import Position
+
+
+class TestEvaluation(TestCase):
+    def test_features(self):
+        rows = [0, 0, 0b0010, 0b0001]
+
+        # heights 1, 2, 0, 0 & a hole under the cell of column 1
+        assert features(rows, 4, 4) == (3, 1, 3)
+
+    def test_apply_placement(self):
+        rows = [0, 0, 0, 0b1100]
+        offsets = OShape.offset_table[0]
+        x = -min(dx for dx, __ in offsets)
+        y = 3 - max(dy for __, dy in offsets)
+
+        result = apply_placement(rows, 4, OShape, Placement(x, y, 0, ()))
+        assert result == ([0, 0, 0, 0b0011], 1)
+        assert apply_placement(rows, 4, OShape, Placement(x, -1, 0, ())) is None
+
+    def test_score_candidate(self):
+        rows = (0,) * 3 + (0b1111111100,)
+        lookahead = score_candidate(
+            rows, 4, 10, 0, (OShape, 5, -2, 0, NO_KICKS), Weights()
+        )
+
+        # the next O piece clears the row & leaves a flat board
+        assert lookahead > score_candidate(rows, 4, 10, 0, None, Weights())
+
+
+class TestBot(TestCase):
+    def setUp(self) -> None:
+        self.engine = TetrisEngine(seed=0)
+        self.board = self.engine.board
+        # two rows with a well on column 9
+        for y in (18, 19):
+            for x in range(9):
+                self.board.grid.set((Position(x, y), "t"))
+        self.board.set_piece(Piece(5, -2, IShape, "content"))
+
+    def test_choose(self):
+        placement = Bot(depth=1).choose(self.board)
+
+        offsets = IShape.offset_table[placement.rot % IShape.n_shapes]
+        cells = {(placement.x + dx, placement.y + dy) for dx, dy in offsets}
+        assert cells == {(9, y) for y in range(16, 20)}
+
+    def test_act(self):
+        piece = self.board.piece
+        with ThreadPoolExecutor(2) as executor:
+            bot = Bot(depth=1, executor=executor)
+            while self.board.piece is piece:
+                self.engine.step(bot.act(self.board), 0)
+
+        # both rows are cleared, the top of the I piece is left in the well
+        assert self.board.grid.row_masks[-3:] == (0, 1 << 9, 1 << 9)
+        assert self.engine.score == 2 * TetrisEngine.SCORE_UNIT
+
+    def test_self_play(self):
+        result = self_play(Bot(depth=1), TetrisEngine(seed=0), max_pieces=40)
+
+        assert result.pieces == 40
+        assert result.game_over is False
+        assert result.score > 0
@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import numpy as np
+
+from tetris.engine.action import Action
+from tetris.engine.batch import BatchBoard, OFFSETS
+from tetris.engine.piece import Piece
+from tetris.engine.shape import IShape, OShape
+
+
+class TestBatchBoard(TestCase):
+    def setUp(self) -> None:
+        self.board = BatchBoard(3, n_rows=20, n_cols=10, seed=0)
+
+    def _set_piece(self, game: int, shape_cls, x: int, y: int, rot: int = 0):
+        self.board.shape[game] = Piece.SHAPES.index(shape_cls)
+        self.board.x[game], self.board.y[game], self.board.rot[game] = x, y, rot
+
+    def test_offsets(self):
+        i_index = Piece.SHAPES.index(IShape)
+        assert tuple(map(tuple, OFFSETS[i_index, 1])) == IShape.offset_table[1]
+
+    def test_init(self):
+        assert self.board.grid.shape == (3, 20, 10)
+        assert self.board.grid.dtype == np.uint8
+        assert (self.board.y == -2).all()
+        assert not self.board.game_over.any()
+
+    def test_step_move(self):
+        for game in range(3):
+            self._set_piece(game, OShape, 4, 5)
+
+        self.board.step(
+            np.array([Action.LEFT, Action.RIGHT, Action.NONE], dtype=np.uint8),
+            gravity=False,
+        )
+
+        assert list(self.board.x) == [3, 5, 4]
+        assert list(self.board.y) == [5, 5, 5]
+
+    def test_step_wall(self):
+        self._set_piece(0, OShape, 1, 5)
+
+        self.board.step(Action.LEFT, gravity=False)
+
+        assert self.board.x[0] == 1
+
+    def test_step_lock_and_clear(self):
+        self.board.grid[0, 19, :8] = 1
+        self.board.grid[0, 18, 0] = 1
+        self._set_piece(0, OShape, 9, 19)
+        for game in (1, 2):
+            self._set_piece(game, OShape, 4, 5)
+
+        locked, cleared = self.board.step(Action.NONE)
+
+        assert list(locked) == [True, False, False]
+        assert list(cleared) == [1, 0, 0]
+        assert self.board.lines[0] == 1
+        # the leftover of row 18 fell down into row 19
+        assert list(self.board.grid[0, 19]) == [1] + [0] * 7 + [1, 1]
+        assert not self.board.grid[0, :19].any()
+        assert self.board.y[0] == -2
+        assert list(self.board.y[1:]) == [6, 6]
+
+    def test_game_over(self):
+        for __ in range(1000):
+            self.board.step(Action.NONE)
+
+        assert self.board.game_over.all()
+
+        self.board.reset(np.array([1]))
+        assert list(self.board.game_over) == [True, False, True]
+
+    def test_seed(self):
+        other = BatchBoard(3, n_rows=20, n_cols=10, seed=0)
+        for __ in range(50):
+            self.board.step(Action.ROTATE_CW)
+            other.step(Action.ROTATE_CW)
+
+        assert (self.board.grid == other.grid).all()
@@ -0,0 +1,434 @@
+import random
+import tracemalloc
+from unittest import TestCase, mock, skipIf
+
+from tetris.engine.action import Action
+from tetris.engine.board import Board, Grid
+from tetris.engine.piece import Piece
+from tetris.engine.rotation import CLASSIC
+from tetris.engine.shape import OShape, IShape, LShape, SShape, TShape
+from tetris.engine.tetris import TetrisEngine
+from tetris.engine.zobrist import cell_keys, row_hash
+from tetris.helper import Position, Vector, ZERO_VECTOR
+from tetris.profiling import ENABLED as PROFILING
+
+
+class TestGrid(TestCase):
+    def setUp(self) -> None:
+        self.grid = Grid(4, 3)
+
+    def test_set(self):
+        self.grid.set((Position(1, 2), "t"))
+
+        assert self.grid.get_cell(Position(1, 2)) == "t"
+        assert self.grid.is_occupied(Position(1, 2)) is True
+        assert self.grid.row_masks == (0, 0, 0b010, 0)
+
+        self.grid.set((Position(1, 2), None))
+
+        assert self.grid.is_occupied(Position(1, 2)) is False
+        assert self.grid.row_masks == (0, 0, 0, 0)
+
+    def test_clear_rows(self):
+        for x in range(3):
+            self.grid.set((Position(x, 3), "t"))
+        self.grid.set((Position(0, 2), "a"))
+
+        assert self.grid.is_row_full(3) is True
+        assert self.grid.clear_rows() == 1
+        assert self.grid.row_masks == (0, 0, 0, 0b001)
+        assert self.grid.get_cell(Position(0, 3)) == "a"
+        assert self.grid.clear_rows() == 0
+
+    def test_clear_touched_rows(self):
+        for y in (2, 3):
+            for x in range(3):
+                self.grid.set((Position(x, y), "t"))
+        self.grid.set((Position(1, 1), "a"))
+        lines = [id(line) for line in self.grid._mapping]
+
+        assert self.grid.clear_rows([3, 3, 7]) == 1
+        assert self.grid.row_masks == (0, 0, 0b010, 0b111)
+        assert self.grid.get_cell(Position(1, 2)) == "a"
+        # rows are moved & reused in place
+        assert sorted(id(line) for line in self.grid._mapping) == sorted(lines)
+        assert list(self.grid.row_counts) == [0, 0, 1, 3]
+
+    def test_clear_rows_tall(self):
+        grid = Grid(240, 3)
+        for x in range(3):
+            grid.set((Position(x, 239), "t"))
+            grid.set((Position(x, 237), "t"))
+        grid.set((Position(0, 238), "a"))
+        grid.set((Position(2, 236), "b"))
+
+        assert grid.clear_rows([239, 238, 237]) == 2
+        assert grid.row_masks[-3:] == (0, 0b100, 0b001)
+        assert list(grid.heights) == [1, 0, 2]
+        assert list(grid.holes) == [0, 0, 1]
+
+    def test_index(self):
+        self.grid.set_index(2 * 3 + 1, "t")
+
+        assert self.grid.get_cell(Position(1, 2)) == "t"
+        assert self.grid.get_index(7) == "t"
+        assert self.grid.row_masks == (0, 0, 0b010, 0)
+
+    def test_collides(self):
+        self.grid.set((Position(2, 3), "t"))
+
+        assert self.grid.collides(((0, 0b11),), 1, 3) is True
+        assert self.grid.collides(((0, 0b11),), 0, 3) is False
+        assert self.grid.collides(((0, 0b1),), 0, 4) is True
+        assert self.grid.collides(((0, 0b111),), 0, -1) is False
+
+
+class TestBoard(TestCase):
+    def setUp(self) -> None:
+        self.board = Board()
+        self.board.init(20, 10, {"content"})
+
+    def test_check_move(self):
+        self.board.set_piece(Piece(4, 10, OShape, "content"))
+
+        overflow, vector = self.board.check_move(Vector(1, 0))
+        assert overflow is False
+        assert vector == Vector(1, 0)
+        assert self.board.is_piece_collapsed is False
+
+    def test_check_move_wall(self):
+        self.board.set_piece(Piece(9, 10, OShape, "content"))
+
+        overflow, vector = self.board.check_move(Vector(1, 0))
+        assert vector == Vector(0, 0)
+
+    def test_check_move_collapsed(self):
+        self.board.set_piece(Piece(4, 19, IShape, "content", rot=1))
+
+        self.board.check_move(Vector(0, 1))
+        assert self.board.is_piece_collapsed is True
+
+    def test_rotate_piece(self):
+        self.board.set_piece(Piece(4, 10, IShape, "content"))
+        assert self.board.rotate_piece(clockwise=True) is True
+        assert self.board.piece.rot == 1
+
+        # kicked off the wall
+        self.board.set_piece(Piece(9, 10, IShape, "content"))
+        assert self.board.find_kick(clockwise=True) == (-2, 0)
+        assert self.board.rotate_piece(clockwise=True) is True
+        assert (self.board.piece.x, self.board.piece.rot) == (7, 1)
+
+        board = Board()
+        board.init(20, 10, {"content"}, rotation=CLASSIC)
+        board.set_piece(Piece(9, 10, IShape, "content"))
+        assert board.rotate_piece(clockwise=True) is False
+        assert board.piece.rot == 0
+
+    def test_lock_piece(self):
+        self.board.set_piece(Piece(4, 18, OShape, "content"))
+        assert self.board.lock_piece() == (17, 18)
+
+        assert self.board.grid.row_masks[-3:] == (0b11000, 0b11000, 0)
+
+    def test_hard_drop(self):
+        grid = self.board.grid
+        # overhang at row 15 over a hole down to the floor
+        grid.set((Position(4, 15), "t"))
+        grid.set((Position(5, 19), "t"))
+
+        self.board.set_piece(Piece(4, 0, OShape, "content"))
+        assert self.board.ghost_y() == 14
+        # under the overhang, only the rows below are checked
+        self.board.set_piece(Piece(5, 17, OShape, "content"))
+        assert self.board.drop_distance() == 1
+        self.board.set_piece(Piece(7, 16, OShape, "content"))
+        assert self.board.hard_drop() == 3
+        assert self.board.piece.y == 19
+
+    def test_drop_distance(self):
+        rng = random.Random(0)
+        shapes = (OShape, IShape, LShape, SShape, TShape)
+        for __ in range(300):
+            self.board.reset(rng.randrange(1000))
+            for __ in range(rng.randrange(60)):
+                pos = Position(rng.randrange(10), rng.randrange(4, 20))
+                self.board.grid.set((pos, "t"))
+
+            piece = Piece(
+                rng.randrange(10), rng.randrange(-2, 12), rng.choice(shapes), "c"
+            )
+            piece.rotate(rng.randrange(4))
+            self.board.set_piece(piece)
+            if not self.board.fits(piece.x, piece.y):
+                continue
+
+            y = piece.y
+            while self.board.fits(piece.x, y + 1):
+                y += 1
+            assert self.board.ghost_y() == y
+
+    def test_lock_piece_indexes(self):
+        # the packed index path, timed by benchmarks.lock_piece
+        piece = Piece(4, 10, TShape, "content")
+        self.board.set_piece(piece)
+        grid = self.board.grid
+        writes = grid.writes
+
+        with mock.patch.object(grid, "set", side_effect=AssertionError):
+            assert self.board.lock_piece() == (9, 10, 11)
+
+        # a write per cell, none through Positions
+        assert grid.writes - writes == 4
+        for dx, dy in piece.shape.offsets:
+            assert grid.get_cell(Position(4 + dx, 10 + dy)) is piece.texture
+
+    def test_move_piece(self):
+        piece = Piece(4, 10, OShape, "content")
+        self.board.set_piece(piece)
+
+        assert self.board.move_piece(Vector(1, 1)) is piece
+        assert piece.position == Position(5, 11)
+
+    def test_state_hash(self):
+        self.board.set_piece(Piece(4, 10, OShape, "content"))
+        first = self.board.state_hash
+
+        self.board.move_piece(Vector(1, 0))
+        assert self.board.state_hash != first
+        self.board.move_piece(Vector(-1, 0))
+        assert self.board.state_hash == first
+        # the same cells in every rotation
+        self.board.rotate_piece()
+        assert self.board.state_hash == first
+
+        other = Board()
+        other.init(20, 10, {"other"})
+        other.reset(self.board.randomizer.seed)
+        other.set_piece(Piece(4, 10, OShape, "other"))
+        assert other.state_hash == first
+
+    @skipIf(PROFILING, "the spans of check_move are recorded")
+    def test_steady_frame_allocation(self):
+        self.board.set_piece(Piece(4, 10, OShape, "content"))
+        moves = (ZERO_VECTOR, Vector(-1, 0), ZERO_VECTOR, Vector(1, 0))
+
+        def run_frames(n: int):
+            for i in range(n):
+                overflow, vector = self.board.check_move(moves[i % 4])
+                self.board.move_piece(vector)
+
+        run_frames(8)
+
+        tracemalloc.start()
+        try:
+            start, __ = tracemalloc.get_traced_memory()
+            run_frames(4000)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # nothing is retained and only a transient result tuple is alive
+        assert current - start <= 0
+        assert peak - start < 256
+
+
+class TestBoardSnapshot(TestCase):
+    def state(self, board: Board):
+        grid = board.grid
+        return (
+            [[grid.get_cell(Position(x, y)) for x in range(10)] for y in range(20)],
+            grid.row_masks,
+            list(grid.heights),
+            list(grid.holes),
+            list(grid.wells),
+            list(grid.row_counts),
+            grid.hole_count,
+            board.piece.snapshot(),
+            board.next_piece.snapshot(),
+            board.preview(3),
+            board.state_hash,
+        )
+
+    def test_restore(self):
+        rng = random.Random(0)
+        engine = TetrisEngine(seed=0)
+        board = engine.board
+        actions = list(Action)
+
+        for __ in range(200):
+            snapshot = board.snapshot()
+            state = self.state(board)
+            pieces = (board.piece, board.next_piece)
+            for __ in range(rng.randrange(1, 300)):
+                if engine.step(rng.choice(actions), rng.choice((0, 500))):
+                    break
+
+            board.restore(snapshot)
+            assert self.state(board) == state
+            assert (board.piece, board.next_piece) == pieces
+            # keep playing from the restored board now & then
+            if rng.random() < 0.5:
+                engine.step(Action.DOWN, 500)
+
+    def test_restore_cleared_lines(self):
+        board = Board()
+        board.init(20, 10, {"content"})
+        for x in range(9):
+            board.grid.set((Position(x, 19), "t"))
+            board.grid.set((Position(x, 17), "t"))
+        board.grid.set((Position(0, 18), "a"))
+        snapshot = board.snapshot()
+        state = self.state(board)
+
+        board.set_piece(Piece(9, 18, IShape, "content", rot=2))
+        assert board.clear_lines(board.lock_piece()) == 2
+        assert board.grid.row_masks[-2:] == (0b1000000000, 0b1000000001)
+
+        board.restore(snapshot)
+        assert self.state(board) == state
+
+    def test_nested(self):
+        board = Board()
+        board.init(20, 10, {"content"})
+        first = board.snapshot()
+        state = self.state(board)
+        board.grid.set((Position(0, 19), "t"))
+        second = board.snapshot()
+        board.grid.set((Position(1, 19), "t"))
+
+        board.restore(second)
+        assert board.grid.row_masks[-1] == 0b1
+        board.restore(first)
+        assert self.state(board) == state
+        # undone past it
+        with self.assertRaises(ValueError):
+            board.restore(second)
+
+        board.reset(1)
+        with self.assertRaises(ValueError):
+            board.restore(first)
+
+    def test_release(self):
+        board = Board()
+        board.init(20, 10, {"content"})
+        board.snapshot()
+        board.grid.set((Position(0, 19), "t"))
+        assert board.grid.journal_size == 1
+
+        board.release()
+        assert not board.grid.journaling
+        board.grid.set((Position(1, 19), "t"))
+        assert board.grid.journal_size == 0
+
+    def test_snapshotted(self):
+        board = Board()
+        board.init(20, 10, {"content"})
+        with board.snapshotted() as first:
+            board.grid.set((Position(0, 19), "t"))
+            with board.snapshotted() as second:
+                board.grid.set((Position(1, 19), "t"))
+                board.restore(second)
+            # kept for the outer block
+            assert board.grid.journaling
+            board.restore(first)
+            assert board.grid.row_masks[-1] == 0
+
+        assert not board.grid.journaling
+        assert board.grid.journal_size == 0
+
+        with self.assertRaises(RuntimeError):
+            with board.snapshotted():
+                board.grid.set((Position(0, 19), "t"))
+                raise RuntimeError
+        assert not board.grid.journaling
+
+
+class TestGridStats(TestCase):
+    def rescan(self, grid: Grid):
+        heights, holes = [], []
+        for x in range(grid.n_cols):
+            filled = [grid.is_occupied(Position(x, y)) for y in range(grid.n_rows)]
+            top = filled.index(True) if any(filled) else grid.n_rows
+            heights.append(grid.n_rows - top)
+            holes.append(filled[top:].count(False))
+
+        walls = [grid.n_rows] + heights + [grid.n_rows]
+        wells = [
+            max(min(walls[x], walls[x + 2]) - heights[x], 0) for x in range(grid.n_cols)
+        ]
+        row_counts = [
+            sum(grid.is_occupied(Position(x, y)) for x in range(grid.n_cols))
+            for y in range(grid.n_rows)
+        ]
+        return heights, holes, wells, row_counts
+
+    def test_set(self):
+        grid = Grid(4, 3)
+        grid.set((Position(1, 1), "t"))
+        grid.set((Position(2, 3), "t"))
+
+        assert list(grid.heights) == [0, 3, 1]
+        assert list(grid.holes) == [0, 2, 0]
+        assert list(grid.wells) == [3, 0, 2]
+        assert list(grid.row_counts) == [0, 1, 0, 1]
+        assert grid.hole_count == 2
+        with self.assertRaises(TypeError):
+            grid.heights[0] = 1
+
+    def test_state_hash(self):
+        grid = Grid(4, 3)
+        grid.set((Position(1, 1), "t"))
+        first = grid.state_hash
+        grid.set((Position(1, 1), "a"))
+        assert grid.state_hash == first
+        grid.set((Position(2, 3), "t"))
+        assert grid.state_hash != first
+        grid.set((Position(2, 3), None))
+        assert grid.state_hash == first
+        grid.set((Position(1, 1), None))
+        assert grid.state_hash == 0
+
+    def test_writes(self):
+        grid = Grid(4, 3)
+        grid.set((Position(1, 1), "t"))
+        writes = grid.writes
+        # a texture change leaves the hash as is, not the writes
+        grid.set((Position(1, 1), "a"))
+        assert grid.writes > writes
+
+        for x in range(3):
+            grid.set((Position(x, 3), "t"))
+        mark = grid.begin_journal()
+        writes = grid.writes
+        assert grid.clear_rows() == 1
+        assert grid.writes > writes
+        writes = grid.writes
+        grid.undo(mark)
+        assert grid.writes > writes
+
+    def test_random_play(self):
+        rng = random.Random(0)
+        engine = TetrisEngine(seed=0)
+        actions = list(Action)
+
+        for i in range(20000):
+            if engine.step(rng.choice(actions), rng.choice((0, 500))):
+                engine.restart(i)
+            if i % 50 == 0:
+                # clear some cells as well to open holes
+                grid = engine.board.grid
+                grid.set((Position(rng.randrange(10), rng.randrange(20)), None))
+                heights, holes, wells, row_counts = self.rescan(grid)
+
+                assert list(grid.heights) == heights
+                assert list(grid.holes) == holes
+                assert list(grid.wells) == wells
+                assert list(grid.row_counts) == row_counts
+                assert grid.hole_count == sum(holes)
+
+                keys = cell_keys(grid.n_rows, grid.n_cols)
+                state_hash = 0
+                for y, mask in enumerate(grid.row_masks):
+                    state_hash ^= row_hash(keys[y], mask)
+                assert grid.state_hash == state_hash
@@ -1,7 +1,7 @@
 from unittest import TestCase, mock
 
 from tetris.engine.piece import Piece
-from tetris.engine.shape import Shape
+from tetris.engine.shape import OShape, Shape
 from tetris.engine.texture import Texture
 from tetris.helper import Position, Vector
 
@@ -42,6 +42,37 @@ class TestPiece(TestCase):
 
         assert moved_piece.position == self.position + vector
 
+    def test_translate(self):
+        piece = Piece(
+            self.position.x,
+            self.position.y,
+            Shape,
+            self.content,
+        )
+
+        piece.translate(1, 2)
+
+        assert piece.position == Position(1, 2)
+
+    def test_snapshot(self):
+        piece = Piece(
+            self.position.x,
+            self.position.y,
+            Shape,
+            self.content,
+        )
+        state = piece.snapshot()
+
+        piece.translate(1, 2)
+        piece.rotate(1)
+        piece.collapsed = True
+        piece.restore(state)
+
+        assert piece.position == self.position
+        assert piece.rot == 0
+        assert piece.shape.rot == 0
+        assert piece.collapsed is False
+
     def test_iter(self):
         def shape_iterator(*args, **kwargs):
             for i in range(4):
@@ -59,6 +90,12 @@ class TestPiece(TestCase):
         for vi, vec in enumerate(piece):
             assert vec == (piece.position + Vector(vi, vi))
 
+    def test_cells(self):
+        piece = Piece(4, 10, OShape, self.content)
+
+        assert piece.cells(10) == (93, 103, 94, 104)
+        assert piece.cells(10) == tuple(p.y * 10 + p.x for p in piece)
+
     def test_rotate(self):
         self.shape.rot = 0
         piece = Piece(
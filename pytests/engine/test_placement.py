@@ -0,0 +1,163 @@
+from collections import deque
+from unittest import TestCase, mock
+
+from tetris.engine.action import Action
+from tetris.engine.board import Board
+from tetris.engine.piece import Piece
+from tetris.engine import placement
+from tetris.engine.placement import column_tops, enumerate_placements
+from tetris.engine.rotation import NO_KICKS, SRS
+from tetris.engine.shape import IShape, OShape, SShape, TShape
+from tetris.helper import Position, Vector
+
+
+def reachable_cells(rows, n_rows, n_cols, shape_cls, x, y, rot, kicks=NO_KICKS):
+    """Brute force BFS checking every cell of every state"""
+
+    def fits(s_x, s_y, s_rot):
+        for dx, dy in shape_cls.offset_table[s_rot % shape_cls.n_shapes]:
+            c, r = s_x + dx, s_y + dy
+            if c < 0 or c >= n_cols or r >= n_rows:
+                return False
+            if r >= 0 and rows[r] >> c & 1:
+                return False
+        return True
+
+    def rotated(s_x, s_y, s_rot, turn, clockwise):
+        n_rot = (s_rot + turn) % 4
+        for kx, ky in kicks[s_rot][clockwise]:
+            if fits(s_x + kx, s_y + ky, n_rot):
+                # kicks above row -4 are not searched
+                return (s_x + kx, s_y + ky, n_rot) if s_y + ky >= -4 else None
+        return None
+
+    start = (x, y, rot % 4)
+    seen = {start}
+    queue = deque([start])
+    cells = set()
+    while queue:
+        s_x, s_y, s_rot = queue.popleft()
+        for state in (
+            (s_x - 1, s_y, s_rot),
+            (s_x + 1, s_y, s_rot),
+            rotated(s_x, s_y, s_rot, 1, 0),
+            rotated(s_x, s_y, s_rot, 3, 1),
+            (s_x, s_y + 1, s_rot),
+        ):
+            if state is not None and state not in seen and fits(*state):
+                seen.add(state)
+                queue.append(state)
+        if not fits(s_x, s_y + 1, s_rot):
+            offsets = shape_cls.offset_table[s_rot % shape_cls.n_shapes]
+            cells.add(frozenset((s_x + dx, s_y + dy) for dx, dy in offsets))
+    return cells
+
+
+class TestPlacement(TestCase):
+    def setUp(self) -> None:
+        self.board = Board()
+        self.board.init(20, 10, {"content"})
+
+    def fill(self, *cells):
+        for x, y in cells:
+            self.board.grid.set((Position(x, y), "t"))
+
+    def test_column_tops(self):
+        self.fill((0, 19), (0, 17), (3, 18))
+
+        assert column_tops(self.board.grid.row_masks, 20, 10) == (
+            [17, 20, 20, 18] + [20] * 6
+        )
+
+    def test_empty_board(self):
+        counts = {}
+        for shape_cls in (OShape, IShape, SShape, TShape):
+            self.board.set_piece(Piece(5, -2, shape_cls, "content"))
+            counts[shape_cls] = len(self.board.placements())
+
+        # symmetric rotations covering the same cells are kept once
+        assert counts == {OShape: 9, IShape: 17, SShape: 17, TShape: 34}
+
+    def test_drops_bound(self):
+        rows = [0] * 17 + [0b1, 0b11, 0b111]
+        expected = enumerate_placements(rows, 20, 10, TShape, 5, -2, 0)
+
+        with mock.patch.object(placement, "_drops", {}):
+            with mock.patch.object(placement, "_DROPS_SIZE", 2):
+                for x in (3, 4, 5):
+                    enumerate_placements(rows, 20, 10, TShape, x, -2, 0)
+                    assert len(placement._drops) <= 2
+                # the same placements once emptied
+                assert enumerate_placements(rows, 20, 10, TShape, 5, -2, 0) == expected
+
+    def test_blocked_start(self):
+        self.fill((5, 0))
+        self.board.set_piece(Piece(5, 0, OShape, "content"))
+
+        assert self.board.placements() == []
+
+    def test_tuck(self):
+        # a roof over columns 0-2, the floor under it is reached by sliding
+        self.fill((0, 18), (1, 18), (2, 18))
+        self.board.set_piece(Piece(5, -2, IShape, "content"))
+
+        cells = {
+            frozenset((p.x + dx, p.y + dy) for dx, dy in IShape.offset_table[p.rot % 2])
+            for p in self.board.placements()
+        }
+        assert frozenset({(0, 19), (1, 19), (2, 19), (3, 19)}) in cells
+
+    def test_matches_brute_force(self):
+        rows = [0] * 12 + [
+            0b0000000000,
+            0b1000000001,
+            0b1100000011,
+            0b1110001011,
+            0b0111101111,
+            0b1111001111,
+            0b1110111111,
+            0b1111011101,
+        ]
+        for shape_cls in (OShape, IShape, SShape, TShape):
+            for kicks in (NO_KICKS, SRS.kick_table(shape_cls)):
+                for rot in range(4):
+                    placements = enumerate_placements(
+                        rows, 20, 10, shape_cls, 5, -2, rot, kicks
+                    )
+                    cells = {
+                        frozenset(
+                            (p.x + dx, p.y + dy)
+                            for dx, dy in shape_cls.offset_table[
+                                p.rot % shape_cls.n_shapes
+                            ]
+                        )
+                        for p in placements
+                    }
+
+                    assert len(cells) == len(placements)
+                    assert cells == reachable_cells(
+                        rows, 20, 10, shape_cls, 5, -2, rot, kicks
+                    )
+
+    def test_paths(self):
+        self.fill((1, 17), (2, 17), (3, 17), (6, 19), (7, 18), (7, 19))
+        self.board.set_piece(Piece(5, -2, TShape, "content"))
+        moves = {
+            Action.LEFT: Vector(-1, 0),
+            Action.RIGHT: Vector(1, 0),
+            Action.DOWN: Vector(0, 1),
+        }
+
+        for placement in self.board.placements():
+            self.board.set_piece(Piece(5, -2, TShape, "content"))
+            for action in placement.path:
+                if action in moves:
+                    __, vector = self.board.check_move(moves[action])
+                    assert vector == moves[action]
+                    self.board.move_piece(vector)
+                else:
+                    assert self.board.rotate_piece(action == Action.ROTATE_CW)
+
+            piece = self.board.piece
+            assert (piece.x, piece.y, piece.rot) == placement[:3]
+            assert self.board.fits(piece.x, piece.y + 1) is False
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from tetris.engine.action import Action
+from tetris.engine.piece import Piece
+from tetris.engine.randomizer import (
+    BagRandomizer,
+    HistoryRandomizer,
+    UniformRandomizer,
+    create_randomizer,
+)
+from tetris.engine.shape import OShape, SShape, ZShape
+from tetris.engine.tetris import TetrisEngine
+
+
+class TestRandomizer(TestCase):
+    def setUp(self) -> None:
+        self.pools = {"red", "blue", "yellow"}
+
+    def take(self, randomizer, n):
+        return [randomizer.next() for __ in range(n)]
+
+    def test_seed(self):
+        for randomizer_cls in (UniformRandomizer, BagRandomizer, HistoryRandomizer):
+            randomizer = randomizer_cls(self.pools, seed=7)
+            pieces = self.take(randomizer, 200)
+
+            assert self.take(randomizer_cls(self.pools, seed=7), 200) == pieces
+            assert self.take(randomizer_cls(self.pools, seed=8), 200) != pieces
+
+            randomizer.reset(7)
+            assert self.take(randomizer, 200) == pieces
+
+    def test_preview(self):
+        randomizer = UniformRandomizer(self.pools, seed=1)
+        pieces = self.take(UniformRandomizer(self.pools, seed=1), 300)
+
+        assert randomizer.preview(3) == tuple(pieces[:3])
+        # previews past the buffer do not change the sequence
+        assert randomizer.preview(300) == tuple(pieces)
+        assert self.take(randomizer, 300) == pieces
+        assert randomizer.consumed == 300
+
+    def test_seek(self):
+        randomizer = BagRandomizer(self.pools, seed=3)
+        pieces = self.take(BagRandomizer(self.pools, seed=3), 300)
+
+        self.take(randomizer, 100)
+        randomizer.seek(95)
+        assert self.take(randomizer, 5) == pieces[95:100]
+        # out of the buffer, drawn again from the seed
+        randomizer.seek(10)
+        assert self.take(randomizer, 290) == pieces[10:]
+        randomizer.seek(250)
+        assert self.take(randomizer, 50) == pieces[250:]
+
+    def test_bag(self):
+        randomizer = BagRandomizer(self.pools, seed=3)
+
+        for __ in range(20):
+            bag = [spec.shape_cls for spec in self.take(randomizer, 7)]
+            assert sorted(bag, key=repr) == sorted(Piece.SHAPES, key=repr)
+
+    def test_history(self):
+        randomizer = HistoryRandomizer(self.pools, seed=5)
+        shapes = [spec.shape_cls for spec in self.take(randomizer, 1000)]
+
+        assert shapes[0] not in (OShape, SShape, ZShape)
+        repeats = sum(a is b for a, b in zip(shapes, shapes[1:]))
+        assert repeats < 1000 // 7 // 4
+
+    def test_create_randomizer(self):
+        assert isinstance(create_randomizer("bag", self.pools), BagRandomizer)
+        assert isinstance(create_randomizer("tgm", self.pools), HistoryRandomizer)
+        assert isinstance(create_randomizer("?", self.pools), UniformRandomizer)
+
+    def test_same_game(self):
+        def play(seed):
+            engine = TetrisEngine(seed=seed)
+            actions = (Action.LEFT, Action.ROTATE_CW, Action.RIGHT, Action.NONE)
+            for i in range(2000):
+                if engine.step(actions[i % 4], 100):
+                    break
+            return engine.board.grid.row_masks, engine.score, engine.seed
+
+        assert play(11) == play(11)
+        assert play(11)[2] == 11
@@ -0,0 +1,106 @@
+import io
+import random
+from unittest import TestCase
+
+from tetris.engine.action import Action
+from tetris.engine.replay import (
+    LOCK_FLAG,
+    MAGIC_V1,
+    ReplayDivergence,
+    ReplayError,
+    ReplayHeader,
+    ReplayRecorder,
+    decode_header,
+    decode_varint,
+    encode_header,
+    encode_varint,
+    play_replay,
+)
+from tetris.engine.tetris import TetrisEngine
+
+
+class TestReplay(TestCase):
+    def record(self, seed: int = 3, n_frames: int = 3000) -> TetrisEngine:
+        rng = random.Random(seed)
+        self.engine = TetrisEngine(seed=seed, randomizer_type="bag")
+        self.stream = io.BytesIO()
+        recorder = ReplayRecorder(self.stream, self.engine)
+
+        for __ in range(n_frames):
+            actions = rng.choice(list(Action)) if rng.random() < 0.3 else Action.NONE
+            dt = rng.choice((16, 17, 100))
+            game_over = self.engine.step(actions, dt)
+            recorder.record(actions, dt)
+            if game_over:
+                break
+        return self.engine
+
+    def test_varint(self):
+        for value in (0, 1, 127, 128, 300, 2**32 - 1):
+            data = b"\x00" + encode_varint(value)
+            assert decode_varint(data, 1) == (value, len(data))
+
+        assert encode_varint(300) == b"\xac\x02"
+        with self.assertRaises(ValueError):
+            encode_varint(-1)
+
+    def test_header(self):
+        header = ReplayHeader(2**31, 20, 10, "tgm", "classic")
+        data = encode_header(header)
+
+        assert decode_header(data + b"\x10\x00") == (header, len(data))
+        # without the rotation system, played with classic rotations
+        data = MAGIC_V1 + data[4:-8]
+        assert decode_header(data) == (header, len(data))
+        with self.assertRaises(ReplayError):
+            decode_header(b"nope" + data[4:])
+
+    def test_play(self):
+        engine = self.record()
+        replayed = play_replay(self.stream.getvalue())
+
+        assert replayed.board.grid.row_masks == engine.board.grid.row_masks
+        assert replayed.score == engine.score
+        assert replayed.game_over == engine.game_over
+        assert replayed.randomizer_type == "bag"
+        assert replayed.rotation_type == "srs"
+        # frames are 2 bytes, plus the lock checksums
+        assert len(self.stream.getvalue()) < 3000 * 2 + 4 * 200
+
+    def test_play_wide(self):
+        engine = TetrisEngine(20, 40, seed=5, randomizer_type="bag")
+        stream = io.BytesIO()
+        recorder = ReplayRecorder(stream, engine)
+        # to the right wall, row masks wider than 32 bits
+        for __ in range(20):
+            for actions in (Action.RIGHT, Action.NONE) * 12 + (Action.HARD_DROP,):
+                engine.step(actions, 16)
+                recorder.record(actions, 16)
+        assert any(mask >> 32 for mask in engine.board.grid.row_masks)
+
+        replayed = play_replay(stream.getvalue())
+        assert replayed.board.grid.row_masks == engine.board.grid.row_masks
+
+    def test_divergence(self):
+        self.record()
+        data = bytearray(self.stream.getvalue())
+        __, pos = decode_header(bytes(data))
+
+        # flip the first locked frame's checksum
+        while not data[pos + 1] & LOCK_FLAG:
+            pos += 2
+        data[pos + 2] ^= 0xFF
+        with self.assertRaises(ReplayDivergence):
+            play_replay(bytes(data))
+
+        # drop the lock flag & its checksum
+        data[pos + 1] &= ~LOCK_FLAG
+        del data[pos + 2 : pos + 6]
+        with self.assertRaises(ReplayDivergence):
+            play_replay(bytes(data))
+
+    def test_truncated(self):
+        self.record(n_frames=10)
+
+        with self.assertRaises(ReplayError):
+            play_replay(self.stream.getvalue() + b"\x10")
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+from tetris.engine.board import Board
+from tetris.engine.piece import Piece
+from tetris.engine.rotation import (
+    CLASSIC,
+    NO_KICKS,
+    SRS,
+    SRS_I_KICKS,
+    SRS_JLSTZ_KICKS,
+    create_rotation_system,
+)
+from tetris.engine.shape import IShape, LShape, OShape, TShape
+from tetris.engine.texture import ColorContent, ColorTexture
+from tetris.helper import Position
+
+
+class TestRotation(TestCase):
+    def test_kicks(self):
+        # y down, the third T kick from the spawn state 0 to R goes left & up,
+        # the rotation index 1 of the T is flat & points up
+        assert SRS.kicks(TShape, 1, True) == (
+            (0, 0),
+            (-1, 0),
+            (-1, -1),
+            (0, 2),
+            (-1, 2),
+        )
+        assert SRS.kicks(TShape, 4, False) == SRS_JLSTZ_KICKS[3][1]
+        assert SRS.kicks(LShape, 3, True) == SRS_JLSTZ_KICKS[0][0]
+        assert SRS.kicks(IShape, 1, True) == SRS_I_KICKS[0][0]
+        assert SRS.kick_table(OShape) == NO_KICKS
+        assert CLASSIC.kicks(IShape, 3, False) == ((0, 0),)
+
+    def test_reversible(self):
+        # a kick is undone by the kick of the opposite rotation
+        for table in (SRS_JLSTZ_KICKS, SRS_I_KICKS):
+            for rot in range(4):
+                clockwise = table[rot][0]
+                back = table[(rot + 1) % 4][1]
+                assert [(-x, -y) for x, y in clockwise] == list(back)
+
+    def test_t_spin_triple(self):
+        board = Board()
+        board.init(20, 10, {ColorContent.red})
+        rows = [
+            "####.#####",
+            "###...####",
+            "###.######",
+            "###..#####",
+            "###.######",
+        ]
+        for y, row in enumerate(rows, 14):
+            for x, cell in enumerate(row):
+                if cell == "#":
+                    board.grid.set((Position(x, y), ColorTexture(ColorContent.red)))
+
+        # from the spawn state, the last kick of 0 to R moves left 1 & down 2
+        board.set_piece(Piece(4, 15, TShape, ColorContent.red, rot=1))
+        assert board.rotate_piece(clockwise=True)
+        piece = board.piece
+        assert (piece.x, piece.y, piece.rot) == (3, 17, 2)
+        assert board.lock_piece() == (16, 17, 18)
+
+    def test_create_rotation_system(self):
+        assert create_rotation_system("classic") is CLASSIC
+        assert create_rotation_system("srs") is SRS
+        assert create_rotation_system("unknown") is SRS
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from tetris.engine.shape import Shape, OShape
+from tetris.engine.shape import Shape, OShape, LShape, IShape, index_offsets
+from tetris.helper import Vector
 
 
 class TestShape(TestCase):
@@ -10,3 +11,35 @@ class TestShape(TestCase):
 
         o_shape = OShape.init(0)
         assert o_shape.rot == 0
+
+    def test_iter(self):
+        l_shape = LShape.init(0)
+
+        assert list(l_shape) == [
+            Vector(-1, -1),
+            Vector(-1, 0),
+            Vector(-1, 1),
+            Vector(0, 1),
+        ]
+        assert list(Shape.init(0)) == []
+
+    def test_tables(self):
+        i_shape = IShape.init(1)
+
+        assert len(i_shape) == 4
+        assert i_shape.offsets == ((-2, 0), (-1, 0), (0, 0), (1, 0))
+        assert i_shape.bounds == (-2, 1, 0, 0)
+        assert i_shape.row_masks == ((0, 0b1111),)
+        assert i_shape.col_masks == ((-2, 1), (-1, 1), (0, 1), (1, 1))
+
+        i_shape.rot = 5
+        assert i_shape.offsets == IShape.offset_table[1]
+
+    def test_index_offsets(self):
+        assert index_offsets(IShape, 10)[1] == (-2, -1, 0, 1)
+        assert index_offsets(IShape, 10)[0] == (-10, 0, 10, 20)
+        assert index_offsets(IShape, 10) is index_offsets(IShape, 10)
+
+    def test_tables_immutable(self):
+        assert isinstance(OShape.offset_table, tuple)
+        assert OShape.row_mask_table == (((-1, 0b11), (0, 0b11)),)
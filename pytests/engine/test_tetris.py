@@ -0,0 +1,82 @@
+import random
+from unittest import TestCase
+
+from tetris.engine.action import Action
+from tetris.engine.piece import Piece
+from tetris.engine.shape import IShape
+from tetris.engine.tetris import TetrisEngine
+from tetris.helper import Position
+
+
+class TestTetrisEngine(TestCase):
+    def setUp(self) -> None:
+        self.engine = TetrisEngine()
+
+    def test_init(self):
+        assert self.engine.score == 0
+        assert self.engine.level == TetrisEngine.INIT_LEVEL
+        assert self.engine.game_over is False
+        assert self.engine.board.n_rows == TetrisEngine.N_ROWS
+        assert self.engine.board.n_cols == TetrisEngine.N_COLS
+
+    def test_step_move(self):
+        piece = self.engine.board.piece
+        x = piece.x
+
+        assert self.engine.step(Action.LEFT, 0) is False
+        assert piece.x == x - 1
+
+        self.engine.step(Action.RIGHT | Action.LEFT, 0)
+        assert piece.x == x - 1
+
+    def test_step_gravity(self):
+        piece = self.engine.board.piece
+        y = piece.y
+
+        self.engine.step(Action.NONE, 999)
+        assert piece.y == y
+
+        self.engine.step(Action.NONE, 0)
+        assert piece.y == y + 1
+
+    def test_step_accelerate(self):
+        self.engine.step(Action.ACCELERATE, 0)
+        assert self.engine.falling_speed < self.engine.get_level_speed()
+
+        self.engine.step(Action.NONE, 0)
+        assert self.engine.falling_speed == self.engine.get_level_speed()
+
+    def test_step_lock_and_score(self):
+        board = self.engine.board
+        for x in range(board.n_cols - 4):
+            board.grid.set((Position(x, board.n_rows - 1), "content"))
+        board.set_piece(Piece(board.n_cols - 2, board.n_rows - 1, IShape, "c", rot=1))
+
+        self.engine.step(Action.DOWN, 0)
+
+        assert self.engine.score == TetrisEngine.SCORE_UNIT
+        assert board.grid.row_masks[-1] == 0
+        assert board.piece.y < 0
+
+    def test_step_hard_drop(self):
+        board = self.engine.board
+        for x in range(board.n_cols - 4):
+            board.grid.set((Position(x, board.n_rows - 1), "content"))
+        board.set_piece(Piece(board.n_cols - 3, 0, IShape, "c", rot=1))
+
+        self.engine.step(Action.HARD_DROP | Action.RIGHT, 0)
+
+        assert self.engine.score == TetrisEngine.SCORE_UNIT
+        assert board.grid.row_masks[-1] == 0
+        assert board.piece.y < 0
+
+    def test_game_over(self):
+        rng = random.Random(0)
+        actions = [Action.NONE, Action.LEFT, Action.RIGHT, Action.ROTATE_CW]
+
+        for __ in range(100000):
+            if self.engine.step(rng.choice(actions) | Action.DOWN, 16):
+                break
+
+        assert self.engine.game_over is True
+        assert self.engine.step(Action.NONE, 16) is True
@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+import pygame as pg
+
+from tetris.engine.texture import ColorContent, ColorTexture
+from tetris.render.atlas import TileAtlas, shade
+
+
+class TestTileAtlas(TestCase):
+    def setUp(self) -> None:
+        self.target = pg.Surface((100, 100))
+
+    def test_from_colors(self):
+        atlas = TileAtlas.from_colors(ColorTexture.mapping, 29, self.target)
+
+        assert len(atlas) == len(ColorTexture.mapping)
+        assert atlas.solid.get_bitsize() == self.target.get_bitsize()
+
+        area = atlas.area(ColorContent.red)
+        assert area.size == (29, 29)
+        # the center is the color, the edges are beveled
+        assert atlas.solid.get_at(area.center)[:3] == (255, 0, 0)
+        assert atlas.solid.get_at(area.topleft)[:3] == shade((255, 0, 0), 1.4)
+        assert atlas.solid.get_at((area.right - 1, area.bottom - 1))[:3] != (255, 0, 0)
+
+        # the ghost tile is an outline, its inside is transparent
+        surface = pg.Surface((29, 29))
+        surface.blit(atlas.ghost, (0, 0), area)
+        assert surface.get_at((0, 0))[:3] == (255, 0, 0)
+        assert surface.get_at((14, 14))[:3] == (0, 0, 0)
+
+    def test_from_images(self):
+        image = pg.Surface((8, 8))
+        image.fill((1, 2, 3))
+        atlas = TileAtlas.from_images({"stone": image}, 29, self.target)
+
+        assert "stone" in atlas
+        assert atlas.solid.get_at((28, 28))[:3] == (1, 2, 3)
+
+    def test_shade(self):
+        assert shade((100, 0, 200), 0.5) == (50, 0, 100)
+        assert shade((0, 255, 55), 1.5) == (127, 255, 155)
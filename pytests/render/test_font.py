@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from tetris.render.font import FontRegistry, TextCache
+
+
+class TestFont(TestCase):
+    def setUp(self) -> None:
+        self.fonts = FontRegistry()
+
+    def test_font_registry(self):
+        font = self.fonts.get("comicsansms", 20)
+
+        assert self.fonts.get("comicsansms", 20) is font
+        assert self.fonts.get("comicsansms", 30) is not font
+        assert len(self.fonts) == 2
+
+    def test_text_cache(self):
+        texts = TextCache(self.fonts)
+        text = texts.render("comicsansms", 20, "Score", (0, 128, 0))
+
+        assert texts.render("comicsansms", 20, "Score", (0, 128, 0)) is text
+        assert texts.render("comicsansms", 20, "Score", (0, 0, 0)) is not text
+        assert texts.hits == 1
+        assert texts.misses == 2
+        assert texts.n_bytes == sum(
+            TextCache.size_of(texts.render("comicsansms", 20, "Score", color))
+            for color in ((0, 128, 0), (0, 0, 0))
+        )
+
+    def test_text_cache_cap(self):
+        texts = TextCache(self.fonts)
+        size = TextCache.size_of(texts.render("comicsansms", 20, "0", (0, 0, 0)))
+        texts = TextCache(self.fonts, max_bytes=size * 8)
+        zero = texts.render("comicsansms", 20, "0", (0, 0, 0))
+
+        for score in range(100):
+            texts.render("comicsansms", 20, "0", (0, 0, 0))
+            texts.render("comicsansms", 20, f"{score}", (0, 0, 0))
+
+        # the least recently used are dropped, "0" is kept in use
+        assert texts.n_bytes <= size * 8
+        assert len(texts) < 8
+        assert texts.render("comicsansms", 20, "0", (0, 0, 0)) is zero
+        assert texts.misses == 100
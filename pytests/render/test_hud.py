@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+import pygame as pg
+
+from tetris.profiling import Profiler
+from tetris.render.hud import ProfilerHUD
+
+
+class TestProfilerHUD(TestCase):
+    def test_render(self):
+        profiler = Profiler()
+        for __ in range(3):
+            with profiler.span("scene.run"):
+                pass
+            profiler.frame()
+
+        surface = pg.Surface((400, 300))
+        hud = ProfilerHUD(surface, profiler)
+        lines = hud.lines()
+        rect = hud.render()
+
+        assert lines[0].startswith("frame p50")
+        assert lines[1].startswith("scene.run")
+        assert rect.topleft == ProfilerHUD.POS
+        # the spans are counted once
+        assert hud.lines()[1:] == []
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import pygame as pg
+
+from tetris.engine.board import Board
+from tetris.engine.texture import ColorContent, ColorTexture
+from tetris.helper import Position, Vector
+from tetris.render.tetris import TetrisRender, TetrisRenderParameter
+
+
+class TestTetrisRender(TestCase):
+    def setUp(self) -> None:
+        pg.font.init()
+        self.surface = pg.Surface((1000, 800))
+        self.board = Board()
+        self.board.init(20, 10, {ColorContent.red, ColorContent.blue})
+        self.render = TetrisRender(self.surface, self.board, Position(350, 100))
+
+    def full_frame(self) -> pg.Surface:
+        surface = pg.Surface(self.surface.get_size())
+        TetrisRender(surface, self.board, Position(350, 100)).render(
+            TetrisRenderParameter(0, 1)
+        )
+        return surface
+
+    def assert_frame(self):
+        expected = self.full_frame()
+        for y in range(100, 700, 7):
+            for x in range(350, 650, 7):
+                assert self.surface.get_at((x, y)) == expected.get_at((x, y))
+
+    def test_render(self):
+        parameter = TetrisRenderParameter(0, 1)
+
+        assert self.render.render(parameter) is None
+        assert self.render.render(parameter) == []
+
+        self.board.move_piece(Vector(1, 1))
+        rects = self.render.render(parameter)
+        # the old & new cells of the piece, the ghost moved along
+        assert 4 < len(rects) <= 16
+        assert self.render.render(parameter) == []
+        self.assert_frame()
+
+        for x in range(9):
+            self.board.grid.set((Position(x, 19), ColorTexture(ColorContent.red)))
+        self.board.hard_drop()
+        rects = self.render.render(TetrisRenderParameter(10, 1))
+        assert self.render.render(TetrisRenderParameter(10, 1)) == []
+        assert any(rect.x > 650 for rect in rects)
+        self.assert_frame()
+
+    def test_texture_change(self):
+        parameter = TetrisRenderParameter(0, 1)
+        self.board.grid.set((Position(0, 19), ColorTexture(ColorContent.red)))
+        self.render.render(parameter)
+
+        # the cell stays filled, only its texture changes
+        self.board.grid.set((Position(0, 19), ColorTexture(ColorContent.blue)))
+        assert len(self.render.render(parameter)) == 1
+        self.assert_frame()
+
+    def test_invalidate(self):
+        parameter = TetrisRenderParameter(0, 1)
+        self.render.render(parameter)
+
+        self.board.reset(0)
+        self.render.render(parameter)
+        self.assert_frame()
+
+        self.render.invalidate()
+        assert self.render.render(parameter) is None
+
+    def test_static_layer(self):
+        parameter = TetrisRenderParameter(0, 1)
+        self.render.render(parameter)
+        layer = self.render.static_layer()
+
+        self.render.render(parameter)
+        assert self.render.static_layer() is layer
+
+        # a theme change rebuilds the layer & draws a full frame
+        self.render.BOARD_BACKGROUND_COLOR = (20, 20, 40)
+        assert self.render.render(parameter) is None
+        assert self.render.static_layer() is not layer
+        assert self.surface.get_at((360, 110)) == (20, 20, 40)
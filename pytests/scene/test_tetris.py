@@ -0,0 +1,73 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pygame as pg
+
+from tetris.engine.replay import play_replay
+from tetris.scene.base import SceneParameter
+from tetris.scene.tetris import Tetris
+
+
+class TestTetris(TestCase):
+    def setUp(self) -> None:
+        pg.font.init()
+        self.dir = tempfile.TemporaryDirectory()
+
+        class Scene(Tetris):
+            REPLAY_DIR = self.dir.name
+
+        self.scene = Scene(pg.Surface((1000, 800)))
+
+    def tearDown(self) -> None:
+        self.scene.stop_recording()
+        self.dir.cleanup()
+
+    def parameter(self, steps: int) -> SceneParameter:
+        return SceneParameter(
+            events=[],
+            clock=pg.time.Clock(),
+            pressed=None,  # type: ignore
+            dts=[17, 16, 17, 17, 16][:steps],
+        )
+
+    def test_run_recording(self):
+        scene = self.scene
+        for _ in range(60):
+            assert scene.run(self.parameter(5)) != -1
+        scene.stop_recording()
+
+        (name,) = os.listdir(self.dir.name)
+        with open(os.path.join(self.dir.name, name), "rb") as f:
+            engine = play_replay(f.read())
+        # the ticks are played back as they were run
+        assert engine.board.grid.row_masks == scene.engine.board.grid.row_masks
+        assert engine.board.piece.y == scene.engine.board.piece.y
+
+    def test_toggle_bot(self):
+        scene = self.scene
+        scene.toggle_bot()
+        executor = scene.bot._executor  # type: ignore
+        scene.toggle_bot()
+        assert scene.bot is None
+        # the workers are shut down with the bot
+        with self.assertRaises(RuntimeError):
+            executor.submit(int)
+
+        scene.toggle_bot()
+        executor = scene.bot._executor  # type: ignore
+        scene.close()
+        assert scene.bot is None
+        with self.assertRaises(RuntimeError):
+            executor.submit(int)
+
+    def test_close(self):
+        scene = self.scene
+        assert scene.run(self.parameter(5)) != -1
+        scene.close()
+
+        # the replay is complete once the scene is closed
+        (name,) = os.listdir(self.dir.name)
+        with open(os.path.join(self.dir.name, name), "rb") as f:
+            engine = play_replay(f.read())
+        assert engine.board.piece.y == scene.engine.board.piece.y
@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+import pygame as pg
+
+from tetris.engine.action import Action
+from tetris.input import InputHandler
+
+
+def key_event(_type: int, key: int) -> pg.event.Event:
+    return pg.event.Event(_type, key=key)
+
+
+class TestInputHandler(TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.input = InputHandler(
+            {
+                pg.K_LEFT: Action.LEFT,
+                pg.K_RIGHT: Action.RIGHT,
+                pg.K_x: Action.ROTATE_CW,
+            },
+            {pg.K_DOWN: Action.ACCELERATE},
+            das_ms=100,
+            arr_ms=20,
+            clock=lambda: self.now,
+        )
+
+    def test_keydown(self):
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_x)], 0)
+
+        # acts on the press, once
+        assert self.input.poll(0) == Action.ROTATE_CW
+        assert self.input.poll(10) == Action.NONE
+
+        self.input.feed([key_event(pg.KEYUP, pg.K_x)], 20)
+        assert self.input.poll(20) == Action.NONE
+
+    def test_pending(self):
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_x)], 0)
+        self.now = 16
+
+        # kept until a tick consumes it, the delay is measured
+        assert self.input.poll(16) == Action.ROTATE_CW
+        assert list(self.input.latencies) == [16]
+
+    def test_das_arr(self):
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_LEFT)], 5)
+
+        ticks = [t * 10 for t in range(20)]
+        moves = [t for t in ticks if self.input.poll(t) & Action.LEFT]
+        # the press, then the repeats due at 105, 125, ... on the ticks after
+        assert moves == [0, 110, 130, 150, 170, 190]
+
+        self.input.feed([key_event(pg.KEYUP, pg.K_LEFT)], 200)
+        assert self.input.poll(300) == Action.NONE
+
+    def test_last_pressed_repeats(self):
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_LEFT)], 0)
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_RIGHT)], 50)
+        self.input.poll(50)
+
+        assert self.input.poll(150) == Action.RIGHT
+
+        self.input.feed([key_event(pg.KEYUP, pg.K_LEFT)], 160)
+        assert self.input.poll(170) == Action.RIGHT
+
+    def test_held_direction_repeats(self):
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_LEFT)], 0)
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_RIGHT)], 50)
+        self.input.poll(50)
+        self.input.feed([key_event(pg.KEYUP, pg.K_RIGHT)], 160)
+
+        # left is still held, it repeats after a new delayed auto shift
+        assert self.input.poll(200) == Action.NONE
+        assert self.input.poll(260) == Action.LEFT
+
+        self.input.feed([key_event(pg.KEYUP, pg.K_LEFT)], 270)
+        assert self.input.poll(400) == Action.NONE
+
+    def test_arr_zero(self):
+        handler = InputHandler({pg.K_LEFT: Action.LEFT}, das_ms=100, arr_ms=0)
+        handler.feed([key_event(pg.KEYDOWN, pg.K_LEFT)], 0)
+
+        ticks = [t * 16 for t in range(10)]
+        moves = [t for t in ticks if handler.poll(t) & Action.LEFT]
+        # a repeat on every tick after the delayed auto shift
+        assert moves == [0, 112, 128, 144]
+
+    def test_held(self):
+        self.input.feed([key_event(pg.KEYDOWN, pg.K_DOWN)], 0)
+        assert self.input.poll(0) == Action.ACCELERATE
+        assert self.input.poll(500) == Action.ACCELERATE
+
+        self.input.feed([key_event(pg.KEYUP, pg.K_DOWN)], 600)
+        assert self.input.poll(600) == Action.NONE
+
+    def test_press_on_keyup(self):
+        handler = InputHandler(
+            {pg.K_LEFT: Action.LEFT}, das_ms=100, press_event=pg.KEYUP
+        )
+        handler.feed([key_event(pg.KEYDOWN, pg.K_LEFT)], 0)
+        assert handler.poll(0) == Action.NONE
+
+        handler.feed([key_event(pg.KEYUP, pg.K_LEFT)], 80)
+        assert handler.poll(80) == Action.LEFT
+        # no repeat of a released key
+        assert handler.poll(500) == Action.NONE
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from tetris import profiling
+from tetris.profiling import Profiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        self.now += 1000
+        return self.now
+
+
+class TestProfiler(TestCase):
+    def setUp(self) -> None:
+        self.profiler = Profiler(capacity=4, n_frames=3, clock=FakeClock())
+
+    def test_ring_buffer(self):
+        for i in range(6):
+            with self.profiler.span(f"span{i}"):
+                pass
+
+        # only the latest spans are kept
+        assert self.profiler.count == 6
+        assert [name for name, __, __ in self.profiler.spans()] == [
+            "span2",
+            "span3",
+            "span4",
+            "span5",
+        ]
+        assert [name for name, __, __ in self.profiler.spans(5)] == ["span5"]
+        assert all(end - start == 1000 for __, start, end in self.profiler.spans())
+
+    def test_percentiles(self):
+        assert self.profiler.percentiles() == {50: 0.0, 95: 0.0, 99: 0.0}
+
+        for __ in range(5):
+            self.profiler.frame()
+        self.profiler.clock.now += 2_000_000
+        self.profiler.frame()
+
+        assert self.profiler.frame_times() == [1000, 1000, 2_001_000]
+        assert self.profiler.percentiles((50, 99)) == {50: 0.001, 99: 2.001}
+
+    def test_chrome_trace(self):
+        with self.profiler.span("render"):
+            pass
+
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        self.profiler.export(path)
+        with open(path) as f:
+            trace = json.load(f)
+
+        assert trace["traceEvents"] == [
+            {"name": "render", "ph": "X", "ts": 1.0, "dur": 1.0, "pid": 1, "tid": 1}
+        ]
+
+    def test_probes(self):
+        def func():
+            return 1
+
+        with mock.patch.object(profiling, "profiler", None):
+            assert profiling.profiled("func")(func) is func
+            assert profiling.span("block") is profiling.span("other")
+
+        with mock.patch.object(profiling, "profiler", self.profiler):
+            assert profiling.profiled("func")(func)() == 1
+            with profiling.span("block"):
+                pass
+
+        assert [name for name, __, __ in self.profiler.spans()] == ["func", "block"]
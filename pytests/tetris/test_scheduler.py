@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+from tetris.scheduler import FrameScheduler
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        # the OS oversleeps a little
+        self.now += seconds + 0.0005
+
+
+class TestFrameScheduler(TestCase):
+    def setUp(self) -> None:
+        self.time = FakeTime()
+
+    def create(self, fps: int = 60, tick_ms: float = 10) -> FrameScheduler:
+        return FrameScheduler(fps, tick_ms, self.time.clock, self.time.sleep)
+
+    def test_advance(self):
+        scheduler = self.create()
+
+        self.time.now += 0.025
+        assert scheduler.advance() == [10, 10]
+        assert abs(scheduler.lag_ms - 5) < 1e-6
+
+        self.time.now += 0.005
+        assert scheduler.advance() == [10]
+        assert scheduler.lag_ms < 1e-6
+
+        # a stall is not caught up past the max steps
+        self.time.now += 10
+        assert len(scheduler.advance()) == FrameScheduler.MAX_STEPS
+        assert scheduler.lag_ms < 1e-3
+
+    def test_whole_ms_dts(self):
+        scheduler = self.create(tick_ms=1000 / 60)
+
+        dts = []
+        for __ in range(60):
+            self.time.now += 1 / 60
+            dts += scheduler.advance()
+        # a tick per frame at 60 Hz, whole ms adding up to the real time
+        assert len(dts) == 60
+        assert set(dts) == {16, 17}
+        assert sum(dts) == 1000
+
+    def test_same_speed(self):
+        # the ticks follow the real time, whatever the frame rate
+        for fps, work in ((60, 0.001), (30, 0.02), (0, 0.04)):
+            self.time = FakeTime()
+            scheduler = self.create(fps)
+            ticks = 0
+            while self.time.now < 10:
+                ticks += len(scheduler.advance())
+                self.time.now += work
+                scheduler.wait()
+            ticks += len(scheduler.advance())
+            assert abs(ticks - self.time.now * 100) <= 1
+
+    def test_wait(self):
+        scheduler = self.create(fps=50)
+
+        for __ in range(100):
+            self.time.now += 0.005
+            scheduler.wait()
+
+        # the oversleeps are absorbed by the next deadlines
+        assert abs(self.time.now - 2) < 0.001
+        assert all(0.014 < seconds <= 0.015 for seconds in self.time.sleeps[1:])
+
+    def test_wait_late(self):
+        scheduler = self.create(fps=50)
+
+        self.time.now += 1
+        scheduler.wait()
+        self.time.now += 0.005
+        scheduler.wait()
+
+        # the missed frames are dropped, not run without a pause
+        assert len(self.time.sleeps) == 1
+        assert abs(self.time.sleeps[0] - 0.015) < 1e-9
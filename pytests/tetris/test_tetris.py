@@ -1,11 +1,18 @@
+import subprocess
+import sys
 from unittest import TestCase, mock
 
 import pygame as pg
 
 import tetris
+from tetris import game as tetris_game
+from tetris.scheduler import FrameScheduler
 
+# us to import the engine & the bot, pygame alone takes longer
+IMPORT_BUDGET_US = 250_000
 
-@mock.patch.object(tetris, "pg")
+
+@mock.patch.object(tetris_game, "pg")
 class TestGame(TestCase):
     def setUp(self) -> None:
         pass
@@ -16,6 +23,7 @@ class TestGame(TestCase):
         mock_pg.QUIT = pg.QUIT
         mock_pg.KEYUP = pg.KEYUP
         mock_pg.K_ESCAPE = pg.K_ESCAPE
+        mock_pg.error = pg.error
 
         mock_pg.display.set_mode.return_value = self.surface
 
@@ -24,13 +32,15 @@ class TestGame(TestCase):
 
         game = tetris.Game()
 
-        mock_pg.display.set_mode.assert_called_with(tetris.Game.WIN_SIZE)
-        assert game._surface == self.surface
+        # the display is created on the first run
+        mock_pg.display.set_mode.assert_not_called()
+        assert game._surface is None
 
     def test_game_init(self, mock_pg):
         self._setup_pygame(mock_pg)
 
         game = tetris.Game()
+        game.set_surface(self.surface)
 
         game.init()
 
@@ -47,6 +57,60 @@ class TestGame(TestCase):
         ]
         mock_pg.event.get.return_value = mock_events
 
-        game.run()
+        with mock.patch.object(tetris.Game.INIT_SCENE_CLS, "close") as close:
+            game.run()
 
+        mock_pg.display.set_mode.assert_called_with(tetris.Game.WIN_SIZE)
+        assert game._surface == self.surface
         assert mock_pg.quit.call_count == 1
+        # the scene is closed on quit
+        close.assert_called_once_with()
+
+    def test_game_run_vsync(self, mock_pg):
+        self._setup_pygame(mock_pg)
+        mock_pg.event.get.return_value = [
+            mock.MagicMock(type=pg.KEYUP, key=pg.K_ESCAPE)
+        ]
+
+        class VsyncGame(tetris.Game):
+            FPS = 0
+
+        VsyncGame().run()
+        mock_pg.display.set_mode.assert_called_with(
+            tetris.Game.WIN_SIZE, mock_pg.SCALED, vsync=1
+        )
+
+        # capped instead when the display has no vsync
+        mock_pg.display.set_mode.side_effect = [pg.error, self.surface]
+        game = VsyncGame()
+        assert game.create_display() == FrameScheduler.FPS
+        mock_pg.display.set_mode.assert_called_with(tetris.Game.WIN_SIZE)
+        assert game._surface == self.surface
+
+
+class TestImport(TestCase):
+    def test_engine_import(self):
+        modules = ("tetris.engine", "tetris.engine.tetris", "tetris.ai")
+        code = "import sys, {}; print('pygame' in sys.modules)".format(
+            ", ".join(modules)
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "False"
+        # cumulative us of the modules imported at the top level
+        cumulative = 0
+        for line in result.stderr.splitlines():
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] in modules:
+                cumulative += int(fields[1])
+        assert 0 < cumulative < IMPORT_BUDGET_US
+
+    def test_lazy_game(self):
+        with self.assertRaises(AttributeError):
+            tetris.Unknown  # type: ignore
+        assert tetris.Game is tetris_game.Game
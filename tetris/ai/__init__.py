@@ -0,0 +1,3 @@
+from .bot import Bot
+from .evaluation import Weights
+from .play import GameResult, self_play
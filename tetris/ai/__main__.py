@@ -0,0 +1,36 @@
+"""Headless self play of the bot over a batch of seeded games
+
+$ python -m tetris.ai --games 8 --pieces 500
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from tetris.ai.play import play_seeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--pieces", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=2, choices=(1, 2))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    seeds = range(args.seed, args.seed + args.games)
+    play = partial(play_seeded, max_pieces=args.pieces, depth=args.depth)
+
+    print(f"{'seed':>6} {'score':>8} {'level':>6} {'pieces':>7} {'game over':>10}")
+    # games run in parallel, each one scores its candidates in its process
+    with ProcessPoolExecutor(args.workers) as executor:
+        for seed, result in zip(seeds, executor.map(play, seeds)):
+            print(
+                f"{seed:>6} {result.score:>8} {result.level:>6}"
+                f" {result.pieces:>7} {str(result.game_over):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Deque, List, Optional, Sequence, Tuple, Type, Union
+
+from tetris.ai.evaluation import Weights, apply_placement, evaluate
+from tetris.engine.action import Action
+from tetris.engine.board import Board
+from tetris.engine.piece import Piece
+from tetris.engine.placement import Placement, enumerate_placements
+from tetris.engine.rotation import RotationSystem, type_of_kick_table
+from tetris.engine.shape import Shape
+
+# shape class, x, y & rotation a piece starts from & the kicks of its rotations
+type_of_spawn = Tuple[Type[Shape], int, int, int, type_of_kick_table]
+
+
+def _spawn(piece: Piece, rotation: RotationSystem) -> type_of_spawn:
+    shape_cls = type(piece.shape)
+    return shape_cls, piece.x, piece.y, piece.rot, rotation.kick_table(shape_cls)
+
+
+def score_candidate(
+    rows: Sequence[int],
+    n_rows: int,
+    n_cols: int,
+    lines: int,
+    next_spawn: Optional[type_of_spawn],
+    weights: Weights,
+) -> float:
+    """Score the board left by a candidate, at its best next placement if any
+
+    A module level function so that it can run in a process pool.
+    """
+    if next_spawn is None:
+        return evaluate(rows, n_rows, n_cols, lines, weights)
+
+    shape_cls, x, y, rot, kicks = next_spawn
+    best = float("-inf")
+    for placement in enumerate_placements(
+        rows, n_rows, n_cols, shape_cls, x, y, rot, kicks
+    ):
+        result = apply_placement(rows, n_cols, shape_cls, placement)
+        if result is not None:
+            next_rows, cleared = result
+            score = evaluate(next_rows, n_rows, n_cols, lines + cleared, weights)
+            if score > best:
+                best = score
+    return best
+
+
+class Search:
+    """Candidate placements of a piece & their pending or computed scores"""
+
+    # row of the piece when the search started
+    y: int
+
+    candidates: List[Placement]
+    scores: List[Union[float, Future]]
+
+    def __init__(self, y: int):
+        self.y = y
+        self.candidates = []
+        self.scores = []
+
+    def done(self) -> bool:
+        return all(
+            not isinstance(score, Future) or score.done() for score in self.scores
+        )
+
+    def best(self) -> Optional[Placement]:
+        """Get the best candidate once every score is computed"""
+        best, best_score = None, float("-inf")
+        for candidate, score in zip(self.candidates, self.scores):
+            if isinstance(score, Future):
+                score = score.result()
+            if score > best_score:
+                best, best_score = candidate, score
+        return best
+
+    def cancel(self):
+        for score in self.scores:
+            if isinstance(score, Future):
+                score.cancel()
+
+
+class Bot:
+    """Tetris player picking the placement of the current piece
+
+    Each placement of the current piece is scored by the board features it
+    leaves; at depth 2 a placement is scored by the best placement of the
+    next piece on top of it. With an executor, the candidates are scored in
+    parallel and `act` never waits for them.
+    """
+
+    weights: Weights
+    depth: int
+
+    _executor: Optional[Executor]
+
+    # piece the current search & path are for
+    _piece: Optional[Piece]
+    _search: Optional[Search]
+    _path: Optional[Deque[Action]]
+    # row the piece reaches following the path so far
+    _y: int
+
+    def __init__(
+        self,
+        weights: Weights = Weights(),
+        depth: int = 2,
+        executor: Optional[Executor] = None,
+    ):
+        if depth not in (1, 2):
+            raise ValueError(f"Unsupported depth {depth} !!")
+
+        self.weights = weights
+        self.depth = depth
+        self._executor = executor
+        self.reset()
+
+    def reset(self):
+        """Forget the current search"""
+        if getattr(self, "_search", None):
+            self._search.cancel()  # type: ignore
+        self._piece = None
+        self._search = None
+        self._path = None
+        self._y = 0
+
+    def close(self):
+        """Stop the search & shut the executor down"""
+        self.reset()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def search(self, board: Board) -> Search:
+        """Start scoring the placements of the current piece"""
+        piece = board.piece
+        next_piece = board.next_piece
+        next_spawn = (
+            _spawn(next_piece, board.rotation)
+            if self.depth > 1 and next_piece
+            else None
+        )
+        rows = board.grid.row_masks
+
+        search = Search(piece.y)
+        for placement in board.placements():
+            result = apply_placement(rows, board.n_cols, type(piece.shape), placement)
+            if result is None:
+                continue
+
+            args = (
+                tuple(result[0]),
+                board.n_rows,
+                board.n_cols,
+                result[1],
+                next_spawn,
+                self.weights,
+            )
+            search.candidates.append(placement)
+            if self._executor:
+                search.scores.append(self._executor.submit(score_candidate, *args))
+            else:
+                search.scores.append(score_candidate(*args))
+        return search
+
+    def choose(self, board: Board) -> Optional[Placement]:
+        """Get the best placement of the current piece, waiting for the scores"""
+        return self.search(board).best()
+
+    def act(self, board: Board) -> Action:
+        """Get the action of this frame for the current piece
+
+        Nothing is done while the search is pending; then the path of the
+        best placement is followed, skipping the downward moves gravity has
+        already made, and the piece is hard dropped once only downward moves
+        are left.
+        """
+        piece = board.piece
+        if piece is not self._piece:
+            self.reset()
+            self._piece = piece
+            self._search = self.search(board)
+
+        if self._path is None:
+            if not self._search.done():  # type: ignore
+                return Action.NONE
+            best = self._search.best()  # type: ignore
+            path = list(best.path if best else ())
+            while path and path[-1] == Action.DOWN:
+                path.pop()
+            self._path = deque(path)
+            self._y = self._search.y  # type: ignore
+
+        while self._path:
+            action = self._path.popleft()
+            if action == Action.DOWN:
+                self._y += 1
+                if piece.y >= self._y:
+                    continue
+            elif action & (Action.ROTATE_CW | Action.ROTATE_CCW):
+                # a kick may move the piece up or down as well
+                kick = board.find_kick(action == Action.ROTATE_CW)
+                if kick:
+                    self._y += kick[1]
+            return action
+        return Action.HARD_DROP
@@ -0,0 +1,74 @@
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from tetris.engine.placement import Placement, column_tops
+from tetris.engine.shape import Shape
+
+
+class Weights(NamedTuple):
+    """Weights of the board features, a higher score is a better board"""
+
+    height: float = -0.510066
+    holes: float = -0.35663
+    bumpiness: float = -0.184483
+    lines: float = 0.760666
+
+
+class Features(NamedTuple):
+    # sum of the column heights
+    height: int
+    # empty cells under an occupied cell of their column
+    holes: int
+    # sum of the height differences of neighboring columns
+    bumpiness: int
+
+
+def features(rows: Sequence[int], n_rows: int, n_cols: int) -> Features:
+    """Get the board features from the row masks"""
+    heights = [n_rows - top for top in column_tops(rows, n_rows, n_cols)]
+
+    holes = 0
+    covered = 0
+    for mask in rows:
+        holes += bin(covered & ~mask).count("1")
+        covered |= mask
+
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return Features(sum(heights), holes, bumpiness)
+
+
+def evaluate(
+    rows: Sequence[int], n_rows: int, n_cols: int, lines: int, weights: Weights
+) -> float:
+    """Score the board after clearing the given number of lines"""
+    height, holes, bumpiness = features(rows, n_rows, n_cols)
+    return (
+        weights.height * height
+        + weights.holes * holes
+        + weights.bumpiness * bumpiness
+        + weights.lines * lines
+    )
+
+
+def apply_placement(
+    rows: Sequence[int],
+    n_cols: int,
+    shape_cls: Type[Shape],
+    placement: Placement,
+) -> Optional[Tuple[List[int], int]]:
+    """Lock the piece at the placement & clear the full rows
+
+    Get the new row masks & the cleared lines, None when the piece is locked
+    above the top of the board.
+    """
+    rows = list(rows)
+    offsets = shape_cls.offset_table[placement.rot % shape_cls.n_shapes]
+    for dx, dy in offsets:
+        y = placement.y + dy
+        if y < 0:
+            return None
+        rows[y] |= 1 << (placement.x + dx)
+
+    full = (1 << n_cols) - 1
+    kept = [mask for mask in rows if mask != full]
+    cleared = len(rows) - len(kept)
+    return [0] * cleared + kept, cleared
@@ -0,0 +1,38 @@
+from typing import NamedTuple, Optional
+
+from tetris.ai.bot import Bot
+from tetris.engine.tetris import TetrisEngine
+
+
+class GameResult(NamedTuple):
+    score: int
+    level: int
+    # locked pieces
+    pieces: int
+    game_over: bool
+
+
+def self_play(
+    bot: Bot, engine: Optional[TetrisEngine] = None, max_pieces: int = 1000
+) -> GameResult:
+    """Play a game on the headless engine until game over or max pieces
+
+    Each step is one action without gravity, the bot drops the pieces.
+    """
+    engine = engine or TetrisEngine()
+    bot.reset()
+
+    pieces = 0
+    piece = engine.board.piece
+    while pieces < max_pieces and not engine.game_over:
+        engine.step(bot.act(engine.board), 0)
+        if engine.board.piece is not piece:
+            piece = engine.board.piece
+            pieces += 1
+
+    return GameResult(engine.score, engine.level, pieces, engine.game_over)
+
+
+def play_seeded(seed: int, max_pieces: int = 1000, depth: int = 2) -> GameResult:
+    """Self play a game with the piece sequence of the given seed"""
+    return self_play(Bot(depth=depth), TetrisEngine(seed=seed), max_pieces)
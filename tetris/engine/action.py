@@ -0,0 +1,16 @@
+from enum import IntFlag
+
+
+class Action(IntFlag):
+    """Player actions of a single step, combined as a bitmask"""
+
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    DOWN = 4
+    ROTATE_CW = 8
+    ROTATE_CCW = 16
+    # held soft drop
+    ACCELERATE = 32
+    # drop the piece to its landing row & lock it
+    HARD_DROP = 64
@@ -0,0 +1,177 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from tetris.engine.action import Action
+from tetris.engine.piece import Piece
+
+
+def _offset_array() -> np.ndarray:
+    """Cell offsets of Piece.SHAPES as a (shape, rot, cell, xy) array"""
+    offsets = np.zeros((len(Piece.SHAPES), 4, 4, 2), dtype=np.int16)
+    for s, shape_cls in enumerate(Piece.SHAPES):
+        for rot in range(4):
+            offsets[s, rot] = shape_cls.offset_table[rot % shape_cls.n_shapes]
+    return offsets
+
+
+OFFSETS = _offset_array()
+
+
+class BatchBoard:
+    """N boards stepped together with vectorized NumPy operations
+
+    The grids live in a single (N, rows, cols) uint8 array where 0 is an empty
+    cell and any other value is the shape index + 1 of the locked piece. Each
+    step applies the actions of every game, then one row of gravity; pieces
+    that can not fall are locked, full rows are cleared and new pieces spawn.
+    """
+
+    def __init__(self, n_games: int, n_rows: int = 20, n_cols: int = 10, seed=None):
+        self.n_games = n_games
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+
+        self._rng = np.random.default_rng(seed)
+
+        self.grid = np.zeros((n_games, n_rows, n_cols), dtype=np.uint8)
+        self.shape = np.zeros(n_games, dtype=np.int16)
+        self.rot = np.zeros(n_games, dtype=np.int16)
+        self.x = np.zeros(n_games, dtype=np.int16)
+        self.y = np.zeros(n_games, dtype=np.int16)
+
+        self.game_over = np.zeros(n_games, dtype=bool)
+        self.lines = np.zeros(n_games, dtype=np.int64)
+        self.pieces = np.zeros(n_games, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, games: Optional[np.ndarray] = None):
+        """Reset all games or the given game indices"""
+        if games is None:
+            games = np.arange(self.n_games)
+
+        self.grid[games] = 0
+        self.game_over[games] = False
+        self.lines[games] = 0
+        self.pieces[games] = 0
+        self.spawn(games)
+
+    def spawn(self, games: np.ndarray):
+        """Spawn new random pieces at the top of the given games"""
+        n = len(games)
+        self.shape[games] = self._rng.integers(0, len(Piece.SHAPES), size=n)
+        self.rot[games] = self._rng.integers(0, 4, size=n)
+        self.x[games] = self.n_cols // 2
+        self.y[games] = -2
+
+    def cells(
+        self, games: np.ndarray, x: np.ndarray, y: np.ndarray, rot: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (xs, ys) of the pieces cells, both shaped (len(games), 4)"""
+        offsets = OFFSETS[self.shape[games], rot % 4]
+        return x[:, None] + offsets[..., 0], y[:, None] + offsets[..., 1]
+
+    def fits(
+        self, games: np.ndarray, x: np.ndarray, y: np.ndarray, rot: np.ndarray
+    ) -> np.ndarray:
+        """Check the pieces of the given games fit at the positions
+
+        Cells above the grid are free.
+        """
+        xs, ys = self.cells(games, x, y, rot)
+        inside = ((xs >= 0) & (xs < self.n_cols) & (ys < self.n_rows)).all(axis=1)
+
+        occupied = self.grid[
+            games[:, None],
+            np.clip(ys, 0, self.n_rows - 1),
+            np.clip(xs, 0, self.n_cols - 1),
+        ]
+        blocked = ((occupied != 0) & (ys >= 0)).any(axis=1)
+
+        return inside & ~blocked
+
+    def _try(self, games: np.ndarray, dx, dy, drot):
+        """Apply the moves on the games where the moved piece fits"""
+        if not len(games):
+            return np.zeros(0, dtype=bool)
+
+        x = self.x[games] + dx
+        y = self.y[games] + dy
+        rot = (self.rot[games] + drot) % 4
+
+        ok = self.fits(games, x, y, rot)
+        moved = games[ok]
+        self.x[moved], self.y[moved], self.rot[moved] = x[ok], y[ok], rot[ok]
+        return ok
+
+    def step(self, actions, gravity: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """Step all running games with an Action bitmask per game
+
+        Return (locked, cleared): which games locked a piece and how many lines
+        each game cleared.
+        """
+        actions = np.broadcast_to(np.asarray(actions, dtype=np.uint8), self.n_games)
+        running = ~self.game_over
+
+        def select(action: Action) -> np.ndarray:
+            return np.flatnonzero(running & (actions & action.value != 0))
+
+        self._try(select(Action.ROTATE_CCW), 0, 0, -1)
+        self._try(select(Action.ROTATE_CW), 0, 0, 1)
+
+        dx = (actions & Action.RIGHT.value != 0).astype(np.int16) - (
+            actions & Action.LEFT.value != 0
+        )
+        games = np.flatnonzero(running & (dx != 0))
+        self._try(games, dx[games], 0, 0)
+
+        locked = np.zeros(self.n_games, dtype=bool)
+        cleared = np.zeros(self.n_games, dtype=np.int64)
+
+        falling = running & (gravity | (actions & Action.DOWN.value != 0))
+        games = np.flatnonzero(falling)
+        landed = games[~self._try(games, 0, 1, 0)]
+
+        if len(landed):
+            locked[landed] = True
+            cleared[landed] = self.lock(landed)
+
+        return locked, cleared
+
+    def lock(self, games: np.ndarray) -> np.ndarray:
+        """Lock the pieces of the games, clear full rows & spawn the next pieces
+
+        Return the cleared lines of each locked game.
+        """
+        xs, ys = self.cells(games, self.x[games], self.y[games], self.rot[games])
+
+        overflow = (ys < 0).any(axis=1)
+        self.game_over[games[overflow]] = True
+
+        games, xs, ys = games[~overflow], xs[~overflow], ys[~overflow]
+        self.grid[games[:, None], ys, xs] = (self.shape[games] + 1)[:, None]
+        self.pieces[games] += 1
+
+        cleared = np.zeros(len(overflow), dtype=np.int64)
+        cleared[~overflow] = self.clear_rows(games)
+        self.spawn(games)
+
+        return cleared
+
+    def clear_rows(self, games: np.ndarray) -> np.ndarray:
+        """Clear the full rows of the games, return the cleared counts"""
+        full = (self.grid[games] != 0).all(axis=2)
+        counts = full.sum(axis=1)
+
+        has_full = counts > 0
+        games, full, n_full = games[has_full], full[has_full], counts[has_full]
+        if len(games):
+            # stable sort puts full rows on top & keeps the order of the others
+            order = np.argsort(~full, axis=1, kind="stable")
+            grid = self.grid[games[:, None], order]
+            grid[np.arange(self.n_rows)[None, :] < n_full[:, None]] = 0
+            self.grid[games] = grid
+
+        self.lines[games] += n_full
+        return counts
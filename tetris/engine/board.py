@@ -1,25 +1,44 @@
-import random
-from typing import List, Optional, Tuple, Sequence
-
-from tetris.engine.piece import Piece
+from array import array
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Sequence
+
+from tetris.engine.piece import Piece, PieceState
+from tetris.engine.placement import Placement, enumerate_placements
+from tetris.engine.randomizer import PieceSpec, Randomizer, create_randomizer
+from tetris.engine.rotation import SRS, RotationSystem
+from tetris.engine.shape import index_offsets
 from tetris.engine.texture import Texture
-from tetris.helper import Vector, Position
+from tetris.engine.zobrist import cell_keys, next_piece_key, piece_key, row_hash
+from tetris.helper import Vector, Position, ZERO_VECTOR
+from tetris.profiling import profiled
 
 type_of_grid_mapping = List[List[Optional[Texture]]]
 
+# kinds of the journal entries
+_SET = 0
+_CLEAR = 1
+
 
-def piece_generator(position: Position, pools: Sequence) -> Piece:
-    """Piece generator"""
+class Grid:
+    """Board grid
 
-    shape_cls = random.choice(Piece.SHAPES)
-    content = random.choice(pools)
-    rot: int = random.randint(0, 3)
+    Besides the texture layer, each row keeps an integer bitmask of its occupied
+    columns (bit ``x`` set when column ``x`` is filled) so that full rows and
+    collisions can be tested with integer operations. Cells are addressed by
+    ``Position`` at the API & by packed ``y * n_cols + x`` indexes inside the
+    engine.
 
-    return Piece(position.x, position.y, shape_cls, content, rot=rot)
+    Each column also keeps a bitmask of its occupied rows, from which the
+    column heights, holes & well depths are updated on every write; they are
+    exposed as read-only arrays together with the fill count of each row.
 
+    The Zobrist hash of the filled cells is kept up to date the same way, by
+    a xor on each write & by rehashing the moved rows on each clear, and the
+    count of the writes, clears & undos tells the renders when to look again.
 
-class Grid:
-    """Board grid"""
+    While a journal is kept, every write records what it overwrites so the
+    grid can be rolled back to a mark, at the cost of the writes since then.
+    """
 
     n_rows: int
     n_cols: int
@@ -29,36 +48,339 @@ class Grid:
         self.n_cols = n_cols
 
         self._mapping: type_of_grid_mapping = [[None] * n_cols for __ in range(n_rows)]
+        self._rows: List[int] = [0] * n_rows
+        self._full_mask = (1 << n_cols) - 1
+        self._empty_row: List[Optional[Texture]] = [None] * n_cols
+
+        # bit y set when row y of the column is filled
+        self._cols: List[int] = [0] * n_cols
+        self._heights = array("H", [0] * n_cols)
+        self._holes = array("H", [0] * n_cols)
+        self._wells = array("H", [0] * n_cols)
+        self._row_counts = array("H", [0] * n_rows)
+        self._n_holes = 0
+        # the arrays are only written in place, the views stay valid
+        self._heights_view = memoryview(self._heights).toreadonly()
+        self._holes_view = memoryview(self._holes).toreadonly()
+        self._wells_view = memoryview(self._wells).toreadonly()
+        self._row_counts_view = memoryview(self._row_counts).toreadonly()
+
+        self._cell_keys = cell_keys(n_rows, n_cols)
+        self._hash = 0
+        self._writes = 0
+
+        self._journal: Optional[list] = None
 
     def __iter__(self):
         for y, rows in enumerate(self._mapping):
             for x, v in enumerate(rows):
                 yield Position(x, y), v
 
-    def set(self, value: Tuple[Position, Texture]):
+    def set(self, value: Tuple[Position, Optional[Texture]]):
         pos, t = value
-        self._mapping[int(pos.y)][int(pos.x)] = t
+        self._set(int(pos.x), int(pos.y), t)
+
+    def set_index(self, index: int, t: Optional[Texture]):
+        """Set the cell at the packed index y * n_cols + x"""
+        y, x = divmod(index, self.n_cols)
+        self._set(x, y, t)
+
+    def _set(self, x: int, y: int, t: Optional[Texture]):
+        if self._journal is not None:
+            self._journal.append((_SET, x, y, self._mapping[y][x]))
+        self._write(x, y, t)
+
+    def _write(self, x: int, y: int, t: Optional[Texture]):
+        self._mapping[y][x] = t
+        # counted even when only the texture changes
+        self._writes += 1
+
+        bit = 1 << x
+        filled = bool(self._rows[y] & bit)
+        if t is None and filled:
+            self._rows[y] &= ~bit
+            self._cols[x] &= ~(1 << y)
+            self._row_counts[y] -= 1
+        elif t is not None and not filled:
+            self._rows[y] |= bit
+            self._cols[x] |= 1 << y
+            self._row_counts[y] += 1
+        else:
+            return
+        self._hash ^= self._cell_keys[y][x]
+
+        if self._update_column(x):
+            for well in range(max(x - 1, 0), min(x + 2, self.n_cols)):
+                self._update_well(well)
+
+    def _update_column(self, x: int) -> bool:
+        """Update the height & holes of the column from its mask
+
+        Return whether the height has changed, the wells around it then need
+        to be updated.
+        """
+        col = self._cols[x]
+        # the lowest bit is the top filled row
+        height = self.n_rows - (col & -col).bit_length() + 1 if col else 0
+        holes = height - bin(col).count("1")
+        self._n_holes += holes - self._holes[x]
+        self._holes[x] = holes
+
+        if self._heights[x] == height:
+            return False
+        self._heights[x] = height
+        return True
+
+    def _update_well(self, x: int):
+        heights = self._heights
+        # walls are as high as the grid
+        left = heights[x - 1] if x > 0 else self.n_rows
+        right = heights[x + 1] if x < self.n_cols - 1 else self.n_rows
+        lower = left if left < right else right
+        self._wells[x] = lower - heights[x] if lower > heights[x] else 0
+
+    def clear_rows(self, rows: Optional[Iterable[int]] = None) -> int:
+        """Clear the full rows among the given ones, every row when not given
+
+        The rows between the top of the stack & the lowest cleared row are
+        moved down in place & the cleared row lists are reused as the new
+        empty rows, so the cost does not depend on the grid height.
+        """
+        n_rows = self.n_rows
+        masks = self._rows
+        full_mask = self._full_mask
+        if rows is None:
+            rows = range(n_rows)
+        cleared = {y for y in rows if 0 <= y < n_rows and masks[y] == full_mask}
+        if not cleared:
+            return 0
+        full = sorted(cleared)
+        self._writes += 1
+
+        mapping = self._mapping
+        counts = self._row_counts
+        freed = [mapping[y] for y in full]
+        top = n_rows - max(self._heights)
+        if self._journal is not None:
+            self._journal.append(
+                (
+                    _CLEAR,
+                    full,
+                    top,
+                    [list(line) for line in freed],
+                    list(self._cols),
+                    array("H", self._heights),
+                    array("H", self._holes),
+                    array("H", self._wells),
+                    self._n_holes,
+                    self._hash,
+                )
+            )
+
+        keys = self._cell_keys
+        moved = range(top, full[-1] + 1)
+        for y in moved:
+            self._hash ^= row_hash(keys[y], masks[y])
+
+        write = full[-1]
+        for y in range(full[-1], top - 1, -1):
+            if y not in cleared:
+                mapping[write] = mapping[y]
+                masks[write] = masks[y]
+                counts[write] = counts[y]
+                write -= 1
+
+        for y, line in zip(range(top, write + 1), freed):
+            line[:] = self._empty_row
+            mapping[y] = line
+            masks[y] = 0
+            counts[y] = 0
+
+        for y in moved:
+            self._hash ^= row_hash(keys[y], masks[y])
+
+        # top rows first, a cleared row only shifts the rows above it
+        for x in range(self.n_cols):
+            col = self._cols[x]
+            for y in full:
+                col = (col >> (y + 1) << (y + 1)) | (col & ((1 << y) - 1)) << 1
+            self._cols[x] = col
+            self._update_column(x)
+        for x in range(self.n_cols):
+            self._update_well(x)
+
+        return len(full)
+
+    def _unclear(
+        self, full, top, lines, cols, heights, holes, wells, n_holes, state_hash
+    ):
+        """Put back the rows cleared by ``clear_rows``"""
+        mapping = self._mapping
+        masks = self._rows
+        counts = self._row_counts
+        cleared = set(full)
+        self._writes += 1
+        freed = mapping[top : top + len(full)]
+
+        # the kept rows are moved up in order, each to its row before the clear
+        read = top + len(full)
+        for y in range(top, full[-1] + 1):
+            if y not in cleared:
+                mapping[y] = mapping[read]
+                masks[y] = masks[read]
+                counts[y] = counts[read]
+                read += 1
+
+        for y, line, content in zip(full, freed, lines):
+            line[:] = content
+            mapping[y] = line
+            masks[y] = self._full_mask
+            counts[y] = self.n_cols
+
+        self._cols[:] = cols
+        self._heights[:] = heights
+        self._holes[:] = holes
+        self._wells[:] = wells
+        self._n_holes = n_holes
+        self._hash = state_hash
+
+    def begin_journal(self) -> int:
+        """Keep the journal of the writes if not yet, get the mark of now"""
+        if self._journal is None:
+            self._journal = []
+        return len(self._journal)
+
+    def end_journal(self):
+        """Drop the journal, the marks can no longer be rolled back to"""
+        self._journal = None
+
+    def undo(self, mark: int):
+        """Roll back the writes made since the mark
+
+        The marks taken after this one are no longer valid.
+        """
+        journal = self._journal
+        if journal is None or not 0 <= mark <= len(journal):
+            raise ValueError(f"Mark {mark} is not in the journal")
+
+        while len(journal) > mark:
+            entry = journal.pop()
+            if entry[0] == _SET:
+                __, x, y, t = entry
+                self._write(x, y, t)
+            else:
+                self._unclear(*entry[1:])
 
-    def clear_rows(self) -> int:
-        mapping = []
-        cleared = 0
+    def is_occupied(self, position: Position) -> bool:
+        x, y = int(position.x), int(position.y)
+        if not (0 <= x < self.n_cols and 0 <= y < self.n_rows):
+            return False
+        return bool(self._rows[y] >> x & 1)
+
+    def is_row_full(self, y: int) -> bool:
+        return self._rows[y] == self._full_mask
+
+    def collides(self, masks: Sequence[Tuple[int, int]], x: int, y: int) -> bool:
+        """Check the row masks placed with bit 0 at column x and offsets from row y
+
+        Rows above the grid are free, rows below the grid always collide.
+        Horizontal bounds are not checked here.
+        """
+        rows = self._rows
+        for dy, mask in masks:
+            row = y + dy
+            if row >= self.n_rows:
+                return True
+            if row >= 0 and rows[row] & (mask << x):
+                return True
+        return False
+
+    def drop_distance(self, masks: Sequence[Tuple[int, int]], x: int, y: int) -> int:
+        """Rows the column masks placed at column x & with bit 0 at row y can fall
+
+        Only the lowest cell of each column is checked against the first
+        filled row under it, the floor otherwise; the masks are expected to
+        fit where they are & to have no gap in their columns.
+        """
+        cols = self._cols
+        n_rows = self.n_rows
+        distance = n_rows - y
+        for dx, mask in masks:
+            bottom = y + mask.bit_length() - 1
+            start = bottom + 1 if bottom >= -1 else 0
+            below = cols[x + dx] >> start
+            floor = (below & -below).bit_length() - 1 + start if below else n_rows
+            if floor - bottom - 1 < distance:
+                distance = floor - bottom - 1
+        return distance
 
-        for y, rows in enumerate(self._mapping):
-            if all(v is not None for v in rows):
-                cleared += 1
-            else:
-                mapping += [rows]
+    @property
+    def row_masks(self) -> Tuple[int, ...]:
+        return tuple(self._rows)
 
-        self._mapping = [[None] * self.n_cols for _ in range(cleared)] + mapping  # type: ignore
+    @property
+    def heights(self) -> memoryview:
+        """Height of each column, from the bottom to its top filled cell"""
+        return self._heights_view
 
-        return cleared
+    @property
+    def holes(self) -> memoryview:
+        """Empty cells under the top filled cell of each column"""
+        return self._holes_view
 
-    def is_occupied(self, position: Position) -> bool:
-        return self.get_cell(position) is not None  # type: ignore
+    @property
+    def wells(self) -> memoryview:
+        """Depth of each column below its lower neighbor, walls included"""
+        return self._wells_view
+
+    @property
+    def row_counts(self) -> memoryview:
+        """Filled cells of each row"""
+        return self._row_counts_view
+
+    @property
+    def hole_count(self) -> int:
+        return self._n_holes
+
+    @property
+    def state_hash(self) -> int:
+        """64-bit Zobrist hash of the filled cells"""
+        return self._hash
+
+    @property
+    def journaling(self) -> bool:
+        return self._journal is not None
+
+    @property
+    def journal_size(self) -> int:
+        """Entries kept in the journal to undo"""
+        return 0 if self._journal is None else len(self._journal)
+
+    @property
+    def writes(self) -> int:
+        """Count of the writes, clears & undos of the cells so far"""
+        return self._writes
 
     def get_cell(self, position: Position):
         return self._mapping[int(position.y)][int(position.x)]
 
+    def get_index(self, index: int) -> Optional[Texture]:
+        """Get the cell at the packed index y * n_cols + x"""
+        y, x = divmod(index, self.n_cols)
+        return self._mapping[y][x]
+
+
+class BoardSnapshot(NamedTuple):
+    """Board state to restore, see ``Board.snapshot``"""
+
+    grid: Grid
+    mark: int
+    piece: Piece
+    piece_state: PieceState
+    next_piece: Piece
+    next_state: PieceState
+    consumed: int
+
 
 class Board:
     n_rows: int
@@ -69,21 +391,88 @@ class Board:
 
     _grid: Grid
 
-    _texture_pools: set
-
-    def init(self, n_rows: int, n_cols: int, texture_pools: set):
+    _randomizer: Randomizer
+    _rotation: RotationSystem
+
+    def init(
+        self,
+        n_rows: int,
+        n_cols: int,
+        texture_pools: set,
+        randomizer: Optional[Randomizer] = None,
+        rotation: Optional[RotationSystem] = None,
+    ):
         """Initialize"""
         self.n_rows = n_rows
         self.n_cols = n_cols
-        self._texture_pools = texture_pools
-        self.reset()
+        self._randomizer = randomizer or create_randomizer("uniform", texture_pools)
+        self._rotation = rotation or SRS
+        self.reset(self._randomizer.seed)
 
-    def reset(self):
-        """Reset"""
+    def reset(self, seed: Optional[int] = None):
+        """Reset, a new game is played with a new seed when not given"""
+        self._randomizer.reset(seed)
         self._grid = Grid(self.n_rows, self.n_cols)
         self._next_piece = self.generate_piece()
         self.switch_piece()
 
+    def snapshot(self) -> BoardSnapshot:
+        """Take a snapshot to restore the board to later
+
+        Nothing is copied, the grid keeps a journal of its writes from the
+        first snapshot on until ``release``, so restoring costs the cells
+        written since the snapshot.
+
+        Snapshots are a LIFO undo stack: restoring one drops the snapshots
+        taken after it, they can no longer be restored. The journal grows
+        with every write until ``release``, take snapshots with
+        ``snapshotted`` to have it released.
+        """
+        piece = self._piece
+        next_piece = self._next_piece
+        return BoardSnapshot(
+            self._grid,
+            self._grid.begin_journal(),
+            piece,
+            piece.snapshot(),
+            next_piece,
+            next_piece.snapshot(),
+            self._randomizer.consumed,
+        )
+
+    def restore(self, snapshot: BoardSnapshot):
+        """Restore the board to the snapshot, dropping the newer snapshots"""
+        if snapshot.grid is not self._grid:
+            raise ValueError("The snapshot was taken before the board was reset")
+
+        self._grid.undo(snapshot.mark)
+        self._piece = snapshot.piece
+        self._piece.restore(snapshot.piece_state)
+        self._next_piece = snapshot.next_piece
+        self._next_piece.restore(snapshot.next_state)
+        if self._randomizer.consumed != snapshot.consumed:
+            self._randomizer.seek(snapshot.consumed)
+
+    def release(self):
+        """Stop keeping the journal, the snapshots can no longer be restored"""
+        self._grid.end_journal()
+
+    @contextmanager
+    def snapshotted(self) -> Iterator[BoardSnapshot]:
+        """Take a snapshot to restore within the block
+
+        The journal is released on leaving the block that started it, so
+        nested blocks keep it until the outermost one is left.
+        """
+        grid = self._grid
+        outermost = not grid.journaling
+        try:
+            yield self.snapshot()
+        finally:
+            # a reset board has a new grid, nothing to release on it
+            if outermost and grid is self._grid:
+                self.release()
+
     def set_piece(self, piece: Piece):
         """Set the piece"""
         self._piece = piece
@@ -94,23 +483,106 @@ class Board:
         self._next_piece = self.generate_piece()
 
     def generate_piece(self) -> Piece:
-        """Generate the piece"""
-        return piece_generator(
-            Position(self.n_cols // 2, -2), list(self._texture_pools)
-        )
+        """Generate the piece from the randomizer"""
+        spec = self._randomizer.next()
+        return Piece(self.n_cols // 2, -2, spec.shape_cls, spec.content, rot=spec.rot)
+
+    def preview(self, n: int) -> Tuple[PieceSpec, ...]:
+        """Peek the n pieces coming after the next piece"""
+        return self._randomizer.preview(n)
 
     def move_piece(self, vector: Vector) -> Piece:
-        """Move the piece"""
-        return self._piece.move(vector)
+        """Move the piece in place"""
+        if vector:
+            self._piece.translate(vector.x, vector.y)
+        return self._piece
 
-    def lock_piece(self):
-        """Lock the collapsed piece"""
-        for vec in self._piece:
-            self._grid.set((vec, self._piece.texture))
+    def lock_piece(self) -> Tuple[int, ...]:
+        """Lock the collapsed piece, get the rows it was written to"""
+        piece = self._piece
+        shape = piece.shape
+        x, y = int(piece.x), int(piece.y)
+        base = y * self.n_cols + x
+        texture = piece.texture
+        set_index = self._grid.set_index
+        for offset in index_offsets(type(shape), self.n_cols)[shape.index]:
+            set_index(base + offset, texture)
+        return tuple(y + dy for dy, __ in shape.row_masks)
+
+    def drop_distance(self) -> int:
+        """Rows the piece can fall before it lands"""
+        piece = self._piece
+        shape = piece.shape
+        return self._grid.drop_distance(
+            shape.col_masks, int(piece.x), int(piece.y) + shape.bounds[2]
+        )
 
-    def rotate_piece(self, clockwise: bool = False):
-        """Rotate the piece"""
-        self._piece.rotate(-1 if not clockwise else 1)
+    def ghost_y(self) -> int:
+        """Row of the piece once landed, where its ghost is drawn"""
+        return int(self._piece.y) + self.drop_distance()
+
+    def hard_drop(self) -> int:
+        """Move the piece down to its landing row, get the rows it fell"""
+        distance = self.drop_distance()
+        if distance:
+            self._piece.translate(0, distance)
+        return distance
+
+    def find_kick(self, clockwise: bool = False) -> Optional[Tuple[int, int]]:
+        """Get the first kick the rotated piece fits with, None if all are blocked"""
+        piece = self._piece
+        shape_cls = type(piece.shape)
+        index = (piece.rot + (1 if clockwise else -1)) % shape_cls.n_shapes
+        min_x, max_x, __, __ = shape_cls.bound_table[index]
+        masks = shape_cls.row_mask_table[index]
+
+        x, y = int(piece.x), int(piece.y)
+        for kx, ky in self._rotation.kicks(shape_cls, piece.rot, clockwise):
+            left = x + kx + min_x
+            if (
+                left >= 0
+                and x + kx + max_x < self.n_cols
+                and not self._grid.collides(masks, left, y + ky)
+            ):
+                return kx, ky
+        return None
+
+    def rotate_piece(self, clockwise: bool = False) -> bool:
+        """Rotate the piece with the first kick it fits with, if any"""
+        kick = self.find_kick(clockwise)
+        if kick is None:
+            return False
+
+        piece = self._piece
+        piece.rotate(-1 if not clockwise else 1)
+        if kick != (0, 0):
+            piece.translate(*kick)
+        return True
+
+    def fits(self, x: int, y: int) -> bool:
+        """Check the current piece rotation fits at the given position"""
+        shape = self._piece.shape
+        min_x, max_x, __, __ = shape.bounds
+        return (
+            x + min_x >= 0
+            and x + max_x < self.n_cols
+            and not self._grid.collides(shape.row_masks, x + min_x, y)
+        )
+
+    def placements(self) -> List[Placement]:
+        """Get every distinct resting placement reachable by the current piece"""
+        piece = self._piece
+        shape_cls = type(piece.shape)
+        return enumerate_placements(
+            self._grid.row_masks,
+            self.n_rows,
+            self.n_cols,
+            shape_cls,
+            piece.x,
+            piece.y,
+            piece.rot,
+            self._rotation.kick_table(shape_cls),
+        )
 
     @property
     def piece(self) -> Optional[Piece]:
@@ -128,38 +600,51 @@ class Board:
     def grid(self) -> Grid:
         return self._grid
 
-    def clear_lines(self) -> int:
-        """Get the cleared lines"""
-        return self._grid.clear_rows()
+    @property
+    def randomizer(self) -> Randomizer:
+        return self._randomizer
+
+    @property
+    def rotation(self) -> RotationSystem:
+        return self._rotation
+
+    @property
+    def state_hash(self) -> int:
+        """64-bit Zobrist hash of the filled cells, the piece & the next piece
+
+        Textures are not hashed, only the occupancy of the cells. Rotations
+        with the same cells, as those of the O piece, hash the same.
+        """
+        piece = self._piece
+        shape = piece.shape
+        next_shape = self._next_piece.shape
+        return (
+            self._grid.state_hash
+            ^ piece_key(type(shape).__name__, shape.index, int(piece.x), int(piece.y))
+            ^ next_piece_key(type(next_shape).__name__, next_shape.index)
+        )
+
+    def clear_lines(self, rows: Optional[Iterable[int]] = None) -> int:
+        """Clear the full rows among the given ones & get the cleared lines"""
+        return self._grid.clear_rows(rows)
 
+    @profiled("board.check_move")
     def check_move(self, vector: Vector) -> Tuple[bool, Vector]:
-        """Check is overflow and get the coordinate vector with given vector"""
-        overflow = False
-
-        v_x, v_y = 0.0, 0.0
-
-        for pos in self._piece:
-            moved_pos = pos + vector
-            if moved_pos.x < 0:
-                v_x = max(v_x, -moved_pos.x, 0)
-            elif moved_pos.x > self.n_cols - 1:
-                v_x = min(v_x, self.n_cols - moved_pos.x - 1, 0)
-            elif moved_pos.y > self.n_rows - 1:
-                v_y = 0
-                self._piece.collapsed = True
-            elif moved_pos.y > 0 and self._grid.is_occupied(moved_pos):
-                new_vec = vector.clone()
-                collapsed = True
-                while new_vec.x:
-                    if new_vec.x != 0:
-                        new_vec += Vector(-new_vec.x, 0)
-                        if not self._grid.is_occupied(pos + new_vec):
-                            collapsed = False
-                            break
-
-                v_x, v_y = new_vec - vector
-                self._piece.collapsed = collapsed
-
-            overflow = overflow or (pos + vector).y < 0 or pos.y < 0
-
-        return overflow, vector + Vector(v_x, v_y)
+        """Check is overflow and get the coordinate vector with given vector
+
+        A horizontal move blocked by a wall or locked cells is dropped, a
+        blocked downward move marks the piece as collapsed.
+        """
+        piece = self._piece
+        top = piece.y + piece.shape.bounds[2]
+        overflow = top < 0 or top + vector.y < 0
+
+        if self.fits(piece.x + vector.x, piece.y + vector.y):
+            return overflow, vector
+
+        if vector.y:
+            if vector.x and self.fits(piece.x, piece.y + vector.y):
+                return overflow, Vector(0, vector.y)
+            piece.collapsed = True
+
+        return overflow, ZERO_VECTOR
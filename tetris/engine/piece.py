@@ -1,4 +1,4 @@
-from typing import Type
+from typing import NamedTuple, Tuple, Type, Union
 
 from tetris.helper import Position, Vector
 from .shape import (
@@ -10,12 +10,26 @@ from .shape import (
     ZShape,
     TShape,
     IShape,
+    index_offsets,
 )
 from .texture import Texture
 from .typing import TextureContent
 
 
+class PieceState(NamedTuple):
+    """Value snapshot of the mutable piece state"""
+
+    x: Union[int, float]
+    y: Union[int, float]
+    rot: int
+    collapsed: bool
+
+
 class Piece:
+    """Piece state, moved & rotated in place"""
+
+    __slots__ = ("x", "y", "_shape", "_texture", "_rot", "_collapsed")
+
     SHAPES = (
         OShape,
         LShape,
@@ -49,14 +63,35 @@ class Piece:
         self._collapsed = False
 
     def move(self, vector: Vector) -> "Piece":
+        """Get a new piece moved by the vector"""
         pos = self.position + vector
         return Piece(
             pos.x, pos.y, self._shape.__class__, self.texture.content, self.rot
         )
 
+    def translate(self, dx: Union[int, float], dy: Union[int, float]):
+        """Move the piece in place"""
+        self.x += dx
+        self.y += dy
+
+    def snapshot(self) -> PieceState:
+        return PieceState(self.x, self.y, self._rot, self._collapsed)
+
+    def restore(self, state: PieceState):
+        self.x, self.y = state.x, state.y
+        self._rot = self._shape.rot = state.rot
+        self._collapsed = state.collapsed
+
     def __iter__(self):
-        for i, j in self.shape:
-            yield self.position + Vector(i, j)
+        x, y = self.x, self.y
+        for dx, dy in self._shape.offsets:
+            yield Position(x + dx, y + dy)
+
+    def cells(self, n_cols: int) -> Tuple[int, ...]:
+        """Packed indexes y * n_cols + x of the cells of the piece"""
+        base = int(self.y) * n_cols + int(self.x)
+        offsets = index_offsets(type(self._shape), n_cols)[self._shape.index]
+        return tuple(base + offset for offset in offsets)
 
     @property
     def position(self) -> Position:
@@ -0,0 +1,473 @@
+from collections import deque
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from tetris.engine.action import Action
+from tetris.engine.rotation import NO_KICKS, type_of_kick_table
+from tetris.engine.shape import Shape
+
+# rows kept above the grid in the packed board, pieces start at y >= -4
+_PAD = 6
+# filled rows below the grid in the packed board
+_FLOOR = 3
+
+_LEFT = Action.LEFT
+_RIGHT = Action.RIGHT
+_CW = Action.ROTATE_CW
+_CCW = Action.ROTATE_CCW
+_DOWN = Action.DOWN
+
+
+class Placement(NamedTuple):
+    """Resting position of a piece & the inputs reaching it from the start"""
+
+    x: int
+    y: int
+    rot: int
+    path: Tuple[Action, ...]
+
+
+class _Seed(NamedTuple):
+    # index of the (x, rot) in the flat landing table
+    index: int
+    # state key of the (x, rot) at row -4
+    key: int
+    # inputs reaching the (x, rot) from the start without going down
+    path: Tuple[Action, ...]
+    # x & rot of its placements
+    x: int
+    rot: int
+
+
+class _Move(NamedTuple):
+    # index of the first target & the rows under its landing the move may be
+    # left from, then the seed & its left, right or rotation
+    first: int
+    under: int
+    index: int
+    key: int
+    path: Tuple[Action, ...]
+    action: Action
+    # targets inside the walls, (index offset, state key offset, rows down) in
+    # the order of the kicks; the first is on the same row
+    targets: Tuple[Tuple[int, int, int], ...]
+
+
+class _SeedTable(NamedTuple):
+    seeds: Tuple[_Seed, ...]
+    moves: Tuple[_Move, ...]
+    # False when a kick moves a seed off the start row, the straight drops
+    # can not be used then
+    flat: bool
+
+
+class _PieceTables(NamedTuple):
+    # 4 for rotating shapes, 1 when all rotations are identical
+    n_rots: int
+    # per rotation * (n_cols + 4) + x + 2: packed piece, 0 outside the walls
+    candidates: Tuple[int, ...]
+    # per rotation: the x outside the left & right walls, and for each column
+    # under the piece its first & past the last column tops over the x inside
+    # the walls & its lowest dy + 1
+    spans: Tuple[Tuple[int, int, Tuple[Tuple[int, int, int], ...]], ...]
+    # lowest dy over all rotations
+    reach: int
+
+
+@lru_cache(maxsize=None)
+def _piece_tables(shape_cls: Type[Shape], n_cols: int) -> _PieceTables:
+    n_shapes = shape_cls.n_shapes
+    n_rots = 4 if n_shapes > 1 else 1
+
+    candidates: List[int] = []
+    spans = []
+    for r in range(n_rots):
+        min_x, max_x, min_y, __ = shape_cls.bound_table[r % n_shapes]
+        piece = sum(
+            mask << ((dy + 2) * n_cols)
+            for dy, mask in shape_cls.row_mask_table[r % n_shapes]
+        )
+        candidates.extend(
+            piece << (c + min_x) if -min_x <= c <= n_cols - 1 - max_x else 0
+            for c in range(-2, n_cols + 2)
+        )
+        columns = tuple(
+            (dx - min_x, n_cols - max_x + dx, min_y + mask.bit_length())
+            for dx, mask in shape_cls.col_mask_table[r % n_shapes]
+        )
+        spans.append((2 - min_x, max_x + 2, columns))
+
+    reach = max(max_y for __, __, __, max_y in shape_cls.bound_table)
+    return _PieceTables(n_rots, tuple(candidates), tuple(spans), reach)
+
+
+def _landings(
+    spans: Tuple[Tuple[int, int, Tuple[Tuple[int, int, int], ...]], ...],
+    tops: List[int],
+) -> List[int]:
+    """Straight drop landing row of each rotation * (n_cols + 4) + x + 2
+
+    A landing is the lowest of the column tops under the piece less the
+    lowest dy + 1 of its column, computed a column at a time over all the x.
+    The x outside the walls land above any row searched.
+    """
+    # the tops less each lowest dy + 1
+    lowered: Dict[int, List[int]] = {}
+    landings: List[int] = []
+    for n_left, n_right, columns in spans:
+        landings += repeat(-_PAD, n_left)
+        lowest = None
+        for start, stop, bottom in columns:
+            tops_less = lowered.get(bottom)
+            if tops_less is None:
+                tops_less = lowered[bottom] = [top - bottom for top in tops]
+            if lowest is None:
+                lowest = tops_less[start:stop]
+            else:
+                lowest = [
+                    a if a < b else b for a, b in zip(lowest, tops_less[start:stop])
+                ]
+        landings += lowest  # type: ignore
+        landings += repeat(-_PAD, n_right)
+    return landings
+
+
+@lru_cache(maxsize=None)
+def _rotation_moves(
+    n_cols: int, kicks: type_of_kick_table
+) -> Tuple[Tuple[Tuple[Tuple[int, int, int], ...], ...], ...]:
+    """Per rotation, the kicks of the clockwise & counterclockwise rotations
+
+    Each kick is the offset of the index in the landing table, the offset of
+    the state key & the rows it moves the piece down by.
+    """
+    width = n_cols + 4
+    stride = width * 4
+    return tuple(
+        tuple(
+            tuple(
+                (
+                    ((r + turn) % 4 - r) * width + kx,
+                    (r + turn) % 4 - r + kx * 4 + ky * stride,
+                    ky,
+                )
+                for kx, ky in kicks[r][i]
+            )
+            for i, turn in enumerate((1, 3))
+        )
+        for r in range(4)
+    )
+
+
+@lru_cache(maxsize=None)
+def _seeds(
+    shape_cls: Type[Shape], n_cols: int, x: int, rot: int, kicks: type_of_kick_table
+) -> _SeedTable:
+    """Get every (x, rot) reachable on rows free of locked cells
+
+    Only the walls block a kick there, so the first kick inside the walls
+    is taken. A kick moving the piece up or down usually comes after a kick
+    with the same column which the walls block as well (as with SRS), the
+    seeds then all stay on the start row.
+    """
+    n_rots, candidates, __, __ = _piece_tables(shape_cls, n_cols)
+    # the placements of shapes with identical rotations keep the start rot
+    start_rot, rot = rot, rot % n_rots
+    width = n_cols + 4
+    rotations = _rotation_moves(n_cols, kicks)
+    flat = True
+
+    def neighbors(index: int) -> List[Tuple[int, Action]]:
+        nonlocal flat
+        moves = [(index - 1, Action.LEFT), (index + 1, Action.RIGHT)]
+        moves = [(n, action) for n, action in moves if candidates[n]]
+        if n_rots > 1:
+            r = index // width
+            for action, kicked in zip((_CW, _CCW), rotations[r]):
+                for d_index, __, ky in kicked:
+                    if candidates[index + d_index]:
+                        if ky:
+                            flat = False
+                        else:
+                            moves.append((index + d_index, action))
+                        break
+        return moves
+
+    start = rot * width + x + 2
+    paths: Dict[int, Tuple[Action, ...]] = {start: ()}
+    queue = deque([start])
+    while queue:
+        index = queue.popleft()
+        for n_index, action in neighbors(index):
+            if n_index not in paths:
+                paths[n_index] = paths[index] + (action,)
+                queue.append(n_index)
+
+    # per rotation, the rows under its landing a piece is first free at: the
+    # lowest cells of a column all go under the column top they landed on
+    depths = []
+    for r in range(n_rots):
+        runs = []
+        for __, mask in shape_cls.col_mask_table[r % shape_cls.n_shapes]:
+            n = mask.bit_length()
+            runs.append(n - (~mask & ((1 << n) - 1)).bit_length())
+        depths.append(min(runs) + 1)
+
+    seeds = []
+    moves = []
+    for index, path in paths.items():
+        r, c = divmod(index, width)
+        key = c * 4 + r
+        seeds.append(_Seed(index, key, path, c - 2, r if n_rots > 1 else start_rot))
+        moves.extend(
+            _Move(index + d, depths[r], index, key, path, action, ((d, d_key, 0),))
+            for d, d_key, action in ((-1, -4, _LEFT), (1, 4, _RIGHT))
+            if candidates[index + d]
+        )
+        if n_rots > 1:
+            for action, kicked in zip((_CW, _CCW), rotations[r]):
+                targets = tuple(kick for kick in kicked if candidates[index + kick[0]])
+                if targets:
+                    # the rows under the landing of the first kick are blocked, not
+                    # those of the next kicks
+                    first = index + targets[0][0]
+                    under = depths[first // width] if len(targets) == 1 else 1
+                    moves.append(_Move(first, under, index, key, path, action, targets))
+    return _SeedTable(tuple(seeds), tuple(moves), flat)
+
+
+# (shape, n_cols, x, rot, kicks, y) of a start -> placements of its straight
+# drops by cells, of the first seed covering them which is the same on any
+# board; a start holds a drop per (x, rot) & landing row at most
+_drops: Dict[tuple, Dict[int, Placement]] = {}
+# starts kept in _drops at most, it is emptied past them
+_DROPS_SIZE = 256
+
+
+def _rebuild_path(paths: dict, key: int) -> Tuple[Action, ...]:
+    actions = []
+    node = paths[key]
+    while len(node) == 2:
+        key, action = node
+        actions.append(action)
+        node = paths[key]
+    __, prefix, downs = node
+    actions.reverse()
+    return prefix + (_DOWN,) * downs + tuple(actions)
+
+
+def column_tops(rows: Sequence[int], n_rows: int, n_cols: int) -> List[int]:
+    """Get the first occupied row of each column, n_rows for empty columns"""
+    tops = [n_rows] * n_cols
+    seen = 0
+    full = (1 << n_cols) - 1
+    for y, mask in enumerate(rows):
+        new = mask & ~seen
+        while new:
+            bit = new & -new
+            tops[bit.bit_length() - 1] = y
+            new ^= bit
+        seen |= mask
+        if seen == full:
+            break
+    return tops
+
+
+def pack_rows(rows: Sequence[int], n_rows: int, n_cols: int) -> int:
+    """Pack the row masks into one integer with bit (y + _PAD) * n_cols + x
+
+    The rows below the grid are filled so that the floor collides.
+    """
+    board = 0
+    for y, mask in enumerate(rows):
+        if mask:
+            board |= mask << ((y + _PAD) * n_cols)
+    floor = (1 << (n_cols * _FLOOR)) - 1
+    return board | floor << ((n_rows + _PAD) * n_cols)
+
+
+def enumerate_placements(
+    rows: Sequence[int],
+    n_rows: int,
+    n_cols: int,
+    shape_cls: Type[Shape],
+    x: int,
+    y: int,
+    rot: int,
+    kicks: type_of_kick_table = NO_KICKS,
+) -> List[Placement]:
+    """Get every distinct resting placement reachable from the given piece
+
+    A BFS over left, right, rotations & one row down moves from (x, y, rot)
+    with a visited set keyed by (x, y, rot), collisions are one AND on the
+    packed board. A rotation takes the first of its kicks that fits, kicks
+    above row -4 are not searched. When the start row is above the whole
+    stack, each (x, rot) drops straight to its landing row computed from the
+    column tops, the placements of those drops are kept across the calls,
+    and only the moves which could leave a drop to a row under the landing
+    of their target are searched from. Placements covering the same cells
+    (symmetric rotations) are kept once, with the first path found.
+    """
+    n_rots, candidates, spans, reach = _piece_tables(shape_cls, n_cols)
+    rotations = _rotation_moves(n_cols, kicks)
+    # shapes with identical rotations only need the states of one rotation
+    start_rot = rot % 4
+    rot = start_rot % n_rots
+    width = n_cols + 4
+    stride = width * 4
+
+    board = pack_rows(rows, n_rows, n_cols)
+    piece = candidates[rot * width + x + 2]
+    # a piece at row y tests the board shifted by (y + 4) rows
+    if not piece or (board >> ((y + 4) * n_cols)) & piece:
+        return []
+
+    # state key -> (parent key, action), (None, path, downs) for the states
+    # the search starts from, None when the state is blocked
+    paths: Dict[int, Optional[tuple]] = {}
+    # cells of a resting piece -> state key of the first path reaching it
+    resting: Dict[int, int] = {}
+    queue: deque = deque()
+    # straight drop landing row of each rotation * width + x + 2 when the
+    # start row is above the stack, the search then skips rows above them
+    landings: Optional[List[int]] = None
+    # placements of the straight drops by cells, before those searched
+    dropped: Dict[int, Placement] = {}
+
+    # skips the argument parsing of the constructor
+    make_placement = Placement._make
+    tops = column_tops(rows, n_rows, n_cols)
+    seeds, moves, flat = _seeds(shape_cls, n_cols, x, start_rot, kicks)
+    if flat and y + reach < min(tops):
+        landings = _landings(spans, tops)
+
+        start = (shape_cls, n_cols, x, start_rot, kicks, y)
+        drops = _drops.get(start)
+        if drops is None:
+            if len(_drops) >= _DROPS_SIZE:
+                _drops.clear()
+            drops = _drops[start] = {}
+        for index, __, path, p_x, p_rot in seeds:
+            landing = landings[index]
+            cells = candidates[index] << ((landing + 4) * n_cols)
+            if cells not in dropped:
+                placement = drops.get(cells)
+                if placement is None:
+                    placement = drops[cells] = make_placement(
+                        (p_x, landing, p_rot, path + (_DOWN,) * (landing - y))
+                    )
+                dropped[cells] = placement
+
+        # a move leaves the drop to a row under the landing of its target, its
+        # lowest cells go under the column tops first
+        for first, under, index, key, path, action, targets in moves:
+            s_y = landings[first] + under
+            landing = landings[index]
+            if s_y > landing:
+                continue
+            if s_y < y:
+                s_y = y
+
+            if len(targets) == 1:
+                # a lone target, on the row of the drop of a flat seed table
+                piece = candidates[first]
+                d_key = targets[0][1]
+                for s_y in range(s_y, landing + 1):
+                    if not (board >> ((s_y + 4) * n_cols)) & piece:
+                        s_key = key + (s_y + 4) * stride
+                        n_key = s_key + d_key
+                        if n_key not in paths:
+                            paths[s_key] = (None, path, s_y - y)
+                            paths[n_key] = (s_key, action)
+                            queue.append((first, s_y, n_key))
+                continue
+
+            for s_y in range(s_y, landing + 1):
+                # the first kick that fits
+                for d_index, d_key, ky in targets:
+                    n_index = index + d_index
+                    n_y = s_y + ky
+                    if n_y < -4 or n_y <= landings[n_index]:
+                        break
+                    if n_y > landings[n_index] + 1 and not (
+                        (board >> ((n_y + 4) * n_cols)) & candidates[n_index]
+                    ):
+                        s_key = key + (s_y + 4) * stride
+                        n_key = s_key + d_key
+                        if n_key not in paths:
+                            paths[s_key] = (None, path, s_y - y)
+                            paths[n_key] = (s_key, action)
+                            queue.append((n_index, n_y, n_key))
+                        break
+    else:
+        key = (y + 4) * stride + (x + 2) * 4 + rot
+        paths[key] = (None, (), 0)
+        queue.append((rot * width + x + 2, y, key))
+
+    while queue:
+        index, s_y, key = queue.popleft()
+        row = board >> ((s_y + 4) * n_cols)
+
+        for n_index, n_key, action in (
+            (index - 1, key - 4, _LEFT),
+            (index + 1, key + 4, _RIGHT),
+        ):
+            if landings is not None and s_y <= landings[n_index]:
+                # on a straight drop, reached by its own search
+                continue
+            if n_key in paths:
+                continue
+            piece = candidates[n_index]
+            if not piece or row & piece:
+                paths[n_key] = None
+            else:
+                paths[n_key] = (key, action)
+                queue.append((n_index, s_y, n_key))
+
+        if n_rots > 1:
+            for action, kicked in zip((_CW, _CCW), rotations[key & 3]):
+                # the first kick inside the walls & free of locked cells
+                for d_index, d_key, ky in kicked:
+                    piece = candidates[d_index + index]
+                    if not piece:
+                        continue
+                    n_y = s_y + ky
+                    if n_y < -4 or not (
+                        (board >> ((n_y + 4) * n_cols) if ky else row) & piece
+                    ):
+                        break
+                else:
+                    continue
+
+                n_index = index + d_index
+                n_key = key + d_key
+                if n_y < -4 or n_key in paths:
+                    continue
+                if landings is not None and n_y <= landings[n_index]:
+                    continue
+                paths[n_key] = (key, action)
+                queue.append((n_index, n_y, n_key))
+
+        piece = candidates[index]
+        if not (row >> n_cols) & piece:
+            n_key = key + stride
+            if n_key not in paths:
+                paths[n_key] = (key, _DOWN)
+                queue.append((index, s_y + 1, n_key))
+            continue
+
+        cells = piece << ((s_y + 4) * n_cols)
+        if cells not in resting and cells not in dropped:
+            resting[cells] = key
+
+    placements = list(dropped.values())
+    for key in resting.values():
+        p_y, rest = divmod(key, stride)
+        p_x, p_rot = divmod(rest, 4)
+        if n_rots == 1:
+            p_rot = start_rot
+        placements.append(
+            make_placement((p_x - 2, p_y - 4, p_rot, _rebuild_path(paths, key)))
+        )
+    return placements
@@ -0,0 +1,224 @@
+import abc
+import random
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from tetris.engine.piece import Piece
+from tetris.engine.shape import (
+    IShape,
+    JShape,
+    LShape,
+    Shape,
+    TShape,
+    ZShape,
+)
+from tetris.engine.typing import TextureContent
+
+
+class PieceSpec(NamedTuple):
+    """What a piece is made of, before it is placed on the board"""
+
+    shape_cls: Type[Shape]
+    content: TextureContent
+    rot: int
+
+
+class Randomizer(abc.ABC):
+    """Seeded source of the upcoming pieces
+
+    The pieces are drawn in bulk into a ring buffer, refilled once half of
+    it is consumed, so taking a piece is an index most of the time. Each
+    piece always takes the same draws from the generator, so the sequence of
+    a seed does not depend on how far ahead it is filled or previewed.
+
+    The last taken pieces are kept in the buffer, seeking back to them is an
+    index too; seeking further draws the sequence again from the seed.
+    """
+
+    BUFFER_SIZE: int = 64
+    # taken pieces kept in the buffer
+    HISTORY_SIZE: int = 16
+
+    seed: int
+
+    _rng: random.Random
+    _pools: List[TextureContent]
+
+    _buffer: List[Optional[PieceSpec]]
+    _capacity: int
+    # pieces put into & taken from the buffer since the reset
+    _produced: int
+    _consumed: int
+    # first piece still in the buffer
+    _kept: int
+
+    def __init__(self, pools: Iterable[TextureContent], seed: Optional[int] = None):
+        # a set has no stable order across processes
+        self._pools = sorted(pools, key=repr)
+        if not self._pools:
+            raise ValueError("Texture pools are empty !!")
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None):
+        """Restart the sequence from the seed, a new one when not given"""
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self._rng = random.Random(self.seed)
+        self.reset_shapes()
+
+        self._capacity = self.BUFFER_SIZE
+        self._buffer = [None] * self._capacity
+        self._produced = 0
+        self._consumed = 0
+        self._kept = 0
+        self.fill()
+
+    @abc.abstractmethod
+    def reset_shapes(self):
+        """Reset the state of the shape sequence"""
+
+    @abc.abstractmethod
+    def next_shape(self) -> Type[Shape]:
+        """Draw the shape of the next piece"""
+
+    def fill(self):
+        """Draw pieces into every free slot of the buffer"""
+        buffer = self._buffer
+        capacity = self._capacity
+        pools = self._pools
+        n_pools = len(pools)
+        rand = self._rng.random
+        getrandbits = self._rng.getrandbits
+        next_shape = self.next_shape
+
+        produced = self._consumed + capacity - self.HISTORY_SIZE
+        for i in range(self._produced, produced):
+            buffer[i % capacity] = PieceSpec(
+                next_shape(), pools[int(rand() * n_pools)], getrandbits(2)
+            )
+        self._produced = produced
+        self._kept = max(self._kept, produced - capacity)
+
+    def next(self) -> PieceSpec:
+        """Take the next piece"""
+        if self._produced - self._consumed <= self._capacity // 2:
+            self.fill()
+
+        spec = self._buffer[self._consumed % self._capacity]
+        self._consumed += 1
+        return spec  # type: ignore
+
+    def preview(self, n: int) -> Tuple[PieceSpec, ...]:
+        """Peek the next n pieces without taking them"""
+        if n > self._capacity - self.HISTORY_SIZE:
+            self.grow(n + self.HISTORY_SIZE)
+
+        if self._produced - self._consumed < n:
+            self.fill()
+
+        capacity = self._capacity
+        start = self._consumed % capacity
+        end = start + n
+        if end <= capacity:
+            return tuple(self._buffer[start:end])  # type: ignore
+        return tuple(self._buffer[start:] + self._buffer[: end - capacity])  # type: ignore
+
+    def grow(self, n: int):
+        """Grow the buffer to hold at least n pieces"""
+        capacity = self._capacity
+        while capacity < n:
+            capacity *= 2
+
+        pending = [
+            self._buffer[i % self._capacity]
+            for i in range(self._consumed, self._produced)
+        ]
+        self._buffer = [None] * capacity
+        self._capacity = capacity
+        for i, spec in enumerate(pending, self._consumed):
+            self._buffer[i % capacity] = spec
+        self._kept = self._consumed
+
+    def seek(self, index: int):
+        """Make the piece at the index of the sequence the next one taken"""
+        if not self._kept <= index <= self._produced:
+            self.reset(self.seed)
+            while self._produced < index:
+                self._consumed = self._produced
+                self.fill()
+        self._consumed = index
+
+    @property
+    def consumed(self) -> int:
+        return self._consumed
+
+
+class UniformRandomizer(Randomizer):
+    """Every shape is equally likely on every piece"""
+
+    def reset_shapes(self):
+        pass
+
+    def next_shape(self) -> Type[Shape]:
+        return Piece.SHAPES[int(self._rng.random() * len(Piece.SHAPES))]
+
+
+class BagRandomizer(Randomizer):
+    """Deals each shape once from a shuffled bag of all 7 before refilling it"""
+
+    _bag: List[Type[Shape]]
+
+    def reset_shapes(self):
+        self._bag = []
+
+    def next_shape(self) -> Type[Shape]:
+        if not self._bag:
+            self._bag = list(Piece.SHAPES)
+            self._rng.shuffle(self._bag)
+        return self._bag.pop()
+
+
+class HistoryRandomizer(Randomizer):
+    """TGM randomizer, rerolls a shape found in the last 4 dealt ones
+
+    The history starts full of Z shapes & the first piece is never an S, Z
+    or O shape, so a game never starts with an overhang.
+    """
+
+    ROLLS: int = 6
+    FIRST_SHAPES: Tuple[Type[Shape], ...] = (IShape, JShape, LShape, TShape)
+    INIT_HISTORY: Tuple[Type[Shape], ...] = (ZShape, ZShape, ZShape, ZShape)
+
+    _history: Deque[Type[Shape]]
+    _first: bool
+
+    def reset_shapes(self):
+        self._history = deque(self.INIT_HISTORY, maxlen=len(self.INIT_HISTORY))
+        self._first = True
+
+    def next_shape(self) -> Type[Shape]:
+        rand = self._rng.random
+        if self._first:
+            self._first = False
+            shape_cls = self.FIRST_SHAPES[int(rand() * len(self.FIRST_SHAPES))]
+        else:
+            for __ in range(self.ROLLS):
+                shape_cls = Piece.SHAPES[int(rand() * len(Piece.SHAPES))]
+                if shape_cls not in self._history:
+                    break
+
+        self._history.append(shape_cls)
+        return shape_cls
+
+
+_randomizer_map: Dict[str, Type[Randomizer]] = {
+    "uniform": UniformRandomizer,
+    "bag": BagRandomizer,
+    "tgm": HistoryRandomizer,
+}
+
+
+def create_randomizer(
+    _type: str, pools: Iterable[TextureContent], seed: Optional[int] = None
+) -> Randomizer:
+    randomizer_cls = _randomizer_map.get(_type) or UniformRandomizer
+    return randomizer_cls(pools, seed)
@@ -0,0 +1,237 @@
+import struct
+import zlib
+from typing import BinaryIO, NamedTuple, Optional, Tuple, Union
+
+from tetris.engine.action import Action
+from tetris.engine.board import Board
+from tetris.engine.tetris import TetrisEngine
+
+MAGIC = b"TRP\x02"
+# replays without the rotation system, recorded with classic rotations
+MAGIC_V1 = b"TRP\x01"
+# set on the input bitmask of a frame locking a piece, a checksum follows
+LOCK_FLAG = 0x80
+
+
+class ReplayHeader(NamedTuple):
+    seed: int
+    n_rows: int
+    n_cols: int
+    randomizer_type: str
+    rotation_type: str = "srs"
+
+
+class ReplayError(Exception):
+    """Malformed replay"""
+
+
+class ReplayDivergence(ReplayError):
+    """The re-simulated game is not the recorded one"""
+
+    def __init__(self, frame: int, message: str):
+        super().__init__(f"Replay diverged at frame {frame}: {message}")
+        self.frame = frame
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non negative integer 7 bits per byte, low bits first"""
+    if value < 0:
+        raise ValueError(f"Negative varint {value} !!")
+
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode the varint at pos, get the value & the position after it"""
+    value = shift = 0
+    while True:
+        try:
+            byte = data[pos]
+        except IndexError:
+            raise ReplayError("Truncated varint") from None
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def board_checksum(board: Board) -> int:
+    """CRC32 of the occupied cells of the board
+
+    Each row mask is hashed as little endian bytes: 4 up to 32 columns, so
+    the older replays still check, and as many as the wider boards need.
+    """
+    width = max(4, (board.n_cols + 7) // 8)
+    return zlib.crc32(
+        b"".join(mask.to_bytes(width, "little") for mask in board.grid.row_masks)
+    )
+
+
+def encode_header(header: ReplayHeader) -> bytes:
+    randomizer_type = header.randomizer_type.encode()
+    rotation_type = header.rotation_type.encode()
+    return b"".join(
+        (
+            MAGIC,
+            encode_varint(header.seed),
+            encode_varint(header.n_rows),
+            encode_varint(header.n_cols),
+            encode_varint(len(randomizer_type)),
+            randomizer_type,
+            encode_varint(len(rotation_type)),
+            rotation_type,
+        )
+    )
+
+
+def decode_header(data: bytes) -> Tuple[ReplayHeader, int]:
+    """Decode the header, get it & the position of the first frame"""
+    magic = data[: len(MAGIC)]
+    if magic not in (MAGIC, MAGIC_V1):
+        raise ReplayError("Not a replay")
+
+    pos = len(MAGIC)
+    seed, pos = decode_varint(data, pos)
+    n_rows, pos = decode_varint(data, pos)
+    n_cols, pos = decode_varint(data, pos)
+    size, pos = decode_varint(data, pos)
+    randomizer_type = data[pos : pos + size].decode()
+    pos += size
+    if magic == MAGIC_V1:
+        return ReplayHeader(seed, n_rows, n_cols, randomizer_type, "classic"), pos
+
+    size, pos = decode_varint(data, pos)
+    rotation_type = data[pos : pos + size].decode()
+    header = ReplayHeader(seed, n_rows, n_cols, randomizer_type, rotation_type)
+    return header, pos + size
+
+
+class ReplayRecorder:
+    """Writes the inputs of every engine step to a binary stream
+
+    A frame is the varint of the elapsed milliseconds & the input bitmask
+    byte; a frame locking a piece has the LOCK_FLAG bit set & is followed by
+    the 4 bytes checksum of the board after the lock.
+    """
+
+    _stream: BinaryIO
+    _engine: TetrisEngine
+    # piece of the engine before the recorded step
+    _piece: object
+
+    def __init__(self, stream: BinaryIO, engine: TetrisEngine):
+        self._stream = stream
+        self._engine = engine
+        self._piece = engine.board.piece
+
+        board = engine.board
+        stream.write(
+            encode_header(
+                ReplayHeader(
+                    engine.seed,
+                    board.n_rows,
+                    board.n_cols,
+                    engine.randomizer_type,
+                    engine.rotation_type,
+                )
+            )
+        )
+
+    def record(self, actions: Union[Action, int], dt: int):
+        """Record the step the engine has just run with the actions & dt"""
+        board = self._engine.board
+        frame = encode_varint(dt)
+        if board.piece is self._piece:
+            self._stream.write(frame + bytes((int(actions),)))
+            return
+
+        self._piece = board.piece
+        self._stream.write(
+            frame
+            + bytes((int(actions) | LOCK_FLAG,))
+            + struct.pack("<I", board_checksum(board))
+        )
+        self._stream.flush()
+
+    def close(self):
+        self._stream.close()
+
+
+def play_replay(data: bytes, engine: Optional[TetrisEngine] = None) -> TetrisEngine:
+    """Re-simulate the recorded game on the headless engine
+
+    Raise ReplayDivergence as soon as a piece locks on a different frame or
+    leaves a different board than recorded.
+    """
+    header, pos = decode_header(data)
+    if engine is None:
+        engine = TetrisEngine(
+            header.n_rows,
+            header.n_cols,
+            seed=header.seed,
+            randomizer_type=header.randomizer_type,
+            rotation_type=header.rotation_type,
+        )
+    else:
+        engine.restart(header.seed)
+
+    board = engine.board
+    step = engine.step
+    piece = board.piece
+    size = len(data)
+    frame = 0
+    while pos < size:
+        # inlined varint, a frame time is a single byte most of the time
+        dt = data[pos]
+        pos += 1
+        if dt > 0x7F:
+            dt, pos = decode_varint(data, pos - 1)
+        try:
+            actions = data[pos]
+        except IndexError:
+            raise ReplayError("Truncated frame") from None
+        pos += 1
+
+        step(actions & ~LOCK_FLAG, dt)
+        locked = board.piece is not piece
+        if actions & LOCK_FLAG:
+            if not locked:
+                raise ReplayDivergence(frame, "no piece locked")
+            (checksum,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            if checksum != board_checksum(board):
+                raise ReplayDivergence(frame, "board checksum mismatch")
+            piece = board.piece
+        elif locked:
+            raise ReplayDivergence(frame, "unexpected piece lock")
+        frame += 1
+
+    return engine
+
+
+def main():
+    """Re-simulate replay files
+
+    $ python -m tetris.engine.replay replays/*.replay
+    """
+    import sys
+
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            engine = play_replay(data)
+        except ReplayError as e:
+            print(f"{path}: {e}")
+        else:
+            print(f"{path}: score {engine.score}, level {engine.level}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from typing import Dict, Tuple, Type
+
+from tetris.engine.shape import (
+    IShape,
+    JShape,
+    LShape,
+    OShape,
+    Shape,
+    SShape,
+    TShape,
+    ZShape,
+)
+
+type_of_kicks = Tuple[Tuple[int, int], ...]
+# per rotation index % 4, the kicks of the clockwise & counterclockwise rotations
+type_of_kick_table = Tuple[Tuple[type_of_kicks, type_of_kicks], ...]
+
+# SRS offsets with y up, by (rotation from, rotation to)
+_SRS_JLSTZ = {
+    (0, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (1, 0): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (1, 2): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (2, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (0, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+}
+_SRS_I = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+}
+
+
+# SRS state of the rotation index 0 of the shape matrices, index i is the
+# state (i + first) % 4; the I states are matched by orientation only, as
+# both of its vertical & both of its horizontal matrices share a column & a row
+SRS_FIRST_STATES: Dict[Type[Shape], int] = {
+    IShape: 3,
+    JShape: 1,
+    LShape: 1,
+    SShape: 1,
+    TShape: 3,
+    ZShape: 3,
+}
+
+
+def compile_kicks(
+    offsets: Dict[Tuple[int, int], type_of_kicks], first: int = 0
+) -> type_of_kick_table:
+    """Compile the offsets by state pair into a table by rotation index, y down
+
+    ``first`` is the state of the rotation index 0.
+    """
+    return tuple(
+        tuple(
+            tuple((dx, -dy) for dx, dy in offsets[(state, (state + turn) % 4)])
+            for turn in (1, 3)
+        )
+        for state in ((rot + first) % 4 for rot in range(4))
+    )
+
+
+NO_KICKS: type_of_kick_table = ((((0, 0),), ((0, 0),)),) * 4
+# by SRS state
+SRS_JLSTZ_KICKS = compile_kicks(_SRS_JLSTZ)
+SRS_I_KICKS = compile_kicks(_SRS_I)
+
+
+class RotationSystem:
+    """Kicks tried in order when a piece rotates, the first one fitting is taken
+
+    The kick tables are compiled at import, getting the kicks of a rotation
+    is a lookup.
+    """
+
+    name: str
+
+    def __init__(
+        self,
+        name: str,
+        tables: Dict[Type[Shape], type_of_kick_table],
+        default: type_of_kick_table,
+    ):
+        self.name = name
+        self._tables = tables
+        self._default = default
+
+    def kick_table(self, shape_cls: Type[Shape]) -> type_of_kick_table:
+        return self._tables.get(shape_cls, self._default)
+
+    def kicks(self, shape_cls: Type[Shape], rot: int, clockwise: bool) -> type_of_kicks:
+        """Get the kicks of rotating the shape from the rotation"""
+        return self.kick_table(shape_cls)[rot % 4][0 if clockwise else 1]
+
+
+# the rotation only, blocked rotations are not kicked
+CLASSIC = RotationSystem("classic", {}, NO_KICKS)
+# Super Rotation System kicks over the rotations of the shapes
+SRS = RotationSystem(
+    "srs",
+    {
+        **{
+            shape_cls: compile_kicks(
+                _SRS_I if shape_cls is IShape else _SRS_JLSTZ, first
+            )
+            for shape_cls, first in SRS_FIRST_STATES.items()
+        },
+        OShape: NO_KICKS,
+    },
+    SRS_JLSTZ_KICKS,
+)
+
+_rotation_map: Dict[str, RotationSystem] = {
+    CLASSIC.name: CLASSIC,
+    SRS.name: SRS,
+}
+
+
+def create_rotation_system(_type: str) -> RotationSystem:
+    return _rotation_map.get(_type) or SRS
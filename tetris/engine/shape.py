@@ -1,9 +1,81 @@
 import itertools
+from functools import lru_cache
+from typing import Dict, Tuple, Type
 
 from tetris.helper import Vector
 
+type_of_offsets = Tuple[Tuple[int, int], ...]
+type_of_bounds = Tuple[int, int, int, int]
+type_of_masks = Tuple[Tuple[int, int], ...]
 
-class Shape:
+
+def compile_rows(
+    rows: list,
+) -> Tuple[type_of_offsets, type_of_bounds, type_of_masks, type_of_masks]:
+    """Compile a shape matrix into offsets, bounds, row masks & column masks
+
+    Offsets are relative to the shape center, bounds are
+    (min_x, max_x, min_y, max_y), row masks are (dy, mask) with bit 0 at min_x
+    and column masks are (dx, mask) with bit 0 at min_y.
+    """
+    n_rows, n_cols = len(rows), len(rows[0]) if rows else 0
+    c_x, c_y = n_cols // 2, n_rows // 2
+
+    offsets = tuple(
+        (i - c_x, j - c_y)
+        for i, j in itertools.product(range(n_cols), range(n_rows))
+        if rows[j][i] == 1
+    )
+    if not offsets:
+        return (), (0, -1, 0, -1), (), ()
+
+    min_x = min(dx for dx, __ in offsets)
+    max_x = max(dx for dx, __ in offsets)
+    min_y = min(dy for __, dy in offsets)
+    max_y = max(dy for __, dy in offsets)
+
+    row_masks: Dict[int, int] = {}
+    col_masks: Dict[int, int] = {}
+    for dx, dy in offsets:
+        row_masks[dy] = row_masks.get(dy, 0) | (1 << (dx - min_x))
+        col_masks[dx] = col_masks.get(dx, 0) | (1 << (dy - min_y))
+
+    return (
+        offsets,
+        (min_x, max_x, min_y, max_y),
+        tuple(sorted(row_masks.items())),
+        tuple(sorted(col_masks.items())),
+    )
+
+
+class ShapeMeta(type):
+    """Compile the ``shapes`` matrices of each shape class once at creation"""
+
+    def __init__(cls, name, bases, attrs):
+        super().__init__(name, bases, attrs)
+
+        compiled = [compile_rows(rows) for rows in cls.shapes]  # type: ignore
+
+        cls.n_shapes = len(compiled)
+        cls.offset_table = tuple(c[0] for c in compiled)
+        cls.vector_table = tuple(
+            tuple(Vector(dx, dy) for dx, dy in c[0]) for c in compiled
+        )
+        cls.bound_table = tuple(c[1] for c in compiled)
+        cls.row_mask_table = tuple(c[2] for c in compiled)
+        cls.col_mask_table = tuple(c[3] for c in compiled)
+
+
+@lru_cache(maxsize=None)
+def index_offsets(shape_cls: Type["Shape"], n_cols: int) -> Tuple[Tuple[int, ...], ...]:
+    """Offsets of the packed cell indexes y * n_cols + x, per rotation"""
+    return tuple(
+        tuple(dy * n_cols + dx for dx, dy in offsets)
+        for offsets in shape_cls.offset_table
+    )
+
+
+class Shape(metaclass=ShapeMeta):
     """Shape"""
 
     shapes: list = [
@@ -19,6 +91,14 @@ class Shape:
     n_cols: int = 5
     n_rows: int = 5
 
+    # compiled by ShapeMeta, indexed by rotation
+    n_shapes: int
+    offset_table: Tuple[type_of_offsets, ...]
+    vector_table: Tuple[Tuple[Vector, ...], ...]
+    bound_table: Tuple[type_of_bounds, ...]
+    row_mask_table: Tuple[type_of_masks, ...]
+    col_mask_table: Tuple[type_of_masks, ...]
+
     _rot: int
 
     def __init__(self, rot: int = 0):
@@ -32,17 +112,36 @@ class Shape:
     def rot(self, rot: int):
         self._rot = rot
 
+    @property
+    def index(self) -> int:
+        """Index of the current rotation in the compiled tables"""
+        return self._rot % self.n_shapes
+
     @property
     def rows(self):
-        return self.shapes[self.rot % len(self)] if len(self) else []
+        return self.shapes[self.index] if self.n_shapes else []
+
+    @property
+    def offsets(self) -> type_of_offsets:
+        return self.offset_table[self._rot % self.n_shapes]
+
+    @property
+    def bounds(self) -> type_of_bounds:
+        return self.bound_table[self._rot % self.n_shapes]
+
+    @property
+    def row_masks(self) -> type_of_masks:
+        return self.row_mask_table[self._rot % self.n_shapes]
+
+    @property
+    def col_masks(self) -> type_of_masks:
+        return self.col_mask_table[self._rot % self.n_shapes]
 
     def __iter__(self):
-        for i, j in itertools.product(range(self.n_cols), range(self.n_rows)):
-            if self.rows[j][i] == 1:
-                yield Vector(i - 2, j - 2)
+        return iter(self.vector_table[self._rot % self.n_shapes])
 
     def __len__(self) -> int:
-        return len(self.shapes)
+        return self.n_shapes
 
     @classmethod
     def init(cls, rot: int = 0) -> "Shape":
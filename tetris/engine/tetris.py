@@ -0,0 +1,252 @@
+from typing import Iterable, Optional, Union
+
+from tetris.engine.action import Action
+from tetris.engine.board import Board
+from tetris.engine.randomizer import create_randomizer
+from tetris.engine.rotation import create_rotation_system
+from tetris.engine.speed import create_accelerator, create_speed_generator
+from tetris.engine.texture import ColorContent
+from tetris.engine.typing import (
+    type_of_level,
+    type_of_score,
+    type_of_speed,
+    type_of_count,
+)
+from tetris.helper import Factor, Vector, ZERO_VECTOR
+from tetris.profiling import profiled
+
+_LEFT = Action.LEFT.value
+_RIGHT = Action.RIGHT.value
+_DOWN = Action.DOWN.value
+_ROTATE_CW = Action.ROTATE_CW.value
+_ROTATE_CCW = Action.ROTATE_CCW.value
+_ACCELERATE = Action.ACCELERATE.value
+_HARD_DROP = Action.HARD_DROP.value
+
+_MOVE_VECTORS = {
+    mask: Vector(
+        (-1 if mask & _LEFT else 0) + (1 if mask & _RIGHT else 0),
+        1 if mask & _DOWN else 0,
+    )
+    for mask in range((_LEFT | _RIGHT | _DOWN) + 1)
+}
+
+
+class TetrisEngine:
+    """Tetris rules (gravity, locking, scoring & level-up) without rendering"""
+
+    N_ROWS: int = 20
+    N_COLS: int = 10
+    INIT_LEVEL: int = 1
+    SCORE_UNIT: int = 10
+
+    ACCELERATOR_TYPE: str = "linear"
+    ACCELERATOR_FACTOR: Factor = Factor(a=0.005)
+    SPEED_FACTOR: Factor = Factor(a=1.0, b=0.05)
+    # uniform, bag or tgm
+    RANDOMIZER_TYPE: str = "uniform"
+    # srs or classic
+    ROTATION_TYPE: str = "srs"
+    TEXTURE_CONTENTS = (
+        ColorContent.red,
+        ColorContent.blue,
+        ColorContent.yellow,
+        ColorContent.orange,
+        ColorContent.purple,
+        ColorContent.dark_green,
+    )
+
+    _board: Board
+
+    randomizer_type: str
+    rotation_type: str
+
+    _level: type_of_level
+    _score: type_of_score
+
+    _falling_speed: type_of_speed
+    # milliseconds since the last gravity move
+    _fall_time: float
+
+    _game_over: bool
+
+    _accelerate_count: type_of_count
+
+    def __init__(
+        self,
+        n_rows: Optional[int] = None,
+        n_cols: Optional[int] = None,
+        texture_pools: Optional[Iterable] = None,
+        seed: Optional[int] = None,
+        randomizer_type: Optional[str] = None,
+        rotation_type: Optional[str] = None,
+    ):
+        texture_pools = set(texture_pools or self.TEXTURE_CONTENTS)
+        self.randomizer_type = randomizer_type or self.RANDOMIZER_TYPE
+        self.rotation_type = rotation_type or self.ROTATION_TYPE
+        self._board = Board()
+        self._board.init(
+            n_rows or self.N_ROWS,
+            n_cols or self.N_COLS,
+            texture_pools,
+            create_randomizer(self.randomizer_type, texture_pools, seed),
+            create_rotation_system(self.rotation_type),
+        )
+        self.reset()
+
+    def reset(self):
+        """Reset the rules state"""
+        self.reset_score()
+        self.set_level(self.INIT_LEVEL)
+
+        self.reset_falling_speed()
+        self.reset_fall_time()
+
+        self._game_over = False
+
+    def restart(self, seed: Optional[int] = None):
+        """Reset the rules state & the board for a new game of the seed"""
+        self._board.reset(seed)
+        self.reset()
+
+    def accelerate(self):
+        """Accelerate the falling speed"""
+        self._accelerate_count += 1
+        accelerator = create_accelerator(self.ACCELERATOR_TYPE)
+        self._falling_speed = accelerator(
+            self.get_level_speed(),
+            self._accelerate_count,
+            self.ACCELERATOR_FACTOR,
+        )
+
+    def reset_score(self):
+        """Reset the score"""
+        self._score = 0
+
+    def reset_falling_speed(self):
+        """Reset the falling speed based on current level"""
+        self._accelerate_count = 0
+        self._falling_speed = self.get_level_speed()
+
+    def reset_fall_time(self):
+        """Reset the fall time"""
+        self._fall_time = 0.0
+
+    def calculate_level(self) -> type_of_level:
+        """Calculate level based on score"""
+        return (self._score // 100) + 1
+
+    def set_level(self, level: type_of_level):
+        """Set level"""
+        self._level = level
+
+    def get_level_speed(self) -> type_of_speed:
+        speed_generator = create_speed_generator()
+        return speed_generator(self._level, self.SPEED_FACTOR)
+
+    def should_upgrade_level(self) -> bool:
+        """Check level should upgrade or not"""
+        return self.calculate_level() > self._level
+
+    def upgrade_level(self):
+        """Upgrade level using calculated level"""
+        self.set_level(self.calculate_level())
+
+    def add_score(self, cleared_lines: int):
+        """Add score according to cleared lines"""
+        self._score += cleared_lines * self.SCORE_UNIT
+
+    @profiled("engine.step")
+    def step(self, actions: Union[Action, int], dt: float) -> bool:
+        """Advance one step with the actions bitmask & the elapsed milliseconds
+
+        Return whether the game is over.
+        """
+        if self._game_over:
+            return True
+
+        actions = int(actions)
+        if (
+            not actions
+            and not self._accelerate_count
+            and self._fall_time / 1000 < self._falling_speed
+        ):
+            # idle frame, nothing moves until gravity is due
+            self._fall_time += dt
+            return False
+
+        board = self._board
+
+        if actions & _ROTATE_CCW:
+            board.rotate_piece(clockwise=False)
+        if actions & _ROTATE_CW:
+            board.rotate_piece(clockwise=True)
+
+        if actions & _ACCELERATE:
+            self.accelerate()
+        else:
+            self.reset_falling_speed()
+
+        move_mask = actions & (_LEFT | _RIGHT | _DOWN)
+        if actions & _HARD_DROP:
+            # the piece lands after the sideways moves & is locked below
+            if move_mask & (_LEFT | _RIGHT):
+                __, vector = board.check_move(
+                    _MOVE_VECTORS[move_mask & (_LEFT | _RIGHT)]
+                )
+                board.move_piece(vector)
+            board.hard_drop()
+            self._fall_time = 0
+            move_mask = _DOWN
+        elif self._fall_time / 1000 >= self._falling_speed:
+            self._fall_time = 0
+            move_mask |= _DOWN
+        move_vector = _MOVE_VECTORS[move_mask] if move_mask else ZERO_VECTOR
+
+        overflow, checked_move_vector = board.check_move(move_vector)
+        self._game_over = overflow and board.is_piece_collapsed
+
+        if self._game_over:
+            return True
+
+        if board.is_piece_collapsed:
+            self.add_score(board.clear_lines(board.lock_piece()))
+            board.switch_piece()
+            self._falling_speed = self.get_level_speed()
+        else:
+            board.move_piece(checked_move_vector)
+
+        if self.should_upgrade_level():
+            self.upgrade_level()
+            if not self._accelerate_count:
+                # idle frames keep the falling speed of the level
+                self._falling_speed = self.get_level_speed()
+
+        # increase fall time by the elapsed time
+        self._fall_time += dt
+
+        return False
+
+    @property
+    def board(self) -> Board:
+        return self._board
+
+    @property
+    def score(self) -> type_of_score:
+        return self._score
+
+    @property
+    def level(self) -> type_of_level:
+        return self._level
+
+    @property
+    def falling_speed(self) -> type_of_speed:
+        return self._falling_speed
+
+    @property
+    def seed(self) -> int:
+        return self._board.randomizer.seed
+
+    @property
+    def game_over(self) -> bool:
+        return self._game_over
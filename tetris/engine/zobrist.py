@@ -0,0 +1,46 @@
+"""Zobrist keys of the board state
+
+Every cell & every piece position gets a random 64-bit key and the hash of a
+state is the xor of the keys of what it holds, so a write only xors the key
+of the cell it changes. Keys are drawn from fixed seeds, a state has the same
+hash in every process.
+"""
+
+import random
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+SEED = 0x2F6A7E
+
+type_of_cell_keys = Tuple[Tuple[int, ...], ...]
+
+
+@lru_cache(maxsize=None)
+def cell_keys(n_rows: int, n_cols: int) -> type_of_cell_keys:
+    """Key of each filled cell, indexed by row then column"""
+    rng = random.Random(SEED)
+    return tuple(
+        tuple(rng.getrandbits(64) for __ in range(n_cols)) for __ in range(n_rows)
+    )
+
+
+def row_hash(keys: Sequence[int], mask: int) -> int:
+    """Xor of the keys of the columns set in the row mask"""
+    h = 0
+    while mask:
+        low = mask & -mask
+        h ^= keys[low.bit_length() - 1]
+        mask ^= low
+    return h
+
+
+@lru_cache(maxsize=None)
+def piece_key(shape: str, index: int, x: int, y: int) -> int:
+    """Key of the current piece, by shape name, rotation index & position"""
+    return random.Random(f"{SEED}:piece:{shape}:{index}:{x}:{y}").getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def next_piece_key(shape: str, index: int) -> int:
+    """Key of the next piece, by shape name & rotation index"""
+    return random.Random(f"{SEED}:next:{shape}:{index}").getrandbits(64)
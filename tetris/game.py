@@ -0,0 +1,140 @@
+from typing import Optional, Type, Callable
+
+import pygame as pg
+
+from . import profiling
+from .render import font
+from .render.hud import ProfilerHUD
+from .scene import StartMenu, Scene
+from .scene.base import SceneParameter
+from .scheduler import FrameScheduler
+
+
+def scene_check(func) -> Callable:
+    def wrapper(game: "Game", *args, **kwargs):
+        if game.scene is None:
+            raise ValueError("Scene is empty !!")
+        return func(game, *args, **kwargs)
+
+    return wrapper
+
+
+class Game:
+    """Main game process"""
+
+    WIN_SIZE = (1000, 800)
+    # frames per second at most, 0 to leave the pacing to the vsync of the
+    # display, capped at FrameScheduler.FPS when it has none
+    FPS: int = FrameScheduler.FPS
+    # duration of a simulation tick in ms, its dts are rounded to whole ms
+    TICK_MS: float = FrameScheduler.TICK_MS
+    # False to draw & update every frame in full
+    DIRTY_RECTS: bool = True
+    INIT_SCENE_CLS: Type[Scene] = StartMenu
+
+    # the display, created on the first run
+    _surface: Optional[pg.surface.Surface] = None
+
+    _scene: Optional[Scene]
+
+    def set_surface(self, surface: pg.surface.Surface) -> None:
+        self._surface = surface
+
+    def init(self) -> None:
+        # start to load
+        self._scene = self.INIT_SCENE_CLS(self._surface)
+
+    @scene_check
+    def scene_run(self, scene_parameter: SceneParameter) -> int:
+        return self._scene.run(scene_parameter)  # type: ignore
+
+    @scene_check
+    def switch_scene(self, value: int) -> None:
+        scene_cls_map = {
+            1: self._scene.next,  # type: ignore
+            -1: self._scene.previous,  # type: ignore
+        }
+
+        scene_cls = scene_cls_map.get(value)
+        if scene_cls:
+            self._scene.close()  # type: ignore
+            self._scene = scene_cls(self._surface)
+
+    def create_display(self) -> int:
+        """Open the window, get the frame cap of its scheduler"""
+        if self.FPS > 0:
+            self.set_surface(pg.display.set_mode(self.WIN_SIZE))
+            return self.FPS
+
+        try:
+            # vsync is only taken along the SCALED or OPENGL flags
+            self.set_surface(pg.display.set_mode(self.WIN_SIZE, pg.SCALED, vsync=1))
+            return 0
+        except pg.error:
+            self.set_surface(pg.display.set_mode(self.WIN_SIZE))
+            return FrameScheduler.FPS
+
+    @property
+    def scene(self) -> Optional[Scene]:
+        return self._scene
+
+    def run(self) -> None:
+        pg.init()
+        if self._surface is None:
+            fps = self.create_display()
+        else:
+            # a surface given has no vsync known of
+            fps = self.FPS or FrameScheduler.FPS
+        clock = pg.time.Clock()
+
+        self.init()
+        scheduler = FrameScheduler(fps, self.TICK_MS)
+        hud = None
+        if profiling.profiler is not None:
+            hud = ProfilerHUD(self._surface, profiling.profiler)
+
+        done = 0
+
+        while not done:
+            if not self.DIRTY_RECTS:
+                self._scene.redraw()  # type: ignore
+            with profiling.span("event.get"):
+                events = pg.event.get()
+            for e in events:
+                if e.type == pg.QUIT or (e.type == pg.KEYUP and e.key == pg.K_ESCAPE):
+                    done = 1
+                    break
+
+            with profiling.span("scene.run"):
+                value = self.scene_run(
+                    SceneParameter(
+                        events=events,
+                        clock=clock,
+                        pressed=pg.key.get_pressed(),
+                        dts=scheduler.advance(),
+                        lag_ms=scheduler.lag_ms,
+                    )
+                )
+
+            # only the rects the scene has drawn are sent to the display
+            rects = self._scene.pop_dirty_rects()  # type: ignore
+            if hud and rects is not None:
+                rects.append(hud.render())
+            elif hud:
+                hud.render()
+            with profiling.span("display.update"):
+                if rects is None:
+                    pg.display.flip()
+                elif rects:
+                    pg.display.update(rects)
+            with profiling.span("wait"):
+                scheduler.wait()
+            profiling.frame()
+
+            self.switch_scene(value)
+
+        self._scene.close()  # type: ignore
+        if profiling.profiler is not None and profiling.TRACE_PATH:
+            profiling.profiler.export(profiling.TRACE_PATH)
+        font.clear()
+        pg.quit()
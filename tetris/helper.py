@@ -42,6 +42,9 @@ class Vector(NamedTuple):
         return Vector(*self)
 
 
+ZERO_VECTOR = Vector(0, 0)
+
+
 class RGB(NamedTuple):
     r: int
     g: int
@@ -0,0 +1,118 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+import pygame as pg
+
+from .engine.action import Action
+
+
+def perf_ms() -> float:
+    return time.perf_counter() * 1000
+
+
+class InputHandler:
+    """Key bindings compiled to the actions of the simulation ticks
+
+    A bound key acts on its KEYDOWN. The last pressed key of a repeated
+    action, left or right, repeats after the delayed auto shift and then at
+    the auto repeat rate, on a schedule of absolute times so a tick gets
+    the repeats due at its own time, not at the time of its frame. When it
+    is released, the key pressed before it repeats again if still held,
+    after a new delayed auto shift. An auto repeat rate of 0 repeats on
+    every tick. Held actions are on from the KEYDOWN to the KEYUP of their
+    keys.
+
+    The delays from the events read to the ticks consuming their actions
+    are kept in ``latencies``. Bound keys act on their KEYUP instead when
+    ``press_event`` is ``pg.KEYUP``, without repeats, as a baseline of the
+    latency.
+    """
+
+    DAS_MS: float = 167
+    ARR_MS: float = 33
+    REPEATED_ACTIONS: Action = Action.LEFT | Action.RIGHT
+    N_LATENCIES: int = 256
+
+    def __init__(
+        self,
+        key_actions: Dict[int, Action],
+        held_actions: Optional[Dict[int, Action]] = None,
+        das_ms: float = DAS_MS,
+        arr_ms: float = ARR_MS,
+        clock: Callable[[], float] = perf_ms,
+        press_event: int = pg.KEYDOWN,
+    ):
+        self._key_actions = dict(key_actions)
+        self._held_actions = dict(held_actions or {})
+        self._repeated_keys = frozenset(
+            key
+            for key, action in self._key_actions.items()
+            if action & self.REPEATED_ACTIONS
+        )
+        self.das_ms = das_ms
+        # at least a tick between repeats, they are not stacked in a tick
+        self.arr_ms = max(arr_ms, 1)
+        self.clock = clock
+        self.press_event = press_event
+        self.latencies: Deque[float] = deque(maxlen=self.N_LATENCIES)
+        self.reset()
+
+    def reset(self) -> None:
+        self._pending = Action.NONE
+        # times the pending actions were read at
+        self._stamps: List[float] = []
+        self._held: Dict[int, Action] = {}
+        # held keys of repeated actions, the last pressed one repeats
+        self._repeat_keys: List[int] = []
+        self._repeat_key: Optional[int] = None
+        self._repeat_at = 0.0
+
+    def feed(self, events: Iterable[pg.event.Event], now: float) -> None:
+        """Take the key events read at now, in ms of the clock"""
+        for e in events:
+            if e.type == self.press_event:
+                action = self._key_actions.get(e.key)
+                if action is not None:
+                    self._pending |= action
+                    self._stamps.append(now)
+                    if e.type == pg.KEYDOWN and e.key in self._repeated_keys:
+                        if e.key in self._repeat_keys:
+                            self._repeat_keys.remove(e.key)
+                        self._repeat_keys.append(e.key)
+                        self._repeat_key = e.key
+                        self._repeat_at = now + self.das_ms
+
+            if e.type == pg.KEYDOWN:
+                held = self._held_actions.get(e.key)
+                if held is not None:
+                    self._held[e.key] = held
+            elif e.type == pg.KEYUP:
+                if e.key in self._repeat_keys:
+                    self._repeat_keys.remove(e.key)
+                if e.key == self._repeat_key:
+                    # back to the other direction when it is still held
+                    if self._repeat_keys:
+                        self._repeat_key = self._repeat_keys[-1]
+                        self._repeat_at = now + self.das_ms
+                    else:
+                        self._repeat_key = None
+                self._held.pop(e.key, None)
+
+    def poll(self, now: float) -> Action:
+        """Get the actions of the tick at now"""
+        actions = self._pending
+        if actions:
+            self._pending = Action.NONE
+            consumed = self.clock()
+            self.latencies.extend(consumed - stamp for stamp in self._stamps)
+            self._stamps.clear()
+
+        if self._repeat_key is not None and now >= self._repeat_at:
+            actions |= self._key_actions[self._repeat_key]
+            while self._repeat_at <= now:
+                self._repeat_at += self.arr_ms
+
+        for action in self._held.values():
+            actions |= action
+        return actions
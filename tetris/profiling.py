@@ -0,0 +1,178 @@
+"""Opt-in profiling spans of the frames
+
+Enabled by the ``TETRIS_PROFILE`` environment variable at import, the
+spans are kept in a ring buffer of fixed size, shown on a HUD & exported
+as a Chrome trace (chrome://tracing, Perfetto) to the ``TETRIS_TRACE``
+path if given.
+
+When disabled, ``span`` gets a shared null context and ``profiled`` gives
+the decorated function back untouched, the probes cost nothing.
+"""
+
+import functools
+import json
+import os
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ENABLED: bool = os.environ.get("TETRIS_PROFILE", "") not in ("", "0")
+TRACE_PATH: Optional[str] = os.environ.get("TETRIS_TRACE") or None
+
+_NULL_SPAN = nullcontext()
+
+
+class Profiler:
+    """Ring buffers of the latest spans & frame times, in ns"""
+
+    CAPACITY: int = 1 << 16
+    N_FRAMES: int = 1024
+
+    def __init__(
+        self,
+        capacity: int = CAPACITY,
+        n_frames: int = N_FRAMES,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ):
+        self.capacity = capacity
+        self.clock = clock
+        self._names: List[str] = [""] * capacity
+        self._starts = [0] * capacity
+        self._ends = [0] * capacity
+        self._count = 0
+
+        self.n_frames = n_frames
+        self._frames = [0] * n_frames
+        self._n_frames = 0
+        self._frame_start: Optional[int] = None
+
+    def record(self, name: str, start: int, end: int) -> None:
+        i = self._count % self.capacity
+        self._names[i] = name
+        self._starts[i] = start
+        self._ends[i] = end
+        self._count += 1
+
+    def span(self, name: str) -> "Span":
+        return Span(self, name)
+
+    def frame(self) -> None:
+        """Mark the end of a frame & the start of the next one"""
+        now = self.clock()
+        if self._frame_start is not None:
+            self._frames[self._n_frames % self.n_frames] = now - self._frame_start
+            self._n_frames += 1
+            self.record("frame", self._frame_start, now)
+        self._frame_start = now
+
+    @property
+    def count(self) -> int:
+        """Spans recorded so far, kept or not"""
+        return self._count
+
+    def spans(self, since: int = 0) -> List[Tuple[str, int, int]]:
+        """Get the spans kept from the count given on, oldest first"""
+        first = max(since, self._count - self.capacity)
+        return [
+            (
+                self._names[i % self.capacity],
+                self._starts[i % self.capacity],
+                self._ends[i % self.capacity],
+            )
+            for i in range(first, self._count)
+        ]
+
+    def frame_times(self) -> List[int]:
+        n = min(self._n_frames, self.n_frames)
+        first = self._n_frames - n
+        return [self._frames[i % self.n_frames] for i in range(first, self._n_frames)]
+
+    def percentiles(self, ps: Tuple[float, ...] = (50, 95, 99)) -> Dict[float, float]:
+        """Get the percentiles of the frame times kept, in ms"""
+        times = sorted(self.frame_times())
+        if not times:
+            return {p: 0.0 for p in ps}
+        last = len(times) - 1
+        return {p: times[min(int(last * p / 100 + 0.5), last)] / 1e6 for p in ps}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Get the spans as complete events of the trace event format"""
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": 1,
+                    "tid": 1,
+                }
+                for name, start, end in self.spans()
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def clear(self) -> None:
+        self._count = 0
+        self._n_frames = 0
+        self._frame_start = None
+
+
+class Span:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: Profiler, name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> "Span":
+        self._start = self._profiler.clock()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        profiler = self._profiler
+        profiler.record(self._name, self._start, profiler.clock())
+
+
+profiler: Optional[Profiler] = Profiler() if ENABLED else None
+
+
+def span(name: str):
+    """Get a context timing its block as the span of the name"""
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name)
+
+
+def frame() -> None:
+    if profiler is not None:
+        profiler.frame()
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Time the calls of the function as spans of the name, when enabled"""
+
+    def decorator(func: F) -> F:
+        if profiler is None:
+            return func
+
+        record = profiler.record
+        clock = profiler.clock
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, clock())
+
+        return wrapper  # type: ignore
+
+    return decorator
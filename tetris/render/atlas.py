@@ -0,0 +1,118 @@
+from typing import Dict, Hashable, Mapping, Optional, Tuple
+
+import pygame as pg
+
+type_of_color = Tuple[int, int, int]
+
+
+def shade(color: type_of_color, factor: float) -> type_of_color:
+    """Lighten the color toward white over 1, darken it under 1"""
+    if factor > 1:
+        return tuple(int(c + (255 - c) * (factor - 1)) for c in color)  # type: ignore
+    return tuple(int(c * factor) for c in color)  # type: ignore
+
+
+class TileAtlas:
+    """Tiles of the textures pre-rendered side by side on one surface
+
+    Each texture content gets a solid tile & a ghost outline tile, in the
+    pixel format of the target surface, so drawing a cell is a blit of an
+    area of the atlas and a whole board is one ``Surface.blits`` call.
+    """
+
+    LIGHT_FACTOR: float = 1.4
+    DARK_FACTOR: float = 0.6
+    GHOST_BORDER_SIZE: int = 2
+    # transparent pixels of the ghost tiles
+    COLOR_KEY: type_of_color = (255, 0, 255)
+
+    def __init__(
+        self,
+        tiles: Mapping[Hashable, pg.surface.Surface],
+        size: int,
+        target: pg.surface.Surface,
+        colors: Optional[Mapping[Hashable, type_of_color]] = None,
+    ):
+        self.size = size
+        self._areas: Dict[Hashable, pg.Rect] = {}
+
+        width = max(len(tiles), 1) * size
+        self.solid = pg.Surface((width, size), 0, target)
+        self.ghost = pg.Surface((width, size), 0, target)
+        self.ghost.fill(self.COLOR_KEY)
+        self.ghost.set_colorkey(self.COLOR_KEY)
+
+        for i, (content, tile) in enumerate(tiles.items()):
+            area = self._areas[content] = pg.Rect(i * size, 0, size, size)
+            self.solid.blit(pg.transform.scale(tile, (size, size)), area)
+            if colors:
+                color = colors[content]
+            else:
+                color = pg.transform.average_color(tile)[:3]
+            pg.draw.rect(
+                self.ghost,
+                color,
+                area,
+                self.GHOST_BORDER_SIZE,
+            )
+
+    @classmethod
+    def from_colors(
+        cls,
+        mapping: Mapping[Hashable, type_of_color],
+        size: int,
+        target: pg.surface.Surface,
+    ) -> "TileAtlas":
+        """Build the atlas of beveled tiles of the colors"""
+        return cls(
+            {
+                content: cls.bevel_tile(color, size)
+                for content, color in mapping.items()
+            },
+            size,
+            target,
+            mapping,
+        )
+
+    @classmethod
+    def from_images(
+        cls,
+        images: Mapping[Hashable, pg.surface.Surface],
+        size: int,
+        target: pg.surface.Surface,
+    ) -> "TileAtlas":
+        """Build the atlas of the images, scaled to the tile size
+
+        The ghost outlines are in the average color of the images.
+        """
+        return cls(images, size, target)
+
+    @classmethod
+    def bevel_tile(cls, color: type_of_color, size: int) -> pg.surface.Surface:
+        tile = pg.Surface((size, size))
+        tile.fill(color)
+
+        edge = max(size // 8, 1)
+        light = shade(color, cls.LIGHT_FACTOR)
+        dark = shade(color, cls.DARK_FACTOR)
+        last = size - edge
+        # top & left edges lit, bottom & right in shadow
+        pg.draw.polygon(tile, light, [(0, 0), (size, 0), (last, edge), (edge, edge)])
+        pg.draw.polygon(tile, light, [(0, 0), (edge, edge), (edge, last), (0, size)])
+        pg.draw.polygon(
+            tile, dark, [(0, size), (edge, last), (last, last), (size, size)]
+        )
+        pg.draw.polygon(
+            tile, dark, [(size, 0), (size, size), (last, last), (last, edge)]
+        )
+        return tile
+
+    def area(self, content: Hashable) -> pg.Rect:
+        """Area of the tile of the content, on the solid or ghost surface"""
+        return self._areas[content]
+
+    def __contains__(self, content: Hashable) -> bool:
+        return content in self._areas
+
+    def __len__(self) -> int:
+        return len(self._areas)
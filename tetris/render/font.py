@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame as pg
+
+type_of_color = Tuple[int, int, int]
+type_of_text_key = Tuple[pg.font.Font, str, type_of_color, bool]
+
+
+class FontRegistry:
+    """Fonts shared by the renders & scenes, loaded once per (style, size)"""
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[str, int], pg.font.Font] = {}
+
+    def get(self, style: str, size: int) -> pg.font.Font:
+        key = (style, size)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pg.font.get_init():
+                pg.font.init()
+            font = self._fonts[key] = pg.font.SysFont(style, size)
+        return font
+
+    def clear(self) -> None:
+        """Drop the fonts, needed when pygame is quit"""
+        self._fonts.clear()
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+
+class TextCache:
+    """Rendered text surfaces, the least recently used dropped over the cap
+
+    The cap is on the pixel bytes of the surfaces, a long text costs more
+    than a digit.
+    """
+
+    MAX_BYTES: int = 4 * 1024 * 1024
+
+    def __init__(self, fonts: FontRegistry, max_bytes: int = MAX_BYTES):
+        self._fonts = fonts
+        self._max_bytes = max_bytes
+        self._texts: "OrderedDict[type_of_text_key, pg.surface.Surface]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def size_of(surface: pg.surface.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def render(
+        self,
+        style: str,
+        size: int,
+        text: str,
+        color: type_of_color,
+        antialias: bool = True,
+    ) -> pg.surface.Surface:
+        """Get the text rendered with the font, the surface is shared"""
+        font = self._fonts.get(style, size)
+        key = (font, text, tuple(color), antialias)
+        surface = self._texts.get(key)  # type: ignore
+        if surface is not None:
+            self.hits += 1
+            self._texts.move_to_end(key)  # type: ignore
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._texts[key] = surface  # type: ignore
+        self._bytes += self.size_of(surface)
+        while self._bytes > self._max_bytes and len(self._texts) > 1:
+            __, dropped = self._texts.popitem(last=False)
+            self._bytes -= self.size_of(dropped)
+        return surface
+
+    def clear(self) -> None:
+        self._texts.clear()
+        self._bytes = 0
+
+    @property
+    def n_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+
+fonts = FontRegistry()
+texts = TextCache(fonts)
+
+
+def clear() -> None:
+    """Drop the cached fonts & texts"""
+    texts.clear()
+    fonts.clear()
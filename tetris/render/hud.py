@@ -0,0 +1,76 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pygame as pg
+
+from .font import fonts
+from ..profiling import Profiler
+
+
+class ProfilerHUD:
+    """Overlay of the frame time percentiles & the heaviest spans
+
+    The text is rendered again every ``UPDATE_FRAMES`` frames from the
+    spans recorded since, and blitted on every frame since the scene may
+    draw over it.
+    """
+
+    FONT_STYLE = "monospace"
+    FONT_SIZE = 14
+    FONT_COLOR = (255, 255, 0)
+    BACKGROUND_COLOR = (0, 0, 0)
+    POS = (4, 4)
+    UPDATE_FRAMES: int = 30
+    N_SPANS: int = 6
+
+    def __init__(self, surface: pg.surface.Surface, profiler: Profiler):
+        self._surface = surface
+        self._profiler = profiler
+        self._n_frames = 0
+        # spans counted up to the last update
+        self._count = 0
+        self._text: Optional[pg.surface.Surface] = None
+        # the overlay never shrinks, nothing of a larger one is left behind
+        self._size = (0, 0)
+
+    def lines(self) -> List[str]:
+        profiler = self._profiler
+        ps = profiler.percentiles()
+        lines = [
+            "frame p50 {:.2f} p95 {:.2f} p99 {:.2f} ms".format(ps[50], ps[95], ps[99])
+        ]
+
+        spans = profiler.spans(self._count)
+        self._count = profiler.count
+        totals: Dict[str, int] = defaultdict(int)
+        n_frames = 0
+        for name, start, end in spans:
+            if name == "frame":
+                n_frames += 1
+            else:
+                totals[name] += end - start
+        heaviest = sorted(totals.items(), key=lambda item: -item[1])
+        for name, total in heaviest[: self.N_SPANS]:
+            lines.append(f"{name:<18} {total / max(n_frames, 1) / 1e6:6.2f} ms")
+        return lines
+
+    def update(self) -> None:
+        font = fonts.get(self.FONT_STYLE, self.FONT_SIZE)
+        rendered = [font.render(line, True, self.FONT_COLOR) for line in self.lines()]
+        height = font.get_linesize()
+        self._size = (
+            max([self._size[0]] + [line.get_width() for line in rendered]),
+            max(self._size[1], height * len(rendered)),
+        )
+        text = pg.Surface(self._size)
+        text.fill(self.BACKGROUND_COLOR)
+        for i, line in enumerate(rendered):
+            text.blit(line, (0, i * height))
+        self._text = text
+
+    def render(self) -> pg.Rect:
+        """Draw the overlay, get its rect"""
+        if self._text is None or self._n_frames % self.UPDATE_FRAMES == 0:
+            self.update()
+        self._n_frames += 1
+        return self._surface.blit(self._text, self.POS)  # type: ignore
@@ -1,15 +1,19 @@
-import itertools
+from typing import List, Optional, Set, Tuple
 
 import pygame as pg
 
+from .atlas import TileAtlas
 from .base import RenderParameter, Render
+from .font import texts
 from ..engine.board import Board
-from ..engine.texture import ColorTexture
+from ..engine.piece import Piece
+from ..engine.texture import ColorTexture, Texture
 from ..engine.typing import (
     type_of_level,
     type_of_score,
 )
 from ..helper import Vector, Position
+from ..profiling import profiled
 
 
 class TetrisRenderParameter(RenderParameter):
@@ -19,6 +23,19 @@ class TetrisRenderParameter(RenderParameter):
 
 
 class TetrisRender(Render):
+    """Tetris board render
+
+    The background, title, borders, grid lines & labels are drawn once to
+    an off-screen static layer, and the textures to a tile atlas, both
+    rebuilt when the surface is resized or the theme changes. A full frame
+    blits the layer & the tiles of the cells over it in one ``blits`` call.
+
+    After the first frame, only the cells whose content has changed, the old
+    & new footprints of the piece & its ghost, the next box when the next
+    piece changes & the score when it changes are redrawn, and their rects
+    are returned for ``pg.display.update``.
+    """
+
     BLOCK_SIZE: int = 30
 
     BACKGROUND_COLOR = (0, 0, 0)
@@ -26,6 +43,8 @@ class TetrisRender(Render):
     BOARD_BORDER_COLOR = (255, 255, 255)
     BOARD_BACKGROUND_COLOR = (10, 10, 20)
     BOARD_BORDER_SIZE = 5
+    # outline of the landing position of the piece
+    GHOST_BORDER_SIZE = 2
 
     TITLE_TEXT = "Tetris"
     TITLE_FONT_STYLE = "comicsansms"
@@ -48,118 +67,338 @@ class TetrisRender(Render):
         self._surface = surface
         self._board = board
         self._board_start_pos = board_start_pos
+        self._static: Optional[pg.surface.Surface] = None
+        self._static_key: Optional[tuple] = None
+        self._atlas: Optional[TileAtlas] = None
+        # top left of the tile of each cell, inside its grid lines
+        self._dests: List[Tuple[int, int]] = []
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Draw the next frame in full"""
+        self._drawn = False
+        # grid & textures of each cell on the surface
+        self._grid = None
+        # writes of the grid drawn, textures alone may have changed
+        self._grid_writes = -1
+        self._cells: List[Optional[Texture]] = []
+        # key, cells & ghost cells of the piece on the surface
+        self._piece_key: Optional[tuple] = None
+        self._piece_cells: Set[int] = set()
+        self._ghost_cells: Set[int] = set()
+        self._next_piece: Optional[Piece] = None
+        self._score: Optional[type_of_score] = None
+        self._score_rect: Optional[pg.Rect] = None
+
+    @property
+    def theme(self) -> tuple:
+        """Everything drawn to the static layer but the board"""
+        return (
+            self.BLOCK_SIZE,
+            self.BACKGROUND_COLOR,
+            self.GRID_BORDER_COLOR,
+            self.BOARD_BORDER_COLOR,
+            self.BOARD_BACKGROUND_COLOR,
+            self.BOARD_BORDER_SIZE,
+            self.TITLE_TEXT,
+            self.TITLE_FONT_STYLE,
+            self.TITLE_FONT_SIZE,
+            self.TITLE_COLOR,
+            self.SCORE_TEXT,
+            self.SCORE_FONT_STYLE,
+            self.SCORE_FONT_SIZE,
+            self.SCORE_FONT_COLOR,
+            self.NEXT_TEXT,
+            self.NEXT_FONT_STYLE,
+            self.NEXT_FONT_SIZE,
+            self.NEXT_FONT_COLOR,
+            # a new mapping of the textures is loaded
+            id(ColorTexture.mapping),
+        )
+
+    def static_key(self) -> tuple:
+        return (
+            self._surface.get_size(),
+            tuple(self._board_start_pos),
+            self._board.n_rows,
+            self._board.n_cols,
+            self.theme,
+        )
+
+    def static_layer(self) -> pg.surface.Surface:
+        """Get the static layer, rebuilt when its key has changed"""
+        key = self.static_key()
+        if self._static is None or key != self._static_key:
+            # same pixel format as the surface, blitted without conversion
+            layer = pg.Surface(self._surface.get_size(), 0, self._surface)
+            self.render_background(layer)
+            self.render_title(layer)
+            self.render_outer_border(layer)
+            self.render_grid_line(layer, self._board.n_cols, self._board.n_rows)
+            self.render_next_text(layer)
+            self.render_score_text(layer)
+            self._static = layer
+            self._static_key = key
+
+            self._atlas = self.create_atlas()
+            start_x = int(self._board_start_pos.x) + 1
+            start_y = int(self._board_start_pos.y) + 1
+            self._dests = [
+                (start_x + x * self.BLOCK_SIZE, start_y + y * self.BLOCK_SIZE)
+                for y in range(self._board.n_rows)
+                for x in range(self._board.n_cols)
+            ]
+        return self._static
+
+    def create_atlas(self) -> TileAtlas:
+        """Tiles of the textures, overridden for image themes"""
+        return TileAtlas.from_colors(
+            ColorTexture.mapping,  # type: ignore
+            self.BLOCK_SIZE - 1,
+            self._surface,
+        )
+
+    @profiled("render")
+    def render(  # type: ignore
+        self, render_parameter: TetrisRenderParameter
+    ) -> Optional[List[pg.Rect]]:
+        """Draw the frame, get the rects drawn or None when drawn in full"""
+        if not self._drawn or self._static_key != self.static_key():
+            self.render_full(render_parameter)
+            return None
+
+        dirty = self.update_grid()
+        dirty |= self.update_piece()
+        rects = self.render_cells(sorted(dirty))
+        if self._board.next_piece is not self._next_piece:
+            rects.append(self.render_next_shape())
+        if render_parameter.score != self._score:
+            rects.append(self.render_score(render_parameter.score))
+        return rects
+
+    def render_full(self, render_parameter: TetrisRenderParameter) -> None:
+        self.invalidate()
+        self.update_grid()
+        self.update_piece()
+
+        self._surface.blit(self.static_layer(), (0, 0))
+        self.render_board()
+        self.render_next_shape()
+        self.render_score(render_parameter.score)
+        self._drawn = True
+
+    def restore_static(self, rect: pg.Rect) -> None:
+        """Draw the static layer over the rect of the surface"""
+        self._surface.blit(self.static_layer(), rect, rect)
+
+    def update_grid(self) -> Set[int]:
+        """Take the grid cells, get the indexes of those changed"""
+        grid = self._board.grid
+        if grid is self._grid and grid.writes == self._grid_writes:
+            return set()
+
+        changed = set()
+        if grid is not self._grid:
+            # a new grid of a reset board, every cell is redrawn
+            size = self._board.n_rows * self._board.n_cols
+            self._cells = [None] * size
+            changed.update(range(size))
+        self._grid = grid
+        self._grid_writes = grid.writes
+
+        cells = self._cells
+        for index, drawn in enumerate(cells):
+            texture = grid.get_index(index)
+            if texture is not drawn:
+                cells[index] = texture
+                changed.add(index)
+        return changed
+
+    def update_piece(self) -> Set[int]:
+        """Take the piece & ghost cells, get the old & new ones if moved"""
+        piece = self._board.piece
+        if not piece:
+            key = None
+        else:
+            key = (piece, piece.x, piece.y, piece.rot, self._board.ghost_y())
+        if key == self._piece_key:
+            return set()
+
+        changed = self._piece_cells | self._ghost_cells
+        self._piece_key = key
+        self._piece_cells = set()
+        self._ghost_cells = set()
+        if piece:
+            n_cols = self._board.n_cols
+            size = self._board.n_rows * n_cols
+            drop = (key[4] - int(piece.y)) * n_cols  # type: ignore
+            for index in piece.cells(n_cols):
+                if 0 <= index < size:
+                    self._piece_cells.add(index)
+                if 0 <= index + drop < size:
+                    self._ghost_cells.add(index + drop)
+        return changed | self._piece_cells | self._ghost_cells
+
+    def cell_rect(self, index: int) -> pg.Rect:
+        """Rect of the cell, with its right & bottom grid lines"""
+        y, x = divmod(index, self._board.n_cols)
+        return pg.Rect(
+            int(self._board_start_pos.x) + x * self.BLOCK_SIZE,
+            int(self._board_start_pos.y) + y * self.BLOCK_SIZE,
+            self.BLOCK_SIZE + 1,
+            self.BLOCK_SIZE + 1,
+        )
 
-    def render(self, render_parameter: TetrisRenderParameter) -> None:  # type: ignore
-        self.render_background()
-        self.render_title()
-        self.render_outer_border()
-        self.render_piece()
-        self.render_grid_line(self._board.n_cols, self._board.n_rows)
-        self.render_grid()
-        self.render_next_piece()
-        self.render_score_box(render_parameter.score)
-
-    def render_background(self) -> None:
-        self._surface.fill(self.BACKGROUND_COLOR)
-
-    def render_title(self) -> None:
-        font = pg.font.SysFont(self.TITLE_FONT_STYLE, self.TITLE_FONT_SIZE)
-        text = font.render(
+    def tile_blit(self, index: int) -> Optional[tuple]:
+        """Blit of the tile drawn at the cell, None when empty"""
+        atlas = self._atlas
+        texture = self._cells[index]
+        if texture:
+            return atlas.solid, self._dests[index], atlas.area(texture.content)
+        if index in self._piece_cells:
+            content = self._board.piece.texture.content
+            return atlas.solid, self._dests[index], atlas.area(content)
+        if index in self._ghost_cells:
+            content = self._board.piece.texture.content
+            return atlas.ghost, self._dests[index], atlas.area(content)
+        return None
+
+    def render_board(self) -> None:
+        """Draw the tiles of the cells, the piece & the ghost"""
+        blits = []
+        for index in range(len(self._dests)):
+            tile = self.tile_blit(index)
+            if tile:
+                blits.append(tile)
+        self._surface.blits(blits, doreturn=False)
+
+    def render_cells(self, indexes: List[int]) -> List[pg.Rect]:
+        """Redraw the cells over the static layer, get their rects"""
+        static = self.static_layer()
+        rects = []
+        blits = []
+        for index in indexes:
+            rect = self.cell_rect(index)
+            rects.append(rect)
+            blits.append((static, rect, rect))
+            tile = self.tile_blit(index)
+            if tile:
+                blits.append(tile)
+        self._surface.blits(blits, doreturn=False)
+        return rects
+
+    def render_background(self, surface: pg.surface.Surface) -> None:
+        surface.fill(self.BACKGROUND_COLOR)
+
+    def render_title(self, surface: pg.surface.Surface) -> None:
+        text = texts.render(
+            self.TITLE_FONT_STYLE,
+            self.TITLE_FONT_SIZE,
             self.TITLE_TEXT,
-            True,
             self.TITLE_COLOR,
         )
-        self._surface.blit(text, self._board_start_pos + Vector(0, -120))
-
-    def render_piece(self) -> None:
-        if self._board.piece:
-            for vec in self._board.piece:
-                surface_pos = self._board_start_pos + Vector(*vec) * self.BLOCK_SIZE
-
-                if not (
-                    surface_pos.x >= self._board_start_pos.x
-                    and surface_pos.y >= self._board_start_pos.y
-                ):
-                    continue
-
-                pg.draw.rect(
-                    self._surface,
-                    ColorTexture.transform(self._board.piece.texture.content),
-                    rect=(
-                        int(surface_pos.x),
-                        int(surface_pos.y),
-                        self.BLOCK_SIZE,
-                        self.BLOCK_SIZE,
-                    ),
-                )
-
-    def render_grid_line(self, n_cols: int, n_rows: int) -> None:
-        for i, j in itertools.product(range(n_cols + 1), range(n_rows + 1)):
+        surface.blit(text, self._board_start_pos + Vector(0, -120))
+
+    def render_grid_line(
+        self, surface: pg.surface.Surface, n_cols: int, n_rows: int
+    ) -> None:
+        for j in range(n_rows + 1):
             # horizon line
             pg.draw.line(
-                self._surface,
+                surface,
                 self.GRID_BORDER_COLOR,
                 self._board_start_pos + Vector(0, j) * self.BLOCK_SIZE,
                 self._board_start_pos + Vector(n_cols, j) * self.BLOCK_SIZE,
             )
 
+        for i in range(n_cols + 1):
             # vertical line
             pg.draw.line(
-                self._surface,
+                surface,
                 self.GRID_BORDER_COLOR,
                 self._board_start_pos + Vector(i, 0) * self.BLOCK_SIZE,
                 self._board_start_pos + Vector(i, n_rows) * self.BLOCK_SIZE,
             )
 
-    def render_next_piece(self) -> None:
+    @property
+    def next_box_pos(self) -> Position:
         vector = Vector(self._board.n_cols + 2, 2)
-        box_start_pos = self._board_start_pos + vector * self.BLOCK_SIZE
-
-        def _render_next_text() -> None:
-            font = pg.font.SysFont(self.NEXT_FONT_STYLE, self.NEXT_FONT_SIZE)
-
-            text = font.render(
-                self.NEXT_TEXT,
-                True,
-                self.NEXT_FONT_COLOR,
+        return self._board_start_pos + vector * self.BLOCK_SIZE
+
+    def render_next_text(self, surface: pg.surface.Surface) -> None:
+        text = texts.render(
+            self.NEXT_FONT_STYLE,
+            self.NEXT_FONT_SIZE,
+            self.NEXT_TEXT,
+            self.NEXT_FONT_COLOR,
+        )
+        surface.blit(text, self.next_box_pos + Vector(0, -3) * self.BLOCK_SIZE)
+
+    def render_next_shape(self) -> pg.Rect:
+        """Draw the next piece in its box, get the rect of the box"""
+        box_start_pos = self.next_box_pos
+        rect = pg.Rect(
+            int(box_start_pos.x),
+            int(box_start_pos.y),
+            self.BLOCK_SIZE * 5,
+            self.BLOCK_SIZE * 5,
+        )
+        self.restore_static(rect)
+
+        next_piece = self._next_piece = self._board.next_piece
+        if next_piece:
+            area = self._atlas.area(next_piece.texture.content)  # type: ignore
+            self._surface.blits(
+                [
+                    (
+                        self._atlas.solid,  # type: ignore
+                        (
+                            rect.x + (dx + 2) * self.BLOCK_SIZE + 1,
+                            rect.y + (dy + 2) * self.BLOCK_SIZE + 1,
+                        ),
+                        area,
+                    )
+                    for dx, dy in next_piece.shape.offsets
+                ],
+                doreturn=False,
             )
-            self._surface.blit(text, box_start_pos + Vector(0, -3) * self.BLOCK_SIZE)
+        return rect
 
-        def _render_shape():
-            piece_pos_vec = Vector(
-                self._board.next_piece.position.x, self._board.next_piece.position.y
-            )
-            for pos in self._board.next_piece:
-                surface_pos = (
-                    box_start_pos
-                    + (Vector(*pos) - piece_pos_vec + Vector(2, 2)) * self.BLOCK_SIZE
-                )
-                pg.draw.rect(
-                    self._surface,
-                    ColorTexture.transform(self._board.next_piece.texture.content),
-                    (surface_pos.x, surface_pos.y, self.BLOCK_SIZE, self.BLOCK_SIZE),
-                )
-
-        _render_next_text()
-        if self._board.next_piece:
-            _render_shape()
-
-    def render_score_box(self, score: type_of_score) -> None:
+    @property
+    def score_box_pos(self) -> Position:
         vector = Vector(self._board.n_cols + 2, 10)
-        box_start_pos = self._board_start_pos + vector * self.BLOCK_SIZE
-
-        font = pg.font.SysFont(self.SCORE_FONT_STYLE, self.SCORE_FONT_SIZE)
-
-        text = font.render(self.SCORE_TEXT, True, self.SCORE_FONT_COLOR)
-        self._surface.blit(text, box_start_pos + Vector(0, -3) * self.BLOCK_SIZE)
+        return self._board_start_pos + vector * self.BLOCK_SIZE
+
+    def render_score_text(self, surface: pg.surface.Surface) -> None:
+        text = texts.render(
+            self.SCORE_FONT_STYLE,
+            self.SCORE_FONT_SIZE,
+            self.SCORE_TEXT,
+            self.SCORE_FONT_COLOR,
+        )
+        surface.blit(text, self.score_box_pos + Vector(0, -3) * self.BLOCK_SIZE)
+
+    def render_score(self, score: type_of_score) -> pg.Rect:
+        """Draw the score value over the last one, get the rect of both"""
+        old_rect = self._score_rect
+        if old_rect:
+            self.restore_static(old_rect)
+        text = texts.render(
+            self.SCORE_FONT_STYLE,
+            self.SCORE_FONT_SIZE,
+            f"{score}",
+            self.SCORE_FONT_COLOR,
+        )
+        rect = self._surface.blit(text, self.score_box_pos)
 
-        text = font.render(f"{score}", True, self.SCORE_FONT_COLOR)
-        self._surface.blit(text, box_start_pos + Vector(0, 0) * self.BLOCK_SIZE)
+        self._score = score
+        self._score_rect = rect
+        return rect.union(old_rect) if old_rect else rect
 
-    def render_outer_border(self) -> None:
+    def render_outer_border(self, surface: pg.surface.Surface) -> None:
         # outer rect
         pg.draw.rect(
-            self._surface,
+            surface,
             self.BOARD_BORDER_COLOR,
             (
                 int(self._board_start_pos.x) - self.BOARD_BORDER_SIZE,
@@ -171,7 +410,7 @@ class TetrisRender(Render):
 
         # inner rect
         pg.draw.rect(
-            self._surface,
+            surface,
             self.BOARD_BACKGROUND_COLOR,
             (
                 int(self._board_start_pos.x),
@@ -180,28 +419,3 @@ class TetrisRender(Render):
                 self.BLOCK_SIZE * self._board.n_rows,
             ),
         )
-
-    def render_grid(self) -> None:
-        for (x, y) in itertools.product(
-            range(self._board.n_cols), range(self._board.n_rows)
-        ):
-            pos = Position(x, y)
-            texture = self._board.grid.get_cell(pos)
-            if not texture:
-                continue
-
-            rect_pos = self._board_start_pos + Vector(*pos) * self.BLOCK_SIZE
-
-            pg.draw.rect(
-                self._surface,
-                ColorTexture.transform(texture.content),
-                (
-                    int(rect_pos.x),
-                    int(rect_pos.y),
-                    self.BLOCK_SIZE,
-                    self.BLOCK_SIZE,
-                ),
-            )
-
-        # grid border
-        self.render_grid_line(self._board.n_cols, self._board.n_rows)
@@ -23,16 +23,24 @@ class SceneParameter:
     events: List[pg.event.Event]
     clock: pg.time.Clock
     pressed: ScancodeWrapper
+    # whole ms duration of each simulation tick of the frame
+    dts: List[int]
+    # ms the last tick ends before the frame
+    lag_ms: float
 
     def __init__(
         self,
         events: List[pg.event.Event],
         clock: pg.time.Clock,
         pressed: ScancodeWrapper,
+        dts: Optional[List[int]] = None,
+        lag_ms: float = 0,
     ):
         self.events = events
         self.clock = clock
         self.pressed = pressed
+        self.dts = dts if dts is not None else []
+        self.lag_ms = lag_ms
 
 
 class Scene(metaclass=SceneMeta):
@@ -43,6 +51,9 @@ class Scene(metaclass=SceneMeta):
 
     PARAMETER_CLS: Type[SceneParameter] = SceneParameter
 
+    # rects of the surface drawn since the last display update, None for all
+    _dirty_rects: Optional[List[pg.Rect]] = None
+
     def __init__(self, surface: pg.surface.Surface):
         self.surface = surface
 
@@ -56,6 +67,27 @@ class Scene(metaclass=SceneMeta):
     def run(self, scene_parameter: SceneParameter):
         pass
 
+    def close(self) -> None:
+        """Release what the scene holds, when it is left or the game quits"""
+
+    def invalidate(self) -> None:
+        """Update the whole display on the next frame"""
+        self._dirty_rects = None
+
+    def redraw(self) -> None:
+        """Draw the next frame in full"""
+        self.invalidate()
+
+    def add_dirty_rects(self, rects: List[pg.Rect]) -> None:
+        if self._dirty_rects is not None:
+            self._dirty_rects.extend(rects)
+
+    def pop_dirty_rects(self) -> Optional[List[pg.Rect]]:
+        """Get the rects to update on the display, None for all of them"""
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        return rects
+
     @property
     def surface_width(self) -> int:
         return self.surface.get_width()
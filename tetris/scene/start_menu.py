@@ -3,6 +3,7 @@ from typing import Optional, Union, Any
 import pygame as pg
 
 from tetris.helper import Position, RGB
+from tetris.render.font import fonts, texts
 from .base import Scene, SceneParameter
 
 
@@ -16,7 +17,7 @@ class StartMenu(Scene):
     TEXT: str = "Press any key to start ..."
 
     def init(self) -> None:
-        self.font = pg.font.SysFont(self.FONT_STYLE, self.font_size)
+        self.font = fonts.get(self.FONT_STYLE, self.font_size)
         self.to_surface()
 
     def to_surface(self) -> None:
@@ -27,9 +28,10 @@ class StartMenu(Scene):
 
     def render_text(self) -> Union[pg.surface.Surface, Any]:
         self.surface.fill((10, 10, 20))
-        return self.font.render(  # type: ignore
+        return texts.render(
+            self.FONT_STYLE,
+            self.font_size,
             self.TEXT,
-            True,
             self.FONT_COLOR,
         )
 
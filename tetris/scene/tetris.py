@@ -1,33 +1,28 @@
-from typing import List, Type
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Type
 
 import pygame as pg
 
 from .base import Scene, SceneParameter
-from ..engine.board import Board
-from ..engine.speed import create_accelerator, Factor, create_speed_generator
+from ..ai.bot import Bot
+from ..engine.action import Action
+from ..engine.replay import ReplayRecorder
+from ..engine.tetris import TetrisEngine
 from ..engine.texture import ColorTexture, ColorContent
-from ..engine.typing import (
-    type_of_level,
-    type_of_score,
-    type_of_speed,
-    type_of_count,
-)
-from ..helper import Vector, Position
+from ..helper import Position
+from ..input import InputHandler
 from ..render.tetris import TetrisRender, TetrisRenderParameter
 
 
 class Tetris(Scene):
-    """Tetris scene"""
+    """Tetris scene, a pygame adapter over the TetrisEngine"""
 
     BLOCK_SIZE: int = 30
     N_ROWS: int = 20
     N_COLS: int = 10
-    INIT_LEVEL: int = 1
-    SCORE_UNIT: int = 10
 
-    ACCELERATOR_TYPE: str = "linear"
-    ACCELERATOR_FACTOR: Factor = Factor(a=0.005)
-    SPEED_FACTOR: Factor = Factor(a=1.0, b=0.05)
     TEXTURE_CLS: Type[ColorTexture] = ColorTexture
     TEXTURE_CONTENTS: List[ColorContent] = [
         ColorContent.red,
@@ -38,33 +33,63 @@ class Tetris(Scene):
         ColorContent.dark_green,
     ]
 
-    _board: Board
-
-    _level: type_of_level
-    _score: type_of_score
-
-    _falling_speed: type_of_speed
-    _fall_time: float
-
-    _game_over: bool
-
-    _accelerate_count: type_of_count
-
-    # move vector of each run
-    _move_vector: Vector
+    # actions on the KEYDOWN of the keys
+    KEY_ACTIONS: Dict[int, Action] = {
+        pg.K_LEFT: Action.LEFT,
+        pg.K_RIGHT: Action.RIGHT,
+        pg.K_DOWN: Action.DOWN,
+        pg.K_z: Action.ROTATE_CCW,
+        pg.K_x: Action.ROTATE_CW,
+        pg.K_SPACE: Action.HARD_DROP,
+    }
+    # actions on while the keys are held
+    HELD_ACTIONS: Dict[int, Action] = {pg.K_DOWN: Action.ACCELERATE}
+    # delayed auto shift & auto repeat rate of left & right, in ms
+    DAS_MS: float = InputHandler.DAS_MS
+    ARR_MS: float = InputHandler.ARR_MS
+    # pg.KEYUP to act on the release of the keys
+    PRESS_EVENT: int = pg.KEYDOWN
+    # toggles the bot playing instead of the keyboard
+    BOT_KEY: int = pg.K_a
+    # processes scoring the bot candidates, None for the cpu count
+    BOT_WORKERS: Optional[int] = None
+
+    _engine: TetrisEngine
+
+    _bot: Optional[Bot] = None
+
+    # directory the sessions are recorded to, None to not record them; in the
+    # home of the user unless the TETRIS_REPLAY_DIR environment variable is set
+    REPLAY_DIR: Optional[str] = os.environ.get("TETRIS_REPLAY_DIR") or os.path.join(
+        os.path.expanduser("~"), ".tetris", "replays"
+    )
+
+    _recorder: Optional[ReplayRecorder] = None
+
+    # actions of each run
+    _actions: Action
+
+    _input: InputHandler
 
     _render: TetrisRender
 
     def init(self):
         """Initialize"""
         self.TEXTURE_CLS.load_pools(self.TEXTURE_CONTENTS)
-        self.reset()
-        self._board = Board()
-        self._board.init(self.N_ROWS, self.N_COLS, self.TEXTURE_CLS.pools)
+        self._engine = TetrisEngine(self.N_ROWS, self.N_COLS, self.TEXTURE_CLS.pools)
+        self._input = InputHandler(
+            self.KEY_ACTIONS,
+            self.HELD_ACTIONS,
+            self.DAS_MS,
+            self.ARR_MS,
+            press_event=self.PRESS_EVENT,
+        )
+        self.reset_actions()
+        self.start_recording()
 
         self._render = TetrisRender(
             self.surface,
-            self._board,
+            self._engine.board,
             Position(
                 self.surface.get_width() // 2 - self.N_COLS * self.BLOCK_SIZE // 2,
                 self.surface.get_height() // 2 - self.N_ROWS * self.BLOCK_SIZE // 2,
@@ -72,154 +97,124 @@ class Tetris(Scene):
         )
 
     def reset(self):
-        """Reset Tetris"""
-        self.reset_score()
-        self.set_level(self.INIT_LEVEL)
-
-        self.reset_falling_speed()
-        self.reset_fall_time()
-
-        self._game_over = False
-
-        self.reset_accelerate_count()
-
-        self.reset_move_vector()
-
-    def reset_move_vector(self):
-        """Reset move vector"""
-        self._move_vector = Vector(0, 0)
-
-    def accelerate(self):
-        """Accelerate the falling speed"""
-        self._accelerate_count += 1
-        accelerator = create_accelerator(self.ACCELERATOR_TYPE)
-        self._falling_speed = accelerator(
-            self.get_level_speed(),
-            self._accelerate_count,
-            self.ACCELERATOR_FACTOR,
+        """Reset Tetris, a new game is played"""
+        self._engine.restart()
+        self._input.reset()
+        self.reset_actions()
+        self.start_recording()
+        if self._bot:
+            self._bot.reset()
+
+    def start_recording(self):
+        """Record the game from now on to a new replay file"""
+        self.stop_recording()
+        if self.REPLAY_DIR is None:
+            return
+
+        os.makedirs(self.REPLAY_DIR, exist_ok=True)
+        path = os.path.join(
+            self.REPLAY_DIR,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{self._engine.seed}.replay",
         )
+        self._recorder = ReplayRecorder(open(path, "wb"), self._engine)
 
-    def reset_score(self):
-        """Reset the score"""
-        self._score = 0
-
-    def reset_accelerate_count(self):
-        """Reset accelerate count"""
-        self._accelerate_count = 0
+    def stop_recording(self):
+        if self._recorder:
+            self._recorder.close()
+            self._recorder = None
 
-    def reset_falling_speed(self):
-        """Reset the falling speed based on current level"""
-        self._accelerate_count = 0
-        self._falling_speed = self.get_level_speed()
+    def close(self):
+        self.stop_recording()
+        if self._bot:
+            # shuts its process pool down
+            self._bot.close()
+            self._bot = None
 
-    def reset_fall_time(self):
-        """Reset the fall time"""
-        self._fall_time = 0.0
+    def reset_actions(self):
+        """Reset actions"""
+        self._actions = Action.NONE
 
-    def calculate_level(self) -> type_of_level:
-        """Calculate level based on score"""
-        return (self._score // 100) + 1
-
-    def set_level(self, level: type_of_level):
-        """Set level"""
-        self._level = level
-
-    def get_level_speed(self) -> type_of_speed:
-        speed_generator = create_speed_generator()
-        return speed_generator(self._level, self.SPEED_FACTOR)
-
-    def should_upgrade_level(self) -> bool:
-        """Check level should upgrade or not"""
-        return self.calculate_level() > self._level
-
-    def upgrade_level(self):
-        """Upgrade level using calculated level"""
-        self.set_level(self.calculate_level())
-
-    def add_score(self, cleared_lines: int):
-        """Add score according to cleared lines"""
-        self._score = cleared_lines * self.SCORE_UNIT
+    def redraw(self):
+        super().redraw()
+        self._render.invalidate()
 
     def show(self):
         """Show the render result"""
         if self._render:
-            self._render.render(
+            rects = self._render.render(
                 TetrisRenderParameter(
-                    self._score,
-                    self._level,
+                    self._engine.score,
+                    self._engine.level,
                 )
             )
+            if rects is None:
+                self.invalidate()
+            else:
+                self.add_dirty_rects(rects)
 
     def move_left(self):
-        self._move_vector += Vector(-1, 0)
+        self._actions |= Action.LEFT
 
     def move_right(self):
-        self._move_vector += Vector(1, 0)
+        self._actions |= Action.RIGHT
 
     def move_down(self):
-        self._move_vector += Vector(0, 1)
+        self._actions |= Action.DOWN
 
     def rotate(self, clockwise: bool = False):
-        self._board.rotate_piece(clockwise=clockwise)
+        self._actions |= Action.ROTATE_CW if clockwise else Action.ROTATE_CCW
 
-    def event_detect(self, events: List[pg.event.Event]):
-        keydown_map = {
-            pg.K_LEFT: (self.move_left, {}),
-            pg.K_RIGHT: (self.move_right, {}),
-            pg.K_DOWN: (self.move_down, {}),
-            pg.K_z: (self.rotate, {"clockwise": False}),
-            pg.K_x: (self.rotate, {"clockwise": True}),
-        }
+    def toggle_bot(self):
+        """Let the bot play, or give the control back to the keyboard"""
+        if self._bot:
+            self._bot.close()
+            self._bot = None
+        else:
+            self._bot = Bot(executor=ProcessPoolExecutor(self.BOT_WORKERS))
 
+    def event_detect(self, events: List[pg.event.Event], now: float):
         for e in events:
-            if not self._game_over and e.type == pg.KEYUP and keydown_map.get(e.key):
-                func, func_kwargs = keydown_map[e.key]
-                func(**func_kwargs)  # type: ignore
-
-    def pressed_detect(self, pressed):
-        pressed_map = {pg.K_DOWN: (self.accelerate, {})}
+            if e.type == pg.KEYDOWN and e.key == self.BOT_KEY:
+                self.toggle_bot()
+        self._input.feed(events, now)
 
-        not_pressed_map = {pg.K_DOWN: (self.reset_falling_speed, {})}
+    @property
+    def engine(self) -> TetrisEngine:
+        return self._engine
 
-        for press_key, (func, func_kwargs) in pressed_map.items():
-            if pressed[press_key]:
-                func(**func_kwargs)
+    @property
+    def bot(self) -> Optional[Bot]:
+        return self._bot
 
-        for press_key, (func, func_kwargs) in not_pressed_map.items():
-            if not pressed[press_key]:
-                func(**func_kwargs)
+    @property
+    def input(self) -> InputHandler:
+        return self._input
 
     def run(self, scene_parameter: SceneParameter):
-        """Tetris main run"""
-        # # TODO: add tetris run
-        self.reset_move_vector()
-
-        self.event_detect(scene_parameter.events)
-        self.pressed_detect(scene_parameter.pressed)
-
-        if self._fall_time / 1000 >= self._falling_speed:
-            self._fall_time = 0
-            self.move_down()
-
-        overflow, checked_move_vector = self._board.check_move(self._move_vector)
-        self._game_over = overflow and self._board.is_piece_collapsed
-
-        if not self._game_over:
-            if self._board.is_piece_collapsed:
-                self._board.lock_piece()
-                cleared = self._board.clear_lines()
-                self._score += cleared * 10
-                self._board.switch_piece()
-                self._falling_speed = self.get_level_speed()
-            else:
-                self._board.set_piece(self._board.move_piece(checked_move_vector))
-        else:
-            return -1
+        """Tetris main run, the engine is stepped once per simulation tick
+
+        The actions of the events are kept until a tick consumes them, the
+        repeats & held keys are polled at the time of each tick.
+        """
+        now = self._input.clock()
+        self.event_detect(scene_parameter.events, now)
+
+        dts = scene_parameter.dts
+        tick_time = now - scene_parameter.lag_ms - sum(dts)
+        for dt in dts:
+            tick_time += dt
+            self._actions |= self._input.poll(tick_time)
+            if self._bot:
+                # the bot never waits for its search, the tick is not delayed
+                self._actions = self._bot.act(self._engine.board)
+
+            game_over = self._engine.step(self._actions, dt)
+            if self._recorder:
+                # the inputs detected above, as the engine consumed them
+                self._recorder.record(self._actions, dt)
+            self.reset_actions()
+            if game_over:
+                self.stop_recording()
+                return -1
 
         self.show()
-
-        if self.should_upgrade_level():
-            self.upgrade_level()
-
-        # increase fall time by clock
-        self._fall_time += scene_parameter.clock.get_rawtime()
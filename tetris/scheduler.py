@@ -0,0 +1,74 @@
+import time
+from typing import Callable, List
+
+
+class FrameScheduler:
+    """Fixed timestep simulation under a capped frame rate
+
+    The real time elapsed between frames is accumulated and spent in
+    simulation ticks of ``tick_ms``, so the game runs at the same speed
+    whatever the frame rate. Each tick gets a whole number of ms as its dt,
+    the one the replays record & play back as is: the rounded end times of
+    the ticks apart, 17, 16, 17, 17, 16... ms for 60 Hz. Between frames the
+    scheduler sleeps up to the deadline of the next frame; deadlines
+    advance by the frame duration so the oversleeps of the OS do not add up.
+    """
+
+    FPS: int = 60
+    # 60 Hz, one tick per frame at the default frame rate
+    TICK_MS: float = 1000 / 60
+    # ticks caught up in one frame at most, the rest of a stall is dropped
+    MAX_STEPS: int = 5
+
+    def __init__(
+        self,
+        fps: int = FPS,
+        tick_ms: float = TICK_MS,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        # 0 for no cap, the frames are paced by the display
+        self.fps = fps
+        self.tick_ms = tick_ms
+        self._clock = clock
+        self._sleep = sleep
+        self.start()
+
+    def start(self) -> None:
+        self._last = self._deadline = self._clock()
+        self._accumulator = 0.0
+        # ticks run since the start
+        self._ticks = 0
+
+    def advance(self) -> List[int]:
+        """Accumulate the real time elapsed, get the dts of the ticks to run"""
+        now = self._clock()
+        self._accumulator += (now - self._last) * 1000
+        self._last = now
+
+        steps = int(self._accumulator // self.tick_ms)
+        self._accumulator -= steps * self.tick_ms
+        first = self._ticks
+        self._ticks += min(steps, self.MAX_STEPS)
+        ends = [round(tick * self.tick_ms) for tick in range(first, self._ticks + 1)]
+        return [end - start for start, end in zip(ends, ends[1:])]
+
+    @property
+    def lag_ms(self) -> float:
+        """Time accumulated short of a tick, ms the last tick run ends before now"""
+        return self._accumulator
+
+    def wait(self) -> None:
+        """Sleep until the deadline of the next frame"""
+        if self.fps <= 0:
+            return
+
+        frame = 1 / self.fps
+        now = self._clock()
+        self._deadline += frame
+        if self._deadline < now - frame:
+            # more than a frame late, the missed frames are not made up
+            self._deadline = now
+        remaining = self._deadline - now
+        if remaining > 0:
+            self._sleep(remaining)